@@ -1,14 +1,8 @@
 import logging
 import os
 
-import matplotlib.pyplot as plt
-import pandas as pd
-import plotly
-import plotly.express as px
-import seaborn as sns
-
 from src.modules.base import Module
-from src.utils.saver import Saver
+from src.utils.plotter import render_correlation_heatmap, render_facet_lines
 
 logger = logging.getLogger("al_engine")
 
@@ -20,41 +14,20 @@ class EDA(Module):
 
     def run(self):
         logger.info("Reading in cleaned dataframe")
-        scaled_cleaned_data = pd.read_csv(
-            "data/processed/scaled_cleaned_data.csv"
+        scaled_cleaned_data = self.context.consume(
+            "scaled_cleaned_data", "processed"
         ).set_index("DATE")
 
         logger.info("Giving a line plot on all features")
-        fig = px.line(
-            scaled_cleaned_data,
-            facet_col="variable",
-            facet_col_wrap=3,
-            width=1000,
-            height=1200,
-            facet_row_spacing=0.02,
-        )
-        plotly.offline.plot(
-            fig,
-            filename=f'{self.settings["run_meta_data"]["run_folder_path"]}/plots/line_plot.html',
+        self.context.plotter.request(
+            render_facet_lines, "line_plot.html", df=scaled_cleaned_data
         )
-        plt.clf()
 
         logger.info("Giving a correlation plot on all features")
         corr_matrix = scaled_cleaned_data.corr()
-        fig, ax = plt.subplots(figsize=(8, 8))
-        ax_heatmap = sns.heatmap(
-            corr_matrix,
-            vmin=-1,
-            vmax=1,
-            center=0,
-            cmap=sns.diverging_palette(20, 170, n=200),
-            square=True,
-        )
-        ax_heatmap.set_xticklabels(
-            ax_heatmap.get_xticklabels(), rotation=90, horizontalalignment="right"
+        self.context.plotter.request(
+            render_correlation_heatmap, "correlation_plot.png", corr_matrix=corr_matrix
         )
-        Saver.save_plots("correlation_plot")
-        plt.clf()
 
         logger.info("Outputing actual correlation to logging")
         corr_info = corr_matrix["AL_PRICE"].sort_values(ascending=False)
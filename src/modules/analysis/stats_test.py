@@ -7,6 +7,7 @@ from scipy import stats
 from statsmodels.tsa.stattools import adfuller, grangercausalitytests
 
 from src.modules.base import Module
+from src.utils.loader import Loader
 from src.utils.saver import Saver
 
 logger = logging.getLogger("al_engine")
@@ -17,6 +18,16 @@ class StatsTest(Module):
         module_name = os.path.basename(__file__).replace(".py", "")
         super().__init__(module_name)
 
+        self.input_files = [
+            Loader.artifact_path("scaled_cleaned_data", "processed"),
+            Loader.artifact_path("differenced_scaled_cleaned_data", "processed"),
+        ]
+        self.output_files = [
+            "data/results/t_test.csv",
+            "data/results/granger_causality_test_on_diff_scaled_data.csv",
+            "data/results/adf_test.csv",
+        ]
+
     def run(self):
         logger.info("Conducting t-test")
         self._t_test()
@@ -32,8 +43,8 @@ class StatsTest(Module):
 
     def _t_test(self):
         logger.info("Reading in cleaned dataframe")
-        scaled_cleaned_data = pd.read_csv(
-            "data/processed/scaled_cleaned_data.csv"
+        scaled_cleaned_data = self.context.consume(
+            "scaled_cleaned_data", "processed"
         ).set_index("DATE")
 
         logger.info("Use t-test to test the coefficients' significance")
@@ -93,8 +104,8 @@ class StatsTest(Module):
         Saver.save_csv(t_test_results, "t_test", "results")
 
     def _granger_causality_test(self):
-        differenced_scaled_cleaned_data = pd.read_csv(
-            "data/processed/differenced_scaled_cleaned_data.csv"
+        differenced_scaled_cleaned_data = self.context.consume(
+            "differenced_scaled_cleaned_data", "processed"
         ).set_index("DATE")
 
         logger.info("Determine the maximum number of lags to consider")
@@ -145,8 +156,8 @@ class StatsTest(Module):
         )
 
     def _adf_test(self):
-        scaled_cleaned_data = pd.read_csv(
-            "data/processed/scaled_cleaned_data.csv"
+        scaled_cleaned_data = self.context.consume(
+            "scaled_cleaned_data", "processed"
         ).set_index("DATE")
 
         p_values_list = []
@@ -2,6 +2,7 @@ import logging
 import textwrap
 from abc import ABC, abstractmethod
 
+from src.utils.context import PipelineContext
 from src.utils.settings import SETTINGS
 
 logger = logging.getLogger("al_engine")
@@ -11,12 +12,18 @@ class Module(ABC):
     def __init__(self, module_name) -> None:
         self.module_name = module_name
         self.settings = SETTINGS
+        self.context = None
+
+        # declared for the execution cache, modules without outputs always run
+        self.input_files = []
+        self.config_keys = []
+        self.output_files = []
 
     @abstractmethod
     def run(self) -> None:
         pass
 
-    def _run(self):
+    def _run(self, context: PipelineContext = None):
         logger_message = f"""
 
         ######################################################
@@ -26,7 +33,11 @@ class Module(ABC):
         logger_message = textwrap.dedent(logger_message)
         logger.debug(logger_message)
 
+        standalone_run = context is None
+        self.context = PipelineContext() if standalone_run else context
         self.run()
+        if standalone_run:
+            self.context.close()
 
         logger_message = f"""
 
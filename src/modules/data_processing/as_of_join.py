@@ -0,0 +1,106 @@
+import logging
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger("al_engine")
+
+MATCH_POLICIES = ["exact", "backward"]
+FILL_POLICIES = ["none", "ffill", "bfill", "midpoint", "interpolate"]
+
+
+class AsOfJoiner:
+    """
+    Aligns any number of dated sources onto the dates of a base dataframe in one
+    pass per source, each source declaring how its dates are matched and how
+    the gaps left on the base dates are filled afterwards
+    """
+
+    def __init__(self, base: pd.DataFrame) -> None:
+        self.base = base
+        self.sources = []
+        self.fill_policies = {}
+
+    def add_source(
+        self,
+        source: pd.DataFrame,
+        match: str = "exact",
+        tolerance_days: Optional[int] = None,
+        fill: str = "none",
+        fill_output_suffix: str = "",
+    ) -> None:
+        """
+        match "exact" only takes a value on its own date, "backward" takes the
+        latest value at or before the base date within tolerance_days. fill is
+        applied by AsOfJoiner.fill, midpoint being the average of the next and
+        previous available values; with fill_output_suffix set the filled values
+        go to a new column appended at the end and the raw column is dropped
+        """
+        if match not in MATCH_POLICIES:
+            raise NotImplementedError(f"Match policy [{match}] is not supported")
+        if fill not in FILL_POLICIES:
+            raise NotImplementedError(f"Fill policy [{fill}] is not supported")
+
+        self.sources.append((source, match, tolerance_days))
+        for column in source.columns.drop("DATE"):
+            self.fill_policies[column] = (fill, fill_output_suffix)
+
+    def align(self) -> pd.DataFrame:
+        logger.info(f"Aligning [{len(self.sources)}] sources onto the base dates...")
+        base_dates = self.base["DATE"].to_numpy().astype("datetime64[ns]")
+        aligned_columns = {column: self.base[column] for column in self.base.columns}
+
+        for source, match, tolerance_days in self.sources:
+            value_columns = list(source.columns.drop("DATE"))
+            logger.debug(f"Aligning columns {value_columns} with [{match}] match...")
+            duplicated_columns = set(value_columns).intersection(aligned_columns)
+            if duplicated_columns:
+                raise ValueError(
+                    f"Columns {sorted(duplicated_columns)} exist in more than one source"
+                )
+
+            source = source.sort_values("DATE", kind="stable").drop_duplicates(
+                "DATE", keep="last"
+            )
+            source_dates = source["DATE"].to_numpy().astype("datetime64[ns]")
+            position = np.searchsorted(source_dates, base_dates, side="right") - 1
+            is_matched = (position >= 0) & (len(source_dates) > 0)
+            position = np.clip(position, 0, max(len(source_dates) - 1, 0))
+            if match == "exact":
+                is_matched &= source_dates[position] == base_dates
+            elif tolerance_days is not None:
+                is_matched &= base_dates - source_dates[position] <= np.timedelta64(
+                    tolerance_days, "D"
+                )
+            logger.debug(f"[{is_matched.sum()}] of [{len(base_dates)}] dates matched")
+
+            for column in value_columns:
+                aligned_columns[column] = np.where(
+                    is_matched,
+                    source[column].to_numpy(dtype=np.float64)[position],
+                    np.nan,
+                )
+
+        return pd.DataFrame(aligned_columns, index=self.base.index)
+
+    def fill(self, df: pd.DataFrame, columns: List[str]) -> None:
+        for column in columns:
+            fill, fill_output_suffix = self.fill_policies[column]
+            logger.debug(f"Filling missing values in [{column}] with [{fill}]...")
+            if fill == "ffill":
+                filled = df[column].ffill()
+            elif fill == "bfill":
+                filled = df[column].bfill()
+            elif fill == "midpoint":
+                filled = (df[column].bfill() + df[column].ffill()) / 2
+            elif fill == "interpolate":
+                filled = df[column].interpolate(method="linear")
+            else:
+                filled = df[column]
+
+            if fill_output_suffix:
+                df[column + fill_output_suffix] = filled
+                df.drop(column, axis=1, inplace=True)
+            else:
+                df[column] = filled
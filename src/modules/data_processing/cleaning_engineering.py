@@ -1,14 +1,15 @@
 import logging
 import os
-from typing import Dict
 
-import matplotlib.pyplot as plt
-import missingno as msno
+import numpy as np
 import pandas as pd
-from matplotlib.pyplot import figure
 
 from src.modules.base import Module
-from src.utils.saver import Saver
+from src.modules.data_processing.as_of_join import AsOfJoiner
+from src.modules.data_processing.indicators import create_indicator, output_columns
+from src.modules.data_processing.raw_sources import load_raw_sources, raw_source_files
+from src.utils.loader import Loader
+from src.utils.plotter import render_lines, render_missing_values
 
 logger = logging.getLogger("al_engine")
 
@@ -18,206 +19,300 @@ class CleanEngineer(Module):
         module_name = os.path.basename(__file__).replace(".py", "")
         super().__init__(module_name)
 
-    def run(self):
-        logger.info("Starting to extract metal futures prices...")
-        logger.debug("Extracting Aluminium metal future prices...")
-        al_price = self._extract_metal_price("al")
-        logger.debug("Extracting Copper metal future prices...")
-        cu_price = self._extract_metal_price("cu")
-        logger.info("Metal futures prices extract complete!")
-
-        logger.info("Reading in additional data...")
-
-        logger.debug("Reading in oil prices...")
-        oil = pd.read_csv("data/raw/crude oil price.csv", header=0)
-        oil["DATE"] = pd.to_datetime(oil["date"], format="%Y-%m-%d")
-        oil = oil.drop(["date"], axis=1)
-        oil.sort_values(by=["DATE"], inplace=True, ascending=True)
-        oil.rename(columns={" value": "OIL_PRICE"}, inplace=True)
-
-        logger.debug("Reading in coal prices...")
-        coal = pd.read_csv("data/raw/Coal_05_19_23-04_02_13.csv")
-        coal["DATE"] = pd.to_datetime(coal["Date"], format="%m/%d/%y")
-        coal = coal.drop(["Date", "Volume", "Low", "High", "Open"], axis=1)
-        coal.sort_values(by=["DATE"], inplace=True, ascending=True)
-        coal.rename(columns={"Close": "COAL"}, inplace=True)
-
-        logger.debug("Reading in CCFI...")
-        ccfi = pd.read_csv("data/raw/ccfi.csv")
-
-        ccfi["DATE"] = pd.to_datetime(ccfi["date"], format="%Y-%m-%d")
-        ccfi = ccfi.drop(["date", "Unnamed: 0"], axis=1)
-        ccfi.sort_values(by=["DATE"], inplace=True, ascending=True)
-        ccfi.rename(columns={"ccfi_index": "CCFI_INDEX"}, inplace=True)
-
-        logger.debug("Reading in SCFI prices...")
-        scfi = pd.read_csv("data/raw/scfi.csv")
-        scfi["DATE"] = pd.to_datetime(scfi["date"], format="%Y-%m-%d")
-        scfi = scfi.drop(["date", "Unnamed: 0"], axis=1)
-        scfi.sort_values(by=["DATE"], inplace=True, ascending=True)
-        scfi.rename(columns={"scfi_index": "SCFI_INDEX"}, inplace=True)
-
-        logger.debug("Reading in exchange rates...")
-        usd_to_yuan_exchange = pd.read_csv(
-            "data/raw/us-dollar-yuan-exchange-rate-historical-chart.csv"
+        self.input_files = raw_source_files(
+            self.settings["preprocess"]["raw_data"],
+            self.settings["preprocess"]["futures"],
         )
-        aud_to_yuan_exchange = pd.read_csv(
-            "data/raw/australian-us-dollar-exchange-rate-historical-chart.csv"
+        self.config_keys = [
+            "preprocess.futures",
+            "preprocess.raw_data.sources",
+            "preprocess.cleaning",
+        ]
+        self.output_files = [
+            Loader.artifact_path("cleaned_data", "processed"),
+            Loader.artifact_path("aligned_raw_data", "processed"),
+        ]
+
+    def run(self):
+        if self.settings["preprocess"]["cleaning"]["mode"] == "append":
+            try:
+                previous_aligned_data = self.context.consume(
+                    "aligned_raw_data", "processed"
+                )
+                previous_cleaned_data = self.context.consume(
+                    "cleaned_data", "processed"
+                )
+            except FileNotFoundError:
+                logger.warning(
+                    "No previous cleaned data to append to, rebuilding the full history"
+                )
+            else:
+                tail_rows = self._get_tail_rows(previous_aligned_data)
+                if tail_rows is not None:
+                    self._append(
+                        previous_aligned_data, previous_cleaned_data, *tail_rows
+                    )
+                    return
+
+        self._rebuild(*self._load_raw_sources())
+
+    def _load_raw_sources(self, since=None):
+        logger.info("Reading in metal futures prices and additional data...")
+        al_price, raw_tables = load_raw_sources(
+            self.settings["preprocess"]["raw_data"],
+            self.settings["preprocess"]["futures"],
+            since,
         )
+        al_price = al_price.rename(columns={"SETTLEMENTPRICE": "AL_PRICE"})
+        logger.info("Raw data reading process complete!")
+        return al_price, raw_tables
+
+    def _rebuild(self, al_price, raw_tables):
+        logger.info("Declaring how each table is aligned onto the trading days...")
+        joiner = self._get_joiner(al_price, raw_tables)
 
-        usd_to_yuan_exchange["DATE"] = pd.to_datetime(
-            usd_to_yuan_exchange["date"], format="%Y-%m-%d"
+        logger.info("Merging all dataframes...")
+        df_merged = joiner.align()
+        self.context.publish("aligned_raw_data", df_merged, "processed")
+
+        logger.info("Plotting missing values indication plot...")
+        self.context.plotter.request(
+            render_missing_values, "missing_value_indication.png", df=df_merged
         )
-        usd_to_yuan_exchange = usd_to_yuan_exchange.drop(["date"], axis=1)
-        usd_to_yuan_exchange.sort_values(by=["DATE"], inplace=True, ascending=True)
-        usd_to_yuan_exchange.rename(columns={" value": "US_DOLLAR"}, inplace=True)
-        aud_to_yuan_exchange["DATE"] = pd.to_datetime(
-            aud_to_yuan_exchange["date"], format="%Y-%m-%d"
+
+        df_merged = self._impute(
+            df_merged.copy(),
+            joiner,
+            self._get_average_industrial_value(df_merged, joiner),
+            plot_diagnostics=True,
         )
-        aud_to_yuan_exchange = aud_to_yuan_exchange.drop(["date"], axis=1)
-        aud_to_yuan_exchange.sort_values(by=["DATE"], inplace=True, ascending=True)
-        aud_to_yuan_exchange.rename(columns={" value": "AUS_DOLLAR"}, inplace=True)
-
-        logger.debug("Reading in london AL prices...")
-        london_al = pd.read_csv("data/raw/London Aluminium Historical Data.csv")
-        london_al["DATE"] = pd.to_datetime(london_al["Date"], format="%d/%m/%Y")
-        london_al = london_al.drop(["Date", "Open", "High", "Low", "Change %"], axis=1)
-        london_al.sort_values(by=["DATE"], inplace=True, ascending=True)
-        london_al.rename(
-            columns={"Price": "LONDON_AL_PRICE", "Vol.": "LONDON_AL_VOL"}, inplace=True
+        df_merged = self._engineer_features(df_merged)
+
+        for indicator_settings in self.settings["preprocess"]["cleaning"]["indicators"]:
+            logger.info(f'Plotting [{indicator_settings["output"]}] indicator...')
+            indicator = create_indicator(indicator_settings)
+            self.context.plotter.request(
+                render_lines,
+                f'{indicator_settings["output"].lower()}_plot.png',
+                lines=[
+                    (df_merged.index.to_numpy(), df_merged[column].to_numpy(), column)
+                    for column in output_columns(indicator_settings, indicator).values()
+                ],
+                legend=len(indicator.outputs) > 1,
+            )
+
+        self.context.publish("cleaned_data", df_merged, "processed")
+
+    def _get_tail_rows(self, previous_aligned_data):
+        """
+        The row of the previous aligned data to re-align from and the first row
+        new trading days can change, or None when appending could differ from a
+        full rebuild
+        """
+        warmup_rows = [
+            create_indicator(indicator_settings).warmup_rows
+            for indicator_settings in self.settings["preprocess"]["cleaning"][
+                "indicators"
+            ]
+        ]
+        if None in warmup_rows:
+            logger.warning(
+                "Recursive indicators depend on the full history, rebuilding the full history"  # noqa
+            )
+            return None
+        if self.settings["preprocess"]["futures"]["back_adjustment"] != "none":
+            logger.warning(
+                "Back adjustment changes prices before every new roll, rebuilding the full history"  # noqa
+            )
+            return None
+
+        logger.info("Finding the rows new trading days can change...")
+        value_columns = previous_aligned_data.columns.drop(["DATE", "AL_PRICE"])
+        is_available = previous_aligned_data[value_columns].notnull().to_numpy()
+        positions = np.arange(len(previous_aligned_data))[:, None]
+        last_available = np.where(is_available, positions, -1).max(axis=0)
+        # rows before the last available value of every column stay as they are
+        first_changed_row = max(last_available.min(), 0)
+        # the tail needs the previous value of every column to ffill/interpolate
+        # from, the previous day for the percentage changes and a full indicator
+        # window of rows before the first changed row
+        previous_available = np.where(
+            is_available[:first_changed_row], positions[:first_changed_row], -1
+        ).max(axis=0, initial=-1)
+        tail_start_row = max(
+            min(previous_available.min(), first_changed_row - max([1, *warmup_rows])),
+            0,
         )
-        london_al["LONDON_AL_PRICE"] = (
-            london_al["LONDON_AL_PRICE"].str.replace(",", "", regex=True).astype(float)
+        return tail_start_row, first_changed_row
+
+    def _append(
+        self,
+        previous_aligned_data,
+        previous_cleaned_data,
+        tail_start_row,
+        first_changed_row,
+    ):
+        """
+        Only read, re-align and re-clean the tail of the history that new trading
+        days can change, giving exactly the result of a full rebuild as long as
+        sources only ever receive values after their last available date
+        """
+        tail_start_date = previous_aligned_data["DATE"].iloc[tail_start_row]
+        first_changed_date = previous_aligned_data["DATE"].iloc[first_changed_row]
+        logger.debug(
+            f"Rows from [{first_changed_date}] are recomputed from a tail starting [{tail_start_date}]"  # noqa
         )
-        london_al["LONDON_AL_VOL"] = (
-            london_al["LONDON_AL_VOL"].str.replace("K", "", regex=True).astype(float)
+        al_price, raw_tables = self._load_raw_sources(since=tail_start_date)
+
+        new_trading_days = (
+            al_price["DATE"] > previous_aligned_data["DATE"].iloc[-1]
+        ).sum()
+        logger.info(f"Appending [{new_trading_days}] new trading days...")
+        joiner = self._get_joiner(al_price, raw_tables)
+        aligned_tail = joiner.align()
+        aligned_data = pd.concat(
+            [previous_aligned_data.iloc[:tail_start_row], aligned_tail],
+            ignore_index=True,
         )
+        self.context.publish("aligned_raw_data", aligned_data, "processed")
 
-        logger.debug("Reading in industry data...")
-        industry = pd.read_csv("data/raw/industrial-production-historical-chart.csv")
-        industry["DATE"] = pd.to_datetime(industry["date"], format="%Y-%m-%d")
-        industry = industry.drop(["date"], axis=1)
-        industry.sort_values(by=["DATE"], inplace=True, ascending=True)
-        industry.rename(columns={" value": "INDUSTRIAL_INDEX"}, inplace=True)
-
-        logger.debug("Reading in ACC company stocks...")
-        acc = pd.read_csv("data/raw/AL_corporation_of_china.csv", header=1)
-        acc["DATE"] = pd.to_datetime(acc["   Date"], format="%Y/%m/%d")
-        acc = acc.drop(["   Date", "    High", "    Low"], axis=1)
-        acc.sort_values(by=["DATE"], inplace=True, ascending=True)
-        acc.columns = [i.lstrip() for i in acc.columns]
-        acc.rename(
-            columns={"Open": "ACC_OPEN", "Close": "ACC_CLOSE", "Volume": "ACC_VOLUME"},
-            inplace=True,
+        cleaned_tail = self._impute(
+            aligned_tail.copy(),
+            joiner,
+            self._get_average_industrial_value(aligned_data, joiner),
+            plot_diagnostics=False,
         )
-        logger.info("Additional data elements reading process complete!")
-
-        logger.info("Merging all dataframes...")
-        df_merged = al_price
-        for table in [
-            oil,
-            scfi,
-            ccfi,
-            coal,
-            usd_to_yuan_exchange,
-            aud_to_yuan_exchange,
-            cu_price,
-            london_al,
-            industry,
-            acc,
-        ]:
-            logger.info("Merging Additional tables into [df_merged]...")
-            df_merged = df_merged.merge(table, on="DATE", how="left")
-
-        logger.info("Renaming columns...")
-        df_merged.rename(
-            columns={"SETTLEMENTPRICE_x": "AL_PRICE", "SETTLEMENTPRICE_y": "CU_PRICE"},
-            inplace=True,
+        cleaned_tail = self._engineer_features(cleaned_tail)
+        cleaned_data = pd.concat(
+            [
+                previous_cleaned_data[
+                    previous_cleaned_data["DATE"] < first_changed_date
+                ],
+                cleaned_tail[cleaned_tail["DATE"] >= first_changed_date],
+            ],
+            ignore_index=True,
         )
-
-        logger.info("Plotting missing values indication plot...")
-        msno.matrix(df_merged)
-        Saver.save_plots("missing_value_indication")
-        plt.clf()
-
-        logger.info("Filling in industrial index...")
-        df_merged["INDUSTRIAL_INDEX"] = df_merged["INDUSTRIAL_INDEX"].bfill()
-
-        logger.info("Filling in industrial index...")
-        figure(figsize=(12, 5), dpi=80, linewidth=10)
-        plt.plot(df_merged["DATE"], df_merged["INDUSTRIAL_INDEX"])
-        plt.title("INDUSTRIAL_INDEX Raw Data with Missing Values")
-        plt.xlabel("Time", fontsize=14)
-        plt.ylabel("Index", fontsize=14)
-        Saver.save_plots("industrial_index")
-        plt.clf()
-
+        self.context.publish("cleaned_data", cleaned_data, "processed")
+
+    def _get_joiner(self, al_price, raw_tables):
+        joiner = AsOfJoiner(al_price)
+        for name, source in self.settings["preprocess"]["raw_data"]["sources"].items():
+            joiner.add_source(
+                raw_tables[name],
+                match=source.get("match", "exact"),
+                tolerance_days=source.get("tolerance_days"),
+                fill=source.get("fill", "none"),
+                fill_output_suffix=source.get("fill_output_suffix", ""),
+            )
+        return joiner
+
+    def _get_average_industrial_value(self, df_merged, joiner):
         logger.info("Starting Pre-processing of the industrial index")
+        industrial_index = df_merged[["DATE", "INDUSTRIAL_INDEX"]].copy()
+        joiner.fill(industrial_index, ["INDUSTRIAL_INDEX"])
+
         start_date = pd.to_datetime("2022-03-01")
         end_date = pd.to_datetime("2023-03-01")
-        selected_rows = df_merged[
-            (df_merged["DATE"] >= start_date) & (df_merged["DATE"] <= end_date)
+        selected_rows = industrial_index[
+            (industrial_index["DATE"] >= start_date)
+            & (industrial_index["DATE"] <= end_date)
         ]
         average_Industrial_value = selected_rows["INDUSTRIAL_INDEX"].mean()
         logger.debug(
             f"Average value between {start_date} and {end_date}: {average_Industrial_value}"
         )
-        df_merged["INDUSTRIAL_INDEX"].fillna(average_Industrial_value, inplace=True)
+        return average_Industrial_value
 
-        logger.info(
-            "Fill the null values in CCFI_INDEX with the average of the available two consecutive weekly data"  # noqa
-        )
-        df_merged["CCFI_INDEX_NEW"] = (
-            df_merged["CCFI_INDEX"].bfill() + df_merged["CCFI_INDEX"].ffill()
-        ) / 2
-        df_merged.drop("CCFI_INDEX", axis=1, inplace=True)
+    def _impute(self, df_merged, joiner, average_industrial_value, plot_diagnostics):
+        logger.info("Filling in industrial index...")
+        joiner.fill(df_merged, ["INDUSTRIAL_INDEX"])
+
+        if plot_diagnostics:
+            logger.info("Filling in industrial index...")
+            self.context.plotter.request(
+                render_lines,
+                "industrial_index.png",
+                lines=[
+                    (
+                        df_merged["DATE"].to_numpy(),
+                        df_merged["INDUSTRIAL_INDEX"].to_numpy(),
+                        None,
+                    )
+                ],
+                title="INDUSTRIAL_INDEX Raw Data with Missing Values",
+                xlabel="Time",
+                ylabel="Index",
+                figsize=(12, 5),
+            )
+
+        df_merged["INDUSTRIAL_INDEX"].fillna(average_industrial_value, inplace=True)
 
         logger.info(
-            "fill the null values in SCFI_INDEX with the average of the available two consecutive weekly data"  # noqa
+            "Fill the null values in CCFI_INDEX and SCFI_INDEX with the average of the available two consecutive weekly data"  # noqa
         )
-        df_merged["SCFI_INDEX_NEW"] = (
-            df_merged["SCFI_INDEX"].bfill() + df_merged["SCFI_INDEX"].ffill()
-        ) / 2
-        df_merged.drop("SCFI_INDEX", axis=1, inplace=True)
-
-        logger.info("Plotting missing values indication plot again...")
-        msno.matrix(df_merged)
-        Saver.save_plots("missing_value_indication_after_index_ccfi_scfi_update")
-        plt.clf()
-
-        logger.info("Plotting Aluminium Corporation of China Stock prices...")
-        plt.plot(df_merged["ACC_CLOSE"], label="ACC_CLOSE")
-        plt.plot(df_merged["ACC_OPEN"], label="ACC_OPEN")
-        plt.legend()
-        Saver.save_plots("acc_stock_price")
-        plt.clf()
-
-        logger.info("Plotting Aluminium Corporation of China Stock prices...")
-        df_merged = df_merged.sort_values("DATE")
-        plt.plot(df_merged["DATE"], df_merged["ACC_VOLUME"], label="ACC_VOLUME")
-        Saver.save_plots("acc_stock_vol")
-        plt.clf()
+        joiner.fill(df_merged, ["CCFI_INDEX", "SCFI_INDEX"])
+
+        if plot_diagnostics:
+            logger.info("Plotting missing values indication plot again...")
+            self.context.plotter.request(
+                render_missing_values,
+                "missing_value_indication_after_index_ccfi_scfi_update.png",
+                df=df_merged,
+            )
+
+            logger.info("Plotting Aluminium Corporation of China Stock prices...")
+            self.context.plotter.request(
+                render_lines,
+                "acc_stock_price.png",
+                lines=[
+                    (df_merged.index.to_numpy(), df_merged[column].to_numpy(), column)
+                    for column in ["ACC_CLOSE", "ACC_OPEN"]
+                ],
+                legend=True,
+            )
+
+            logger.info("Plotting Aluminium Corporation of China Stock prices...")
+            self.context.plotter.request(
+                render_lines,
+                "acc_stock_vol.png",
+                lines=[
+                    (
+                        df_merged["DATE"].to_numpy(),
+                        df_merged["ACC_VOLUME"].to_numpy(),
+                        "ACC_VOLUME",
+                    )
+                ],
+            )
 
         logger.debug(
             "Impute the missing values using Rolling Window Method(Linear Interpolation"
         )
-        df_merged["ACC_OPEN"] = df_merged["ACC_OPEN"].interpolate(method="linear")
-        df_merged["ACC_CLOSE"] = df_merged["ACC_CLOSE"].interpolate(method="linear")
-        df_merged["ACC_VOLUME"] = df_merged["ACC_VOLUME"].interpolate(method="linear")
+        joiner.fill(df_merged, ["ACC_OPEN", "ACC_CLOSE", "ACC_VOLUME"])
 
-        logger.info("Plotting missing values indication plot again...")
-        msno.matrix(df_merged)
-        Saver.save_plots("missing_value_indication_after_acc_update")
-        plt.clf()
+        if plot_diagnostics:
+            logger.info("Plotting missing values indication plot again...")
+            self.context.plotter.request(
+                render_missing_values,
+                "missing_value_indication_after_acc_update.png",
+                df=df_merged,
+            )
 
         logger.debug("Backfilling all the other columns...")
-        df_merged["OIL_PRICE"] = df_merged["OIL_PRICE"].bfill()
-        df_merged["COAL"] = df_merged["COAL"].bfill()
-        df_merged["US_DOLLAR"] = df_merged["US_DOLLAR"].bfill()
-        df_merged["AUS_DOLLAR"] = df_merged["AUS_DOLLAR"].bfill()
-        df_merged["LONDON_AL_PRICE"] = df_merged["LONDON_AL_PRICE"].bfill()
-        df_merged["LONDON_AL_VOL"] = df_merged["LONDON_AL_VOL"].bfill()
+        joiner.fill(
+            df_merged,
+            [
+                "OIL_PRICE",
+                "COAL",
+                "US_DOLLAR",
+                "AUS_DOLLAR",
+                "LONDON_AL_PRICE",
+                "LONDON_AL_VOL",
+            ],
+        )
 
+        return df_merged
+
+    def _engineer_features(self, df_merged):
         logger.info("Starting to conduct feature engineering...")
 
         logger.debug("Generating percentage change in ACC stock price...")
@@ -231,73 +326,22 @@ class CleanEngineer(Module):
         logger.debug("Generating percentage change in aluminium price...")
         df_merged["AL_VOLATILITY"] = df_merged["AL_PRICE"].pct_change() * 100
 
-        logger.debug(
-            "Calculate RSI for the 'AL_PRICE' column and add it as a new column named 'RSI' to the DataFrame"  # noqa
-        )
-        df_merged["RSI"] = self._calculate_rsi(df_merged["AL_PRICE"])
+        indicator_columns = []
+        for indicator_settings in self.settings["preprocess"]["cleaning"]["indicators"]:
+            logger.debug(
+                f'Calculate [{indicator_settings["name"]}] for the [{indicator_settings["column"]}] column and add it as new columns to the DataFrame'  # noqa
+            )
+            indicator = create_indicator(indicator_settings)
+            indicator_values = indicator.batch(
+                df_merged[indicator_settings["column"]],
+                high=df_merged.get(indicator_settings.get("high_column")),
+                low=df_merged.get(indicator_settings.get("low_column")),
+            )
+            for suffix, column in output_columns(indicator_settings, indicator).items():
+                df_merged[column] = indicator_values[suffix]
+                indicator_columns.append(column)
 
-        logger.debug("Dropping rows with missing values as a result of RSI calculation")
-        df_merged = df_merged.dropna(subset=["RSI"])
-
-        logger.info("Plotting missing values indication plot again...")
-        plt.plot(df_merged["RSI"])
-        Saver.save_plots("rsi_plot")
-        plt.clf()
-
-        Saver.save_csv(df_merged, "cleaned_data", "processed")
-
-    def _extract_metal_price(self, metal: str) -> Dict:
-        all_metal_futures = pd.read_csv("data/raw/futures prices.csv")
-        all_metal_futures["DATE"] = pd.to_datetime(
-            all_metal_futures["date"], format="%d/%m/%Y"
-        )
-        all_metal_futures = all_metal_futures.drop(
-            ["TRADINGDAY", "id", "Unnamed: 0"], axis=1
-        )
-        metal_prices = all_metal_futures[
-            all_metal_futures.INSTRUMENTID.str.startswith(metal)
-        ].reset_index()
-        metal_prices["exec_year"] = "20" + metal_prices.INSTRUMENTID.str[2:4]
-        metal_prices["exec_month"] = metal_prices.INSTRUMENTID.str[-2:]
-        metal_prices["exec_date"] = (
-            metal_prices["exec_year"] + "-" + metal_prices["exec_month"] + "-" + "15"
-        )
-        metal_prices["exec_date"] = pd.to_datetime(metal_prices["exec_date"])
-        metal_prices["exec_begin_date"] = metal_prices["exec_date"] - pd.DateOffset(
-            months=1
-        )
-        metal_prices = metal_prices[
-            (metal_prices["DATE"] > metal_prices["exec_begin_date"])
-            & (metal_prices["DATE"] <= metal_prices["exec_date"])
-        ]
-        metal_prices = (
-            metal_prices.reset_index(drop=True)
-            .sort_values("DATE")
-            .drop(["exec_year", "exec_month", "exec_date", "exec_begin_date"], axis=1)
+        logger.debug(
+            "Dropping rows with missing values as a result of indicator calculation"
         )
-        metal_prices = metal_prices[
-            metal_prices.SETTLEMENTPRICE.isnull() == False
-        ].reset_index(drop=True)
-        metal_prices = metal_prices[["DATE", "SETTLEMENTPRICE"]]
-
-        return metal_prices
-
-    def _calculate_rsi(self, prices, period=14):
-        logger.debug("Calculate daily price changes")
-        delta = prices.diff()
-
-        logger.debug("Separate gains and losses")
-        gains = delta.where(delta > 0, 0)
-        losses = -delta.where(delta < 0, 0)
-
-        logger.debug("Calculate average gains and losses over the specified period")
-        avg_gain = gains.rolling(window=period).mean()
-        avg_loss = losses.rolling(window=period).mean()
-
-        logger.debug("Calculate the relative strength (RS)")
-        rs = avg_gain / avg_loss
-
-        logger.debug("Calculate the RSI")
-        rsi = 100 - (100 / (1 + rs))
-
-        return rsi
+        return df_merged.dropna(subset=indicator_columns)
@@ -0,0 +1,167 @@
+import logging
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger("al_engine")
+
+ROLL_POLICIES = ["fixed_day", "volume", "open_interest"]
+BACK_ADJUSTMENTS = ["none", "difference", "ratio"]
+
+
+def build_continuous_series(
+    futures: pd.DataFrame,
+    roll_policy: str = "fixed_day",
+    roll_day: int = 15,
+    back_adjustment: str = "none",
+    volume_column: str = "VOLUME",
+    open_interest_column: str = "OPENINTEREST",
+) -> pd.DataFrame:
+    """
+    Build one continuous settlement price series per product out of the quotes of
+    all its contracts, keeping exactly one contract per product and trading day.
+
+    futures needs PRODUCT, DATE, CONTRACT_MONTH (months since 1970-01) and
+    SETTLEMENTPRICE columns, plus the volume or open interest column when rolling
+    on those. fixed_day holds a contract until roll_day of its delivery month,
+    volume and open_interest hold the most active contract without rolling back
+    to an earlier one. Back adjustment shifts (difference) or scales (ratio) the
+    history before each roll so the series has no gap on roll days.
+    """
+    if roll_policy not in ROLL_POLICIES:
+        raise NotImplementedError(f"Roll policy [{roll_policy}] is not supported")
+    if back_adjustment not in BACK_ADJUSTMENTS:
+        raise NotImplementedError(
+            f"Back adjustment [{back_adjustment}] is not supported"
+        )
+
+    logger.debug("Dropping quotes without a price or a contract month...")
+    quotes = futures[
+        futures["SETTLEMENTPRICE"].notnull()
+        & futures["CONTRACT_MONTH"].notnull()
+        & futures["PRODUCT"].notnull()
+    ]
+    products = pd.Categorical(quotes["PRODUCT"])
+    product = products.codes.astype(np.int64)
+    day = quotes["DATE"].to_numpy().astype("datetime64[D]").astype(np.int64)
+    contract = quotes["CONTRACT_MONTH"].to_numpy().astype(np.int64)
+    price = quotes["SETTLEMENTPRICE"].to_numpy(dtype=np.float64)
+
+    logger.debug("Sorting quotes by product, trading day and contract...")
+    order = np.lexsort((contract, day, product))
+    product, day, contract, price = (
+        product[order],
+        day[order],
+        contract[order],
+        price[order],
+    )
+    group = product * 10**6 + day
+    quote_key = group * 10**5 + contract
+    is_last_duplicate = np.append(quote_key[1:] != quote_key[:-1], True)
+    logger.debug(f"Dropping [{(~is_last_duplicate).sum()}] duplicated quotes")
+    product, day, contract, price, group, quote_key = (
+        array[is_last_duplicate]
+        for array in (product, day, contract, price, group, quote_key)
+    )
+
+    logger.info(f"Selecting one contract per trading day with [{roll_policy}] policy")
+    if roll_policy == "fixed_day":
+        roll_date = (
+            contract.astype("datetime64[M]").astype("datetime64[D]").astype(np.int64)
+            + roll_day
+            - 1
+        )
+        candidates = np.flatnonzero(day <= roll_date)
+        # quotes are sorted by contract within a day, first candidate is the nearest
+        _, first_candidate = np.unique(group[candidates], return_index=True)
+        selected = candidates[first_candidate]
+    else:
+        activity_column = (
+            volume_column if roll_policy == "volume" else open_interest_column
+        )
+        activity = (
+            quotes[activity_column]
+            .fillna(0)
+            .to_numpy(dtype=np.float64)[order][is_last_duplicate]
+        )
+        activity_order = np.lexsort((contract, -activity, group))
+        _, most_active = np.unique(group[activity_order], return_index=True)
+        selected = activity_order[most_active]
+
+        logger.debug("Preventing rolls back into an earlier contract...")
+        rolled_contract = np.maximum.accumulate(
+            product[selected] * 10**5 + contract[selected]
+        ) - (product[selected] * 10**5)
+        rolled_key = group[selected] * 10**5 + rolled_contract
+        rolled_position = np.minimum(
+            np.searchsorted(quote_key, rolled_key), len(quote_key) - 1
+        )
+        is_quoted = quote_key[rolled_position] == rolled_key
+        selected = np.where(is_quoted, rolled_position, selected)
+
+    selected_product = product[selected]
+    selected_contract = contract[selected]
+    selected_price = price[selected]
+    is_roll = np.append(
+        False,
+        (selected_product[1:] == selected_product[:-1])
+        & (selected_contract[1:] != selected_contract[:-1]),
+    )
+    logger.debug(f"Number of rolls across all products is [{is_roll.sum()}]")
+
+    if back_adjustment != "none":
+        logger.info(f"Back adjusting the series with [{back_adjustment}] method")
+        selected_price = _back_adjust(
+            selected_product,
+            selected_price,
+            selected_contract,
+            group[selected],
+            is_roll,
+            quote_key,
+            price,
+            back_adjustment,
+        )
+
+    return pd.DataFrame(
+        {
+            "PRODUCT": products.categories[selected_product],
+            "DATE": day[selected].astype("datetime64[D]").astype("datetime64[ns]"),
+            "CONTRACT_MONTH": selected_contract,
+            "SETTLEMENTPRICE": selected_price,
+        }
+    )
+
+
+def _back_adjust(
+    product, series_price, contract, group, is_roll, quote_key, price, back_adjustment
+):
+    roll_position = np.flatnonzero(is_roll)
+
+    logger.debug("Looking up the expiring contract's price on every roll day...")
+    expiring_key = group[roll_position] * 10**5 + contract[roll_position - 1]
+    expiring_position = np.minimum(
+        np.searchsorted(quote_key, expiring_key), len(quote_key) - 1
+    )
+    is_quoted = quote_key[expiring_position] == expiring_key
+    if (~is_quoted).any():
+        logger.warning(
+            f"[{(~is_quoted).sum()}] rolls have no quote of the expiring contract on the roll day, leaving them unadjusted"  # noqa
+        )
+    expiring_price = price[expiring_position]
+    next_product_start = np.searchsorted(product, product, side="right")
+
+    # adjustments of a roll apply to every earlier day of the same product
+    if back_adjustment == "difference":
+        gaps = np.zeros(len(series_price))
+        gaps[roll_position - 1] = np.where(
+            is_quoted, series_price[roll_position] - expiring_price, 0
+        )
+        cumulative = np.append(np.cumsum(gaps[::-1])[::-1], 0)
+        return series_price + cumulative[:-1] - cumulative[next_product_start]
+
+    ratios = np.ones(len(series_price))
+    ratios[roll_position - 1] = np.where(
+        is_quoted, series_price[roll_position] / expiring_price, 1
+    )
+    cumulative = np.append(np.cumprod(ratios[::-1])[::-1], 1)
+    return series_price * cumulative[:-1] / cumulative[next_product_start]
@@ -1,10 +1,15 @@
 import logging
 import os
 
+import numpy as np
 import pandas as pd
 
 from src.modules.base import Module
-from src.utils.saver import Saver
+from src.modules.data_processing.differencing_engine import (
+    difference,
+    fractional_difference,
+)
+from src.utils.loader import Loader
 
 logger = logging.getLogger("al_engine")
 
@@ -14,48 +19,59 @@ class Differencing(Module):
         module_name = os.path.basename(__file__).replace(".py", "")
         super().__init__(module_name)
 
-    def run(self):
-        logger.info("Reading in cleaned and scaled dataframe")
-        scaled_cleaned_data = pd.read_csv("data/processed/cleaned_data.csv")
-
-        logger.info("Define columns to differencing on")
-        columns_to_difference = [
-            "AL_PRICE",
-            "OIL_PRICE",
-            "CU_PRICE",
-            "SCFI_INDEX_NEW",
-            "CCFI_INDEX_NEW",
-            "COAL",
-            "US_DOLLAR",
-            "AUS_DOLLAR",
-            "LONDON_AL_PRICE",
-            "ACC_OPEN",
-            "ACC_CLOSE",
+        self.input_files = [Loader.artifact_path("cleaned_data", "processed")]
+        self.config_keys = ["preprocess.differencing"]
+        self.output_files = [
+            Loader.artifact_path("differenced_scaled_cleaned_data", "processed")
         ]
+
+    def run(self):
+        differencing_settings = self.settings["preprocess"]["differencing"]
+        columns_to_difference = differencing_settings["columns"]
         logger.debug(f"Selected  columns for differencing are: {columns_to_difference}")
+        columns_to_append = differencing_settings["append_columns"]
 
-        logger.debug(
-            "Take 1st Order Differncing on chosen columns and append back other columns"
+        logger.info("Reading in cleaned and scaled dataframe")
+        scaled_cleaned_data = self.context.consume(
+            "cleaned_data",
+            "processed",
+            columns=columns_to_difference + columns_to_append,
         )
-        differenced_scaled_cleaned_data = (
-            scaled_cleaned_data[columns_to_difference].copy().diff().dropna()
+
+        values = scaled_cleaned_data[columns_to_difference].to_numpy(dtype=np.float64)
+        if differencing_settings["method"] == "integer":
+            logger.debug(
+                f'Take order [{differencing_settings["order"]}] lag [{differencing_settings["lag"]}] differences on chosen columns'  # noqa
+            )
+            differenced_values = difference(
+                values, differencing_settings["order"], differencing_settings["lag"]
+            )
+        elif differencing_settings["method"] == "fractional":
+            logger.debug(
+                f'Take fractional differences with d [{differencing_settings["d"]}] over a window of [{differencing_settings["window"]}] rows on chosen columns'  # noqa
+            )
+            differenced_values = fractional_difference(
+                values, differencing_settings["d"], differencing_settings["window"]
+            )
+        else:
+            raise NotImplementedError(
+                f'Differencing method [{differencing_settings["method"]}] is not supported'  # noqa
+            )
+
+        logger.debug(
+            "Drop rows without differences and append back other columns by position"
         )
-        differenced_scaled_cleaned_data = differenced_scaled_cleaned_data.merge(
-            scaled_cleaned_data[
-                [
-                    "AL_VOLATILITY",
-                    "ACC_CHANGE_WITHIN_A_DAY",
-                    "ACC_CHANGE_ACROSS_DAYS",
-                    "ACC_VOLUME",
-                    "DATE",
-                ]
-            ],
-            left_index=True,
-            right_index=True,
+        is_differenced = ~np.isnan(differenced_values).any(axis=1)
+        differenced_scaled_cleaned_data = pd.DataFrame(
+            differenced_values[is_differenced], columns=columns_to_difference
         )
+        for column in columns_to_append:
+            differenced_scaled_cleaned_data[column] = scaled_cleaned_data[
+                column
+            ].to_numpy()[is_differenced]
 
-        Saver.save_csv(
-            differenced_scaled_cleaned_data,
+        self.context.publish(
             "differenced_scaled_cleaned_data",
+            differenced_scaled_cleaned_data,
             "processed",
         )
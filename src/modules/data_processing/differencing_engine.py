@@ -0,0 +1,112 @@
+import logging
+from functools import lru_cache
+from typing import Sequence, Union
+
+import numpy as np
+
+logger = logging.getLogger("al_engine")
+
+
+def difference(values: np.ndarray, order: int = 1, lag: int = 1) -> np.ndarray:
+    """
+    order times repeated lag differences of the rows of values, keeping its shape
+    with the first order * lag rows NaN. lag 1 is the usual differencing, a lag
+    of e.g. 5 trading days takes seasonal differences
+    """
+    differenced = np.asarray(values, dtype=np.float64)
+    for _ in range(order):
+        shifted = np.full_like(differenced, np.nan)
+        shifted[lag:] = differenced[lag:] - differenced[:-lag]
+        differenced = shifted
+    return differenced
+
+
+def integrate(
+    differences: np.ndarray, history: np.ndarray, order: int = 1, lag: int = 1
+) -> np.ndarray:
+    """
+    Exact inverse of difference: turn the order * lag differences following
+    history, e.g. differenced forecasts, back into levels. history holds the
+    levels right before the differences and needs at least order * lag rows
+    """
+    differences = np.asarray(differences, dtype=np.float64)
+    history = np.asarray(history, dtype=np.float64)
+    if len(history) < order * lag:
+        raise ValueError(
+            f"Integrating order [{order}] lag [{lag}] differences needs [{order * lag}] rows of history"  # noqa
+        )
+
+    levels = differences
+    for lower_order in range(order - 1, -1, -1):
+        # the last lag values of the lower order differences seed each lag phase
+        seed = difference(history, lower_order, lag)[-lag:]
+        levels = _seasonal_cumsum(levels, seed, lag)
+    return levels
+
+
+def _seasonal_cumsum(values: np.ndarray, seed: np.ndarray, lag: int) -> np.ndarray:
+    # y[t] = values[t] + y[t - lag], seed standing in for y before values start
+    num_rows = len(values)
+    num_periods = -(-num_rows // lag)
+    padded = np.zeros((num_periods * lag,) + values.shape[1:])
+    padded[:num_rows] = values
+    by_phase = padded.reshape((num_periods, lag) + values.shape[1:])
+    return (np.cumsum(by_phase, axis=0) + seed).reshape(padded.shape)[:num_rows]
+
+
+@lru_cache(maxsize=None)
+def fractional_weights(d: float, window: int) -> np.ndarray:
+    """
+    First window binomial weights of (1 - B)^d, computed once per d and window
+    """
+    weights = np.ones(window)
+    for k in range(1, window):
+        weights[k] = -weights[k - 1] * (d - k + 1) / k
+    weights.setflags(write=False)
+    return weights
+
+
+def fractional_difference(
+    values: np.ndarray, d: Union[float, Sequence[float]], window: int
+) -> np.ndarray:
+    """
+    Fixed window fractional differences of the rows of values, the first
+    window - 1 rows being NaN. Every column and, when d is a sequence, every d
+    is taken in one batched product of the sliding windows with the weights,
+    giving an extra last axis over d
+    """
+    values = np.asarray(values, dtype=np.float64)
+    is_sweep = np.ndim(d) > 0
+    ds = np.atleast_1d(d)
+    # reversed so the newest value in each window meets the weight of lag 0
+    weights = np.stack(
+        [fractional_weights(float(d_value), window)[::-1] for d_value in ds], axis=1
+    )
+
+    differenced = np.full(values.shape + (len(ds),), np.nan)
+    if len(values) >= window:
+        windows = np.lib.stride_tricks.sliding_window_view(values, window, axis=0)
+        differenced[window - 1 :] = windows @ weights
+    return differenced if is_sweep else differenced[..., 0]
+
+
+def fractional_integrate(
+    differences: np.ndarray, history: np.ndarray, d: float, window: int
+) -> np.ndarray:
+    """
+    Exact inverse of fractional_difference for the differences following
+    history, which needs at least window - 1 rows of levels. Each level depends
+    on the ones before it, so rows are solved one at a time across all columns
+    """
+    differences = np.asarray(differences, dtype=np.float64)
+    history = np.asarray(history, dtype=np.float64)
+    if len(history) < window - 1:
+        raise ValueError(
+            f"Integrating window [{window}] fractional differences needs [{window - 1}] rows of history"  # noqa
+        )
+
+    lag_weights = fractional_weights(d, window)[1:][::-1]
+    levels = np.concatenate([history[len(history) - (window - 1) :], differences])
+    for row in range(window - 1, len(levels)):
+        levels[row] = levels[row] - lag_weights @ levels[row - window + 1 : row]
+    return levels[window - 1 :]
@@ -0,0 +1,142 @@
+import logging
+from typing import IO, Dict, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from src.modules.data_processing.continuous_contract import build_continuous_series
+
+logger = logging.getLogger("al_engine")
+
+
+def read_futures_prices(
+    file_path: Union[str, IO],
+    extra_columns: Optional[List[str]] = None,
+    since: Optional[pd.Timestamp] = None,
+    scraped_file_path: Optional[str] = None,
+) -> pd.DataFrame:
+    """
+    Read the SHFE settlement dump once, keeping only the columns needed and
+    parsing each distinct date and instrument id a single time. The days of the
+    scraped file replace the same days of the dump, and with since the quotes of
+    earlier days are dropped before any further parsing
+    """
+    logger.debug("Reading in futures prices...")
+    read_options = {
+        "usecols": ["date", "INSTRUMENTID", "SETTLEMENTPRICE"] + (extra_columns or []),
+        "dtype": {"date": "category", "INSTRUMENTID": "category"},
+    }
+    all_metal_futures = pd.read_csv(file_path, **read_options)
+    if scraped_file_path is not None:
+        logger.debug(f"Replacing the days scraped into [{scraped_file_path}]...")
+        scraped_futures = pd.read_csv(scraped_file_path, **read_options)
+        all_metal_futures = pd.concat(
+            [
+                all_metal_futures[
+                    ~all_metal_futures["date"].isin(
+                        scraped_futures["date"].cat.categories
+                    )
+                ],
+                scraped_futures,
+            ],
+            ignore_index=True,
+        ).astype(read_options["dtype"])
+
+    logger.debug("Parsing trading dates from their distinct values...")
+    all_metal_futures["DATE"] = all_metal_futures["date"].cat.rename_categories(
+        pd.to_datetime(all_metal_futures["date"].cat.categories, format="%d/%m/%Y")
+    )
+    all_metal_futures["DATE"] = all_metal_futures["DATE"].astype("datetime64[ns]")
+    if since is not None:
+        all_metal_futures = all_metal_futures[all_metal_futures["DATE"] >= since]
+
+    logger.debug("Deriving product and contract month from the instrument ids...")
+    instruments = all_metal_futures["INSTRUMENTID"].cat.categories.str.extract(
+        r"^(?P<PRODUCT>[a-zA-Z]+)(?P<YEAR>\d{2})(?P<MONTH>\d{2})$"
+    )
+    contract_months = (
+        (2000 + instruments["YEAR"].astype(float) - 1970) * 12
+        + instruments["MONTH"].astype(float)
+        - 1
+    ).to_numpy()
+    instrument_codes = all_metal_futures["INSTRUMENTID"].cat.codes.to_numpy()
+    is_known_instrument = (instrument_codes >= 0) & ~np.isnan(
+        contract_months[instrument_codes]
+    )
+
+    all_metal_futures["PRODUCT"] = pd.Categorical.from_codes(
+        np.where(
+            is_known_instrument,
+            pd.Categorical(instruments["PRODUCT"]).codes[instrument_codes],
+            -1,
+        ),
+        categories=pd.Categorical(instruments["PRODUCT"]).categories,
+    )
+    all_metal_futures["CONTRACT_MONTH"] = np.where(
+        is_known_instrument, contract_months[instrument_codes], np.nan
+    )
+
+    return all_metal_futures.drop(["date"], axis=1)
+
+
+def extract_continuous_prices(
+    file_path: Union[str, IO],
+    metals: List[str],
+    roll_settings: Dict,
+    since: Optional[pd.Timestamp] = None,
+    scraped_file_path: Optional[str] = None,
+) -> Dict[str, pd.DataFrame]:
+    """
+    Return the continuous settlement price series of every requested metal out of
+    a single read of the futures dump and the scraped days, see
+    build_continuous_series for the roll settings. With since only the series from since on is returned, built from
+    the quotes from since on when the roll settings allow it
+    """
+    activity_columns = {
+        "volume": [roll_settings["volume_column"]],
+        "open_interest": [roll_settings["open_interest_column"]],
+    }.get(roll_settings["roll_policy"], [])
+    if since is not None and not is_rebuilt_by_day(roll_settings):
+        logger.debug(
+            "Rolls depend on earlier days, building the continuous series from the full history"  # noqa
+        )
+        quotes_since = None
+    else:
+        quotes_since = since
+    all_metal_futures = read_futures_prices(
+        file_path, activity_columns, quotes_since, scraped_file_path
+    )
+
+    logger.debug(f"Building continuous price series for metals {metals}...")
+    continuous_prices = build_continuous_series(
+        all_metal_futures[all_metal_futures["PRODUCT"].isin(metals)],
+        roll_policy=roll_settings["roll_policy"],
+        roll_day=roll_settings["roll_day"],
+        back_adjustment=roll_settings["back_adjustment"],
+        volume_column=roll_settings["volume_column"],
+        open_interest_column=roll_settings["open_interest_column"],
+    )
+
+    if since is not None:
+        continuous_prices = continuous_prices[continuous_prices["DATE"] >= since]
+
+    metal_prices = {}
+    for metal in metals:
+        logger.debug(f"Selecting continuous prices for metal [{metal}]...")
+        metal_prices[metal] = continuous_prices.loc[
+            continuous_prices["PRODUCT"] == metal, ["DATE", "SETTLEMENTPRICE"]
+        ].reset_index(drop=True)
+
+    return metal_prices
+
+
+def is_rebuilt_by_day(roll_settings: Dict) -> bool:
+    """
+    Whether the continuous series of a day only depends on that day's quotes.
+    Activity policies never roll back to an earlier contract and back adjustment
+    rewrites the history before every roll, both depending on earlier days
+    """
+    return (
+        roll_settings["roll_policy"] == "fixed_day"
+        and roll_settings["back_adjustment"] == "none"
+    )
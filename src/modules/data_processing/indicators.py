@@ -0,0 +1,411 @@
+import logging
+import math
+from abc import ABC, abstractmethod
+from collections import deque
+from functools import partial
+from typing import Callable, Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger("al_engine")
+
+
+class Indicator(ABC):
+    """
+    A technical indicator computed either one price at a time with update, keeping
+    constant state per call, or over a whole series at once with batch for
+    backfilling. Both give the same values row for row.
+
+    outputs lists the suffixes of the columns produced, "" being the main one.
+    warmup_rows is how many rows before a given row are enough to reproduce its
+    value from scratch, None for recursive indicators depending on all history.
+    """
+
+    outputs = [""]
+    warmup_rows: Optional[int] = None
+
+    @abstractmethod
+    def update(
+        self, close: float, high: float = None, low: float = None
+    ) -> Dict[str, float]:
+        pass
+
+    @abstractmethod
+    def batch(
+        self, close: pd.Series, high: pd.Series = None, low: pd.Series = None
+    ) -> pd.DataFrame:
+        pass
+
+
+class _SlidingWindow:
+    """
+    Mean and variance of the last period values updated in constant time with
+    Welford's method, values leaving the window being removed the same way
+    """
+
+    def __init__(self, period: int) -> None:
+        self.period = period
+        self.values = deque()
+        self.mean = 0.0
+        self.sum_of_squares = 0.0
+
+    def push(self, value: float) -> None:
+        self.values.append(value)
+        if len(self.values) > self.period:
+            removed = self.values.popleft()
+            previous_mean = self.mean
+            self.mean += (value - removed) / self.period
+            self.sum_of_squares += (value - removed) * (
+                value - self.mean + removed - previous_mean
+            )
+        else:
+            previous_mean = self.mean
+            self.mean += (value - previous_mean) / len(self.values)
+            self.sum_of_squares += (value - previous_mean) * (value - self.mean)
+
+    def is_full(self) -> bool:
+        return len(self.values) == self.period
+
+    def std(self, ddof: int) -> float:
+        return math.sqrt(max(self.sum_of_squares, 0.0) / (self.period - ddof))
+
+
+def _rolling(values: pd.Series, period: int, statistic: Callable) -> pd.Series:
+    """
+    statistic of every window of period values, NaN before the first full window.
+    Each window is reduced on its own rather than from running sums as pandas'
+    rolling does, so a value only depends on the values in its window and not
+    on how far back the series starts
+    """
+    result = np.full(len(values), np.nan)
+    if len(values) >= period:
+        windows = np.lib.stride_tricks.sliding_window_view(
+            values.to_numpy(dtype=np.float64), period
+        )
+        result[period - 1 :] = statistic(windows, axis=1)
+    return pd.Series(result, index=values.index)
+
+
+def _relative_strength_index(average_gain, average_loss):
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return 100 - (100 / (1 + np.divide(average_gain, average_loss)))
+
+
+def _wilder_average(values: np.ndarray, period: int) -> np.ndarray:
+    """
+    Wilder's smoothing seeded with the simple average of the first period values,
+    NaN until then
+    """
+    average = np.full(len(values), np.nan)
+    if len(values) < period:
+        return average
+    seeded = values[period - 1 :].copy()
+    seeded[0] = values[:period].mean()
+    average[period - 1 :] = (
+        pd.Series(seeded).ewm(alpha=1 / period, adjust=False).mean().to_numpy()
+    )
+    return average
+
+
+class RelativeStrengthIndex(Indicator):
+    """
+    RSI with sma smoothing averages gains and losses over a rolling window, as
+    the cleaned table always did, the first price change counting as no change.
+    wilder smoothing starts from the first actual price change instead.
+    """
+
+    def __init__(self, period: int = 14, smoothing: str = "sma") -> None:
+        if smoothing not in ["sma", "wilder"]:
+            raise NotImplementedError(f"RSI smoothing [{smoothing}] is not supported")
+        self.period = period
+        self.smoothing = smoothing
+        self.warmup_rows = period + 1 if smoothing == "sma" else None
+
+        self.previous_close = None
+        self.gains = deque()
+        self.losses = deque()
+        self.gain_sum = 0.0
+        self.loss_sum = 0.0
+        self.average_gain = None
+        self.average_loss = None
+
+    def update(self, close, high=None, low=None):
+        delta = math.nan if self.previous_close is None else close - self.previous_close
+        is_first_close = self.previous_close is None
+        self.previous_close = close
+        gain = delta if delta > 0 else 0.0
+        loss = -delta if delta < 0 else 0.0
+
+        if self.smoothing == "sma":
+            self.gains.append(gain)
+            self.losses.append(loss)
+            self.gain_sum += gain
+            self.loss_sum += loss
+            if len(self.gains) > self.period:
+                self.gain_sum -= self.gains.popleft()
+                self.loss_sum -= self.losses.popleft()
+            if len(self.gains) < self.period:
+                return {"": math.nan}
+            return {
+                "": float(
+                    _relative_strength_index(
+                        np.float64(self.gain_sum / self.period),
+                        np.float64(self.loss_sum / self.period),
+                    )
+                )
+            }
+
+        if is_first_close:
+            return {"": math.nan}
+        if self.average_gain is None:
+            self.gains.append(gain)
+            self.losses.append(loss)
+            if len(self.gains) < self.period:
+                return {"": math.nan}
+            self.average_gain = float(np.mean(self.gains))
+            self.average_loss = float(np.mean(self.losses))
+        else:
+            alpha = 1 / self.period
+            self.average_gain = (1 - alpha) * self.average_gain + alpha * gain
+            self.average_loss = (1 - alpha) * self.average_loss + alpha * loss
+        return {
+            "": float(
+                _relative_strength_index(
+                    np.float64(self.average_gain), np.float64(self.average_loss)
+                )
+            )
+        }
+
+    def batch(self, close, high=None, low=None):
+        delta = close.diff()
+        gains = delta.where(delta > 0, 0)
+        losses = -delta.where(delta < 0, 0)
+
+        if self.smoothing == "sma":
+            average_gain = _rolling(gains, self.period, np.mean)
+            average_loss = _rolling(losses, self.period, np.mean)
+        else:
+            average_gain = pd.Series(np.nan, index=close.index)
+            average_loss = pd.Series(np.nan, index=close.index)
+            average_gain.iloc[1:] = _wilder_average(
+                gains.to_numpy(dtype=np.float64)[1:], self.period
+            )
+            average_loss.iloc[1:] = _wilder_average(
+                losses.to_numpy(dtype=np.float64)[1:], self.period
+            )
+
+        return pd.DataFrame(
+            {"": _relative_strength_index(average_gain, average_loss)},
+            index=close.index,
+        )
+
+
+class ExponentialMovingAverage(Indicator):
+    """
+    EMA with smoothing 2 / (period + 1) seeded with the first price
+    """
+
+    def __init__(self, period: int = 20) -> None:
+        self.period = period
+        self.alpha = 2 / (period + 1)
+        self.average = None
+
+    def update(self, close, high=None, low=None):
+        if self.average is None:
+            self.average = close
+        else:
+            self.average = (1 - self.alpha) * self.average + self.alpha * close
+        return {"": self.average}
+
+    def batch(self, close, high=None, low=None):
+        return pd.DataFrame(
+            {"": close.ewm(span=self.period, adjust=False).mean()}, index=close.index
+        )
+
+
+class MovingAverageConvergenceDivergence(Indicator):
+    """
+    MACD line as the fast minus the slow EMA, its signal line as the EMA of the
+    MACD line and the histogram as their difference
+    """
+
+    outputs = ["", "SIGNAL", "HISTOGRAM"]
+
+    def __init__(
+        self, fast_period: int = 12, slow_period: int = 26, signal_period: int = 9
+    ) -> None:
+        self.fast_average = ExponentialMovingAverage(fast_period)
+        self.slow_average = ExponentialMovingAverage(slow_period)
+        self.signal_average = ExponentialMovingAverage(signal_period)
+
+    def update(self, close, high=None, low=None):
+        macd = self.fast_average.update(close)[""] - self.slow_average.update(close)[""]
+        signal = self.signal_average.update(macd)[""]
+        return {"": macd, "SIGNAL": signal, "HISTOGRAM": macd - signal}
+
+    def batch(self, close, high=None, low=None):
+        macd = self.fast_average.batch(close)[""] - self.slow_average.batch(close)[""]
+        signal = self.signal_average.batch(macd)[""]
+        return pd.DataFrame(
+            {"": macd, "SIGNAL": signal, "HISTOGRAM": macd - signal}, index=close.index
+        )
+
+
+class BollingerBands(Indicator):
+    """
+    Rolling mean of the price with bands num_std population standard deviations
+    above and below it
+    """
+
+    outputs = ["MIDDLE", "UPPER", "LOWER"]
+
+    def __init__(self, period: int = 20, num_std: float = 2) -> None:
+        self.period = period
+        self.num_std = num_std
+        self.warmup_rows = period
+        self.window = _SlidingWindow(period)
+
+    def update(self, close, high=None, low=None):
+        self.window.push(close)
+        if not self.window.is_full():
+            return {"MIDDLE": math.nan, "UPPER": math.nan, "LOWER": math.nan}
+        width = self.num_std * self.window.std(ddof=0)
+        return {
+            "MIDDLE": self.window.mean,
+            "UPPER": self.window.mean + width,
+            "LOWER": self.window.mean - width,
+        }
+
+    def batch(self, close, high=None, low=None):
+        middle = _rolling(close, self.period, np.mean)
+        width = self.num_std * _rolling(close, self.period, partial(np.std, ddof=0))
+        return pd.DataFrame(
+            {"MIDDLE": middle, "UPPER": middle + width, "LOWER": middle - width},
+            index=close.index,
+        )
+
+
+class RollingVolatility(Indicator):
+    """
+    Sample standard deviation of the daily percentage price changes over a
+    rolling window
+    """
+
+    def __init__(self, period: int = 22) -> None:
+        self.period = period
+        self.warmup_rows = period + 1
+        self.previous_close = None
+        self.window = _SlidingWindow(period)
+
+    def update(self, close, high=None, low=None):
+        previous_close = self.previous_close
+        self.previous_close = close
+        if previous_close is None:
+            return {"": math.nan}
+        self.window.push((close / previous_close - 1) * 100)
+        if not self.window.is_full():
+            return {"": math.nan}
+        return {"": self.window.std(ddof=1)}
+
+    def batch(self, close, high=None, low=None):
+        return pd.DataFrame(
+            {
+                "": _rolling(
+                    close.pct_change() * 100, self.period, partial(np.std, ddof=1)
+                )
+            },
+            index=close.index,
+        )
+
+
+class AverageTrueRange(Indicator):
+    """
+    Wilder's average of the true range. Without high and low prices the true
+    range of a day is its absolute settlement price change.
+    """
+
+    def __init__(self, period: int = 14) -> None:
+        self.period = period
+        self.previous_close = None
+        self.true_ranges = []
+        self.average = None
+
+    def update(self, close, high=None, low=None):
+        previous_close = self.previous_close
+        self.previous_close = close
+        if previous_close is None:
+            return {"": math.nan}
+        if high is None or low is None:
+            true_range = abs(close - previous_close)
+        else:
+            true_range = max(
+                high - low, abs(high - previous_close), abs(low - previous_close)
+            )
+
+        if self.average is None:
+            self.true_ranges.append(true_range)
+            if len(self.true_ranges) < self.period:
+                return {"": math.nan}
+            self.average = float(np.mean(self.true_ranges))
+        else:
+            alpha = 1 / self.period
+            self.average = (1 - alpha) * self.average + alpha * true_range
+        return {"": self.average}
+
+    def batch(self, close, high=None, low=None):
+        previous_close = close.shift(1)
+        if high is None or low is None:
+            true_range = (close - previous_close).abs()
+        else:
+            true_range = pd.concat(
+                [
+                    high - low,
+                    (high - previous_close).abs(),
+                    (low - previous_close).abs(),
+                ],
+                axis=1,
+            ).max(axis=1, skipna=False)
+
+        average = np.full(len(close), np.nan)
+        average[1:] = _wilder_average(
+            true_range.to_numpy(dtype=np.float64)[1:], self.period
+        )
+        return pd.DataFrame({"": average}, index=close.index)
+
+
+INDICATORS = {
+    "rsi": RelativeStrengthIndex,
+    "ema": ExponentialMovingAverage,
+    "macd": MovingAverageConvergenceDivergence,
+    "bollinger": BollingerBands,
+    "volatility": RollingVolatility,
+    "atr": AverageTrueRange,
+}
+
+
+def create_indicator(indicator_settings: Dict) -> Indicator:
+    """
+    Build an indicator from its config entry, every key other than name, column,
+    output, high_column and low_column being passed on as a parameter
+    """
+    if indicator_settings["name"] not in INDICATORS:
+        raise NotImplementedError(
+            f'Indicator [{indicator_settings["name"]}] is not supported'
+        )
+    parameters = {
+        key: value
+        for key, value in indicator_settings.items()
+        if key not in ["name", "column", "output", "high_column", "low_column"]
+    }
+    return INDICATORS[indicator_settings["name"]](**parameters)
+
+
+def output_columns(indicator_settings: Dict, indicator: Indicator) -> Dict[str, str]:
+    """
+    Map each output suffix of an indicator to its column in the cleaned table
+    """
+    return {
+        suffix: "_".join(filter(None, [indicator_settings["output"], suffix]))
+        for suffix in indicator.outputs
+    }
@@ -1,22 +1,38 @@
 import logging
 import os
+from typing import List
 
+import numpy as np
 import pandas as pd
 
 from src.modules.base import Module
-from src.utils.saver import Saver
+from src.utils.loader import Loader
 
 logger = logging.getLogger("al_engine")
 
+TARGET_PREFIX = "SHIFTED_PRICE"
+
 
 class PrepareTraining(Module):
     def __init__(self) -> None:
         module_name = os.path.basename(__file__).replace(".py", "")
         super().__init__(module_name)
 
+        self.input_files = [Loader.artifact_path("scaled_cleaned_data", "processed")]
+        self.config_keys = ["model.data"]
+        self.output_files = [
+            Loader.artifact_path(filename, "modelling")
+            for filename in [
+                "training_unshifted",
+                "testing_unshifted",
+                "training_shifted",
+                "testing_shifted",
+            ]
+        ]
+
     def run(self):
         logger.debug("Reading in cleaned scaled dataframe")
-        scaled_cleaned_data = pd.read_csv("data/processed/scaled_cleaned_data.csv")
+        scaled_cleaned_data = self.context.consume("scaled_cleaned_data", "processed")
 
         logger.info("Creating training dataframe for non-shifted al price")
         training_unshifted, testing_unshifted = self._split_train_test_data(
@@ -30,14 +46,27 @@ class PrepareTraining(Module):
         shifted_df["SHIFTED_PRICE"] = scaled_cleaned_data["AL_PRICE"].shift(
             self.settings["model"]["data"]["shift"]
         )
+        horizons = self.settings["model"]["data"]["horizons"]
+        logger.debug(f"Adding targets for the [{horizons}] horizons from 1 in one pass")
+        shifted_df = pd.concat(
+            [
+                shifted_df,
+                pd.DataFrame(
+                    horizon_targets(scaled_cleaned_data["AL_PRICE"], horizons),
+                    columns=horizon_columns(horizons),
+                    index=shifted_df.index,
+                ),
+            ],
+            axis=1,
+        )
         shifted_df = shifted_df.dropna().reset_index(drop=True)
         training_shifted, testing_shifted = self._split_train_test_data(shifted_df)
 
         logger.info("Saving all created modelling data files")
-        Saver.save_csv(training_unshifted, "training_unshifted", "modelling")
-        Saver.save_csv(testing_unshifted, "testing_unshifted", "modelling")
-        Saver.save_csv(training_shifted, "training_shifted", "modelling")
-        Saver.save_csv(testing_shifted, "testing_shifted", "modelling")
+        self.context.publish("training_unshifted", training_unshifted, "modelling")
+        self.context.publish("testing_unshifted", testing_unshifted, "modelling")
+        self.context.publish("training_shifted", training_shifted, "modelling")
+        self.context.publish("testing_shifted", testing_shifted, "modelling")
 
     def _split_train_test_data(self, data):
         logger.debug(
@@ -50,3 +79,29 @@ class PrepareTraining(Module):
             data["DATE"] >= self.settings["model"]["data"]["training_end_date"]
         ]
         return training_df, testing_df
+
+
+def horizon_targets(price: pd.Series, horizons: int) -> np.ndarray:
+    """
+    Price shifted by every horizon from 1 to horizons, a column each, with the
+    sign of SHIFTED_PRICE so the column of horizon model.data.shift equals it.
+    Rows are read from one strided view of the NaN padded price
+    """
+    padded = np.concatenate(
+        [np.full(horizons, np.nan), np.asarray(price, dtype=np.float64)]
+    )
+    # row t of the view holds the prices of rows t - horizons to t
+    return np.lib.stride_tricks.sliding_window_view(padded, horizons + 1)[
+        :, horizons - 1 :: -1
+    ]
+
+
+def horizon_columns(horizons: int) -> List[str]:
+    return [f"{TARGET_PREFIX}_{horizon}" for horizon in range(1, horizons + 1)]
+
+
+def target_columns(data: pd.DataFrame) -> List[str]:
+    """
+    SHIFTED_PRICE and the horizon targets, none of which is a feature
+    """
+    return [column for column in data.columns if column.startswith(TARGET_PREFIX)]
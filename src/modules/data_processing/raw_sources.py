@@ -0,0 +1,160 @@
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import IO, Dict, List, Optional, Tuple, Union
+
+import pandas as pd
+
+from src.modules.data_processing.futures_prices import extract_continuous_prices
+from src.utils.raw_archive import RawArchive
+
+logger = logging.getLogger("al_engine")
+
+
+def raw_source_files(raw_data_settings: Dict, futures_settings: Dict) -> List[str]:
+    """
+    List the files on disk the raw sources are read from, the archive standing
+    in for every member that is not extracted into the raw data folder
+    """
+    file_names = [futures_settings["file"]] + [
+        source["file"]
+        for source in raw_data_settings["sources"].values()
+        if "file" in source
+    ]
+
+    raw_files = []
+    for file_name in file_names:
+        raw_file = f'{raw_data_settings["folder_path"]}/{file_name}'
+        if not os.path.exists(raw_file) and raw_data_settings["archive"] is not None:
+            raw_file = raw_data_settings["archive"]
+        if raw_file not in raw_files:
+            raw_files.append(raw_file)
+
+    scraped_file = scraped_futures_file(raw_data_settings, futures_settings)
+    if scraped_file is not None:
+        raw_files.append(scraped_file)
+    return raw_files
+
+
+def scraped_futures_file(
+    raw_data_settings: Dict, futures_settings: Dict
+) -> Optional[str]:
+    """
+    Give the path of the futures prices scraped since the raw data was packed,
+    None when nothing has been scraped yet
+    """
+    scraped_file = (
+        f'{raw_data_settings["folder_path"]}/{futures_settings["scraped_file"]}'
+    )
+    return scraped_file if os.path.exists(scraped_file) else None
+
+
+def open_raw_file(raw_data_settings: Dict, file_name: str) -> Union[str, IO]:
+    """
+    Give the path of a raw file extracted into the raw data folder, otherwise
+    stream it out of the raw data archive
+    """
+    raw_file = f'{raw_data_settings["folder_path"]}/{file_name}'
+    if os.path.exists(raw_file) or raw_data_settings["archive"] is None:
+        logger.debug(f"Reading [{file_name}] from [{raw_file}]")
+        return raw_file
+
+    logger.debug(f'Reading [{file_name}] from [{raw_data_settings["archive"]}]')
+    return RawArchive(
+        raw_data_settings["archive"], raw_data_settings["archive_password_env_var"]
+    ).open(file_name)
+
+
+def read_raw_source(
+    raw_data_settings: Dict,
+    name: str,
+    source: Dict,
+    since: Optional[pd.Timestamp] = None,
+) -> pd.DataFrame:
+    """
+    Read one raw csv as described by its registry entry, returning a dataframe
+    sorted by DATE with the kept columns renamed. With since only the rows from
+    since on are kept, along with the last one before it that a backward match
+    on since can take
+    """
+    logger.debug(f"Reading in raw source [{name}] from [{source['file']}]...")
+    kept_columns = [source["date_column"]] + list(source["columns"])
+    raw_source = pd.read_csv(
+        open_raw_file(raw_data_settings, source["file"]),
+        usecols=lambda column: column.strip() in kept_columns,
+        **source.get("read_options", {}),
+    )
+    raw_source.columns = raw_source.columns.str.strip()
+
+    raw_source["DATE"] = pd.to_datetime(
+        raw_source[source["date_column"]], format=source["date_format"]
+    )
+    raw_source = raw_source.drop([source["date_column"]], axis=1)
+    raw_source.sort_values(by=["DATE"], inplace=True, ascending=True)
+    if since is not None:
+        first_kept_row = max(raw_source["DATE"].searchsorted(since) - 1, 0)
+        raw_source = raw_source.iloc[first_kept_row:]
+    raw_source.rename(columns=source["columns"], inplace=True)
+
+    for column, characters in source.get("strip_characters", {}).items():
+        logger.debug(f"Stripping {characters} from [{column}] for [{name}]...")
+        for character in characters:
+            raw_source[column] = raw_source[column].str.replace(
+                character, "", regex=False
+            )
+        raw_source[column] = raw_source[column].astype(float)
+
+    return raw_source
+
+
+def load_raw_sources(
+    raw_data_settings: Dict,
+    futures_settings: Dict,
+    since: Optional[pd.Timestamp] = None,
+) -> Tuple[pd.DataFrame, Dict[str, pd.DataFrame]]:
+    """
+    Read the futures dump and every registered raw source concurrently, returning
+    the base metal prices and each source's table in registry order. With since
+    only what aligning the trading days from since on needs is kept
+    """
+    sources = raw_data_settings["sources"]
+    metals = [futures_settings["base_metal"]] + [
+        source["futures_metal"]
+        for source in sources.values()
+        if "futures_metal" in source
+    ]
+
+    logger.info(
+        f"Reading in futures prices and [{len(sources)}] raw sources concurrently..."
+    )
+    with ThreadPoolExecutor(
+        max_workers=raw_data_settings["max_workers"], thread_name_prefix="raw_reader"
+    ) as executor:
+        metal_prices_task = executor.submit(
+            lambda: extract_continuous_prices(
+                open_raw_file(raw_data_settings, futures_settings["file"]),
+                metals,
+                futures_settings,
+                since,
+                scraped_futures_file(raw_data_settings, futures_settings),
+            )
+        )
+        source_tasks = {
+            name: executor.submit(
+                read_raw_source, raw_data_settings, name, source, since
+            )
+            for name, source in sources.items()
+            if "file" in source
+        }
+        metal_prices = metal_prices_task.result()
+
+        raw_tables = {}
+        for name, source in sources.items():
+            if "file" in source:
+                raw_tables[name] = source_tasks[name].result()
+            else:
+                raw_tables[name] = metal_prices[source["futures_metal"]].rename(
+                    columns=source["columns"]
+                )
+
+    return metal_prices[futures_settings["base_metal"]], raw_tables
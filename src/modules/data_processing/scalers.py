@@ -0,0 +1,310 @@
+import glob
+import json
+import logging
+import os
+import re
+from abc import ABC, abstractmethod
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from src.utils.loader import Loader
+from src.utils.saver import Saver
+
+logger = logging.getLogger("al_engine")
+
+
+def _handle_zero_scale(scale: float) -> float:
+    # constant columns keep their values instead of dividing by zero, as sklearn
+    return 1.0 if scale < 10 * np.finfo(np.float64).eps else scale
+
+
+class ColumnScaler(ABC):
+    """
+    Scales one column with parameters that can be saved and loaded back, so
+    new rows are transformed and model outputs mapped back consistently
+    """
+
+    supports_partial_fit = True
+
+    @abstractmethod
+    def fit(self, values: np.ndarray) -> None:
+        pass
+
+    @abstractmethod
+    def partial_fit(self, values: np.ndarray) -> None:
+        pass
+
+    @abstractmethod
+    def transform(self, values: np.ndarray) -> np.ndarray:
+        pass
+
+    @abstractmethod
+    def inverse_transform(self, values: np.ndarray) -> np.ndarray:
+        pass
+
+    @abstractmethod
+    def to_dict(self) -> Dict:
+        pass
+
+
+class MinMaxColumnScaler(ColumnScaler):
+    """
+    Scales onto [0, 1] exactly as sklearn's MinMaxScaler, partial_fit only ever
+    extending the range
+    """
+
+    def __init__(self, data_min: float = np.nan, data_max: float = np.nan) -> None:
+        self.data_min = data_min
+        self.data_max = data_max
+
+    def fit(self, values):
+        self.data_min = float(np.nanmin(values))
+        self.data_max = float(np.nanmax(values))
+
+    def partial_fit(self, values):
+        if len(values) == 0 or np.isnan(values).all():
+            return
+        self.data_min = float(np.fmin(self.data_min, np.nanmin(values)))
+        self.data_max = float(np.fmax(self.data_max, np.nanmax(values)))
+
+    def _scale(self):
+        scale = 1.0 / _handle_zero_scale(self.data_max - self.data_min)
+        return scale, 0.0 - self.data_min * scale
+
+    def transform(self, values):
+        scale, offset = self._scale()
+        return values * scale + offset
+
+    def inverse_transform(self, values):
+        scale, offset = self._scale()
+        return (values - offset) / scale
+
+    def to_dict(self):
+        return {"data_min": self.data_min, "data_max": self.data_max}
+
+
+class StandardColumnScaler(ColumnScaler):
+    """
+    Removes the mean and scales to unit population variance, partial_fit merging
+    the new values' count, mean and sum of squares into the running ones
+    """
+
+    def __init__(
+        self, count: int = 0, mean: float = 0.0, sum_of_squares: float = 0.0
+    ) -> None:
+        self.count = count
+        self.mean = mean
+        self.sum_of_squares = sum_of_squares
+
+    def fit(self, values):
+        self.count, self.mean, self.sum_of_squares = 0, 0.0, 0.0
+        self.partial_fit(values)
+
+    def partial_fit(self, values):
+        values = values[~np.isnan(values)]
+        if len(values) == 0:
+            return
+        count = self.count + len(values)
+        delta = values.mean() - self.mean
+        self.sum_of_squares += (
+            (values - values.mean()) ** 2
+        ).sum() + delta**2 * self.count * len(values) / count
+        self.mean += delta * len(values) / count
+        self.count = count
+
+    def _scale(self):
+        return _handle_zero_scale(np.sqrt(self.sum_of_squares / self.count))
+
+    def transform(self, values):
+        return (values - self.mean) / self._scale()
+
+    def inverse_transform(self, values):
+        return values * self._scale() + self.mean
+
+    def to_dict(self):
+        return {
+            "count": self.count,
+            "mean": self.mean,
+            "sum_of_squares": self.sum_of_squares,
+        }
+
+
+class RobustColumnScaler(ColumnScaler):
+    """
+    Removes the median and scales by the interquartile range. Quantiles can not
+    be updated from the new values alone, so it is always refitted on the whole
+    column.
+    """
+
+    supports_partial_fit = False
+
+    def __init__(
+        self, median: float = np.nan, q25: float = np.nan, q75: float = np.nan
+    ) -> None:
+        self.median = median
+        self.q25 = q25
+        self.q75 = q75
+
+    def fit(self, values):
+        self.q25, self.median, self.q75 = (
+            float(quantile) for quantile in np.nanpercentile(values, [25, 50, 75])
+        )
+
+    def partial_fit(self, values):
+        raise NotImplementedError("Robust scaling needs a refit on the whole column")
+
+    def transform(self, values):
+        return (values - self.median) / _handle_zero_scale(self.q75 - self.q25)
+
+    def inverse_transform(self, values):
+        return values * _handle_zero_scale(self.q75 - self.q25) + self.median
+
+    def to_dict(self):
+        return {"median": self.median, "q25": self.q25, "q75": self.q75}
+
+
+SCALERS = {
+    "minmax": MinMaxColumnScaler,
+    "standard": StandardColumnScaler,
+    "robust": RobustColumnScaler,
+}
+
+
+class TableScaler:
+    """
+    One ColumnScaler per column of a table, saved as a versioned json artifact
+    (scaler_params_v{version}.json, scaler_params.json holding the latest one)
+    along with the last date it has been fitted on. A new version is only saved
+    when the parameters change
+    """
+
+    def __init__(
+        self,
+        scaler_names: Dict[str, str],
+        scalers: Optional[Dict[str, ColumnScaler]] = None,
+        last_date: Optional[pd.Timestamp] = None,
+        version: int = 0,
+    ) -> None:
+        for scaler_name in scaler_names.values():
+            if scaler_name not in SCALERS:
+                raise NotImplementedError(f"Scaler [{scaler_name}] is not supported")
+        self.scaler_names = scaler_names
+        self.scalers = scalers or {
+            column: SCALERS[scaler_name]()
+            for column, scaler_name in scaler_names.items()
+        }
+        self.last_date = last_date
+        self.version = version
+
+    def fit(self, df: pd.DataFrame) -> None:
+        logger.debug(f"Fitting scalers on [{len(df)}] rows...")
+        for column, scaler in self.scalers.items():
+            scaler.fit(df[column].to_numpy(dtype=np.float64))
+        self.last_date = df["DATE"].max()
+
+    def partial_fit(self, new_df: pd.DataFrame, df: pd.DataFrame) -> None:
+        """
+        Update the scalers with the rows in new_df, scalers that can not be
+        updated incrementally being refitted on the whole table df
+        """
+        logger.debug(f"Updating scalers with [{len(new_df)}] new rows...")
+        for column, scaler in self.scalers.items():
+            if scaler.supports_partial_fit:
+                scaler.partial_fit(new_df[column].to_numpy(dtype=np.float64))
+            else:
+                logger.debug(f"Refitting [{self.scaler_names[column]}] on [{column}]")
+                scaler.fit(df[column].to_numpy(dtype=np.float64))
+        self.last_date = max(df["DATE"].max(), self.last_date)
+
+    def transform(self, df: pd.DataFrame) -> pd.DataFrame:
+        return pd.DataFrame(
+            {
+                column: self.scalers[column].transform(
+                    df[column].to_numpy(dtype=np.float64)
+                )
+                for column in df.columns
+            },
+            index=df.index,
+        )
+
+    def inverse_transform(self, df: pd.DataFrame) -> pd.DataFrame:
+        return pd.DataFrame(
+            {
+                column: self.scalers[column].inverse_transform(
+                    df[column].to_numpy(dtype=np.float64)
+                )
+                for column in df.columns
+                if column in self.scalers
+            },
+            index=df.index,
+        )
+
+    def inverse_transform_column(self, column: str, values) -> np.ndarray:
+        """
+        Map scaled values of one column, e.g. model predictions of AL_PRICE, back
+        to its original units
+        """
+        return self.scalers[column].inverse_transform(
+            np.asarray(values, dtype=np.float64)
+        )
+
+    def save(self, keep_versions: int) -> None:
+        """
+        Save the parameters as a new version when they differ from the latest
+        saved ones, deleting all but the keep_versions latest versions
+        """
+        params = {
+            "last_date": None if self.last_date is None else str(self.last_date),
+            "columns": {
+                column: {"scaler": self.scaler_names[column], **scaler.to_dict()}
+                for column, scaler in self.scalers.items()
+            },
+        }
+        try:
+            latest_params = Loader.load_json("scaler_params", "processed")
+        except FileNotFoundError:
+            latest_params = None
+        if latest_params is not None and json.dumps(
+            {key: latest_params[key] for key in params}, sort_keys=True
+        ) == json.dumps(params, sort_keys=True):
+            self.version = latest_params["version"]
+            logger.info(
+                f"Scaler parameters unchanged, keeping version [{self.version}]"
+            )
+            return
+
+        self.version += 1
+        params = {"version": self.version, **params}
+        logger.info(f"Saving scaler parameters version [{self.version}]...")
+        Saver.save_json(params, f"scaler_params_v{self.version}", "processed")
+        Saver.save_json(params, "scaler_params", "processed")
+
+        for file_path in glob.glob("data/processed/scaler_params_v*.json"):
+            version = int(re.search(r"_v(\d+)\.json$", file_path).group(1))
+            if version <= self.version - keep_versions:
+                logger.debug(f"Deleting scaler parameters version [{version}]")
+                os.remove(file_path)
+
+    @staticmethod
+    def load(version: Optional[int] = None) -> "TableScaler":
+        """
+        Load the scaler parameters of a given version, the latest by default
+        """
+        params = Loader.load_json(
+            "scaler_params" if version is None else f"scaler_params_v{version}",
+            "processed",
+        )
+        scaler_names = {}
+        scalers = {}
+        for column, column_params in params["columns"].items():
+            column_params = dict(column_params)
+            scaler_names[column] = column_params.pop("scaler")
+            scalers[column] = SCALERS[scaler_names[column]](**column_params)
+        return TableScaler(
+            scaler_names,
+            scalers,
+            None if params["last_date"] is None else pd.Timestamp(params["last_date"]),
+            params["version"],
+        )
@@ -2,10 +2,10 @@ import logging
 import os
 
 import pandas as pd
-from sklearn.preprocessing import MinMaxScaler
 
 from src.modules.base import Module
-from src.utils.saver import Saver
+from src.modules.data_processing.scalers import TableScaler
+from src.utils.loader import Loader
 
 logger = logging.getLogger("al_engine")
 
@@ -15,21 +15,52 @@ class Scaling(Module):
         module_name = os.path.basename(__file__).replace(".py", "")
         super().__init__(module_name)
 
+        self.input_files = [Loader.artifact_path("cleaned_data", "processed")]
+        self.config_keys = ["preprocess.scaling"]
+        self.output_files = [
+            Loader.artifact_path("scaled_cleaned_data", "processed"),
+            "data/processed/scaler_params.json",
+        ]
+
     def run(self):
         logger.info("Reading in cleaned dataframe")
-        clean_df = pd.read_csv("data/processed/cleaned_data.csv")
-
-        logger.info("Starting min-max scaling process")
-        scaler = MinMaxScaler()
-
-        logger.debug(
-            "Fit and transform the explainary variables dataframe with the scaler"
-        )
-        copy_clean_df = clean_df.copy()
-        copy_clean_df = copy_clean_df.set_index("DATE")
-        scaled_df = pd.DataFrame(
-            scaler.fit_transform(copy_clean_df), columns=copy_clean_df.columns
-        )
-        scaled_df["DATE"] = clean_df["DATE"]
-
-        Saver.save_csv(scaled_df, "scaled_cleaned_data", "processed")
+        clean_df = self.context.consume("cleaned_data", "processed")
+
+        logger.info("Starting scaling process")
+        scaling_settings = self.settings["preprocess"]["scaling"]
+        features = clean_df.drop(columns=["DATE"])
+        scaler_names = {
+            column: scaling_settings["columns"].get(column, scaling_settings["default"])
+            for column in features.columns
+        }
+
+        try:
+            previous_scaler = TableScaler.load()
+        except FileNotFoundError:
+            previous_scaler = None
+
+        if (
+            scaling_settings["fit"] == "partial"
+            and previous_scaler is not None
+            and previous_scaler.scaler_names == scaler_names
+        ):
+            logger.debug(
+                f"Extending scaler fitted up to [{previous_scaler.last_date}] with the new rows"  # noqa
+            )
+            scaler = previous_scaler
+            scaler.partial_fit(clean_df[clean_df["DATE"] > scaler.last_date], clean_df)
+        else:
+            logger.debug("Fit the explainary variables dataframe with the scalers")
+            scaler = TableScaler(
+                scaler_names,
+                version=0 if previous_scaler is None else previous_scaler.version,
+            )
+            scaler.fit(clean_df)
+        scaler.save(scaling_settings["keep_versions"])
+
+        logger.debug("Transform the explainary variables dataframe with the scalers")
+        scaled_df = scaler.transform(features).reset_index(drop=True)
+        # by position, cleaned_data may not come with a 0-based index
+        scaled_df["DATE"] = clean_df["DATE"].to_numpy()
+
+        self.context.publish("scaled_cleaned_data", scaled_df, "processed")
@@ -1,61 +1,87 @@
 import logging
 import os
 
-import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
-from sklearn.linear_model import Lasso, LassoCV, LinearRegression, Ridge, RidgeCV
-from sklearn.model_selection import KFold
+from sklearn.base import clone
+from sklearn.linear_model import Lasso, LinearRegression, Ridge
 
 from src.modules.base import Module
-from src.utils.model_measurement import calculate_performance_metrics
+from src.modules.data_processing.prepare_training import (
+    TARGET_PREFIX,
+    horizon_columns,
+    target_columns,
+)
+from src.modules.model.regularization_path import lasso_cv_alpha, ridge_cv_alpha
+from src.utils.loader import Loader
+from src.utils.model_measurement import (
+    calculate_horizon_metrics,
+    calculate_performance_metrics,
+)
+from src.utils.model_registry import ModelRegistry
+from src.utils.plotter import render_lines
 from src.utils.saver import Saver
 
 logger = logging.getLogger("al_engine")
 
+# alphas searched by lasso and ridge cross validation, part of their registry key
+ALPHA_SEARCH = {"log10_alphas": [-5, 2, 100], "folds": 20}
+
 
 class LinearModel(Module):
     def __init__(self) -> None:
         module_name = os.path.basename(__file__).replace(".py", "")
         super().__init__(module_name)
 
+        self.input_files = [
+            Loader.artifact_path("training_shifted", "modelling"),
+            Loader.artifact_path("testing_shifted", "modelling"),
+        ]
+        self.output_files = [
+            f"data/modelling/{model_name}_regression_{result_name}.csv"
+            for model_name in ["linear", "lasso", "ridge"]
+            for result_name in [
+                "train_results",
+                "test_results",
+                "horizon_predictions",
+                "horizon_test_results",
+            ]
+        ] + ["data/modelling/ridge_regression_coefficients.csv"]
+
     def run(self):
+        logger.info("Get training and testing data")
+        X_train, y_train, X_test, y_test, Y_train, Y_test = self._get_data()
+        data = (X_train, y_train, X_test, y_test)
+
         logger.debug("Starting Linear Regression Model Building...")
-        self._linear_regression()
+        linear = self._linear_regression(*data)
         logger.debug("Linear regression model finished successfully")
 
         logger.debug("Starting Lasso Regression Model Building...")
-        self._lasso_regression()
+        lasso = self._lasso_regression(*data)
         logger.debug("Lasso regression model finished successfully")
 
         logger.debug("Starting Ridge Regression Model Building...")
-        self._ridge_regression()
+        ridge = self._ridge_regression(*data)
         logger.debug("Ridge regression model finished successfully")
 
-    def _ridge_regression(self):
-        logger.info("Get training and testing data")
-        X_train, y_train, X_test, y_test = self._get_data()
-
-        logger.info("Finding the best alpha values via grid search")
-        alphas_ridge = 10 ** np.linspace(-5, 2, 100)
-
-        logger.debug(f"Define the range of alpha values to test is {alphas_ridge}")
-        logger.info("Splitting the data into 20 folds for validation and grid search")
-        tscv_ridge = KFold(n_splits=20)
-
-        logger.info("Fit the ridge CV")
-        ridge_cv = RidgeCV(alphas=alphas_ridge, cv=tscv_ridge)
-        ridge_cv.fit(X_train, y_train)
-
-        best_alpha_ridge = ridge_cv.alpha_
-        logger.debug(
-            f"The best alpha values for ridge found via cross validation is: [{best_alpha_ridge}]"
+        for model_name, model in [
+            ("linear", linear),
+            ("lasso", lasso),
+            ("ridge", ridge),
+        ]:
+            logger.debug(
+                f"Fitting the [{model_name}] regression on [{Y_train.shape[1]}] horizons..."
+            )
+            self._horizon_regression(
+                model_name, model, X_train, Y_train, X_test, Y_test
+            )
+
+    def _ridge_regression(self, X_train, y_train, X_test, y_test):
+        ridge = self._registered_fit(
+            "ridge", self._fit_ridge, X_train, y_train, ALPHA_SEARCH
         )
 
-        logger.info("Re-fit the model with the best alpha value")
-        ridge = Ridge(alpha=best_alpha_ridge)
-        ridge.fit(X_train, y_train)
-
         pred_ridge = ridge.predict(X_test)
         pred_ridge_train = ridge.predict(X_train)
 
@@ -79,19 +105,31 @@ class LinearModel(Module):
         Saver.save_csv(train_results, "ridge_regression_train_results", "modelling")
 
         logger.info("Plotting prediction and results")
-        plt.plot(np.arange(len(pred_ridge)), pred_ridge, label="Prediction")
-        plt.plot(np.arange(len(y_test)), y_test, label="actual")
-        plt.legend()
-        plt.title("Ridge Regression Out-of-Sample Forecast")
-        Saver.save_plots("ridge_regression_prediction_out_of_sample")
-        plt.clf()
-
-        plt.plot(np.arange(len(pred_ridge_train)), pred_ridge_train, label="Prediction")
-        plt.plot(np.arange(len(y_train)), y_train, label="actual")
-        plt.legend()
-        plt.title("Ridge Regression In-Sample Prediction")
-        Saver.save_plots("ridge_regression_prediction_in_sample")
-        plt.clf()
+        self.context.plotter.request(
+            render_lines,
+            "ridge_regression_prediction_out_of_sample.png",
+            lines=[
+                (np.arange(len(pred_ridge)), np.asarray(pred_ridge), "Prediction"),
+                (np.arange(len(y_test)), np.asarray(y_test), "actual"),
+            ],
+            title="Ridge Regression Out-of-Sample Forecast",
+            legend=True,
+        )
+
+        self.context.plotter.request(
+            render_lines,
+            "ridge_regression_prediction_in_sample.png",
+            lines=[
+                (
+                    np.arange(len(pred_ridge_train)),
+                    np.asarray(pred_ridge_train),
+                    "Prediction",
+                ),
+                (np.arange(len(y_train)), np.asarray(y_train), "actual"),
+            ],
+            title="Ridge Regression In-Sample Prediction",
+            legend=True,
+        )
 
         logger.info("Getting the coefficient from ridge regressions")
         ridge_coefficients = ridge.coef_
@@ -110,30 +148,36 @@ class LinearModel(Module):
         importance_list_ridge.sort(reverse=True)
         for importance, feature in importance_list_ridge:
             logger.debug(f"Coefficient for {feature} is [{round(importance,5)}]")
+        return ridge
 
-    def _lasso_regression(self):
-        logger.info("Get training and testing data")
-        X_train, y_train, X_test, y_test = self._get_data()
-
+    def _fit_ridge(self, X_train, y_train):
         logger.info("Finding the best alpha values via grid search")
+        alphas_ridge = 10 ** np.linspace(*ALPHA_SEARCH["log10_alphas"])
 
-        alphas = 10 ** np.linspace(-5, 2, 100)
-        logger.debug(f"Define the range of alpha values to test is {alphas}")
-        logger.info("Splitting the data into 20 folds for validation and grid search")
-        tscv = KFold(n_splits=20)
-
-        logger.info("Fit the lassco CV")
-        lasso_cv = LassoCV(alphas=alphas, cv=tscv)
-        lasso_cv.fit(X_train, y_train)
-
-        best_alpha = lasso_cv.alpha_
+        logger.debug(f"Define the range of alpha values to test is {alphas_ridge}")
+        logger.info(
+            "Scoring every alpha on 20 folds from one SVD of each fold's training data"
+        )
+        best_alpha_ridge, _ = ridge_cv_alpha(
+            X_train.to_numpy(),
+            y_train.to_numpy(),
+            alphas_ridge,
+            ALPHA_SEARCH["folds"],
+            self.settings["model"]["linear_model"]["n_jobs"],
+        )
         logger.debug(
-            f"The best alpha values for lasso found via cross validation is: [{best_alpha}]"
+            f"The best alpha values for ridge found via cross validation is: [{best_alpha_ridge}]"
         )
 
         logger.info("Re-fit the model with the best alpha value")
-        lasso = Lasso(alpha=best_alpha)
-        lasso.fit(X_train, y_train)
+        ridge = Ridge(alpha=best_alpha_ridge)
+        ridge.fit(X_train, y_train)
+        return ridge
+
+    def _lasso_regression(self, X_train, y_train, X_test, y_test):
+        lasso = self._registered_fit(
+            "lasso", self._fit_lasso, X_train, y_train, ALPHA_SEARCH
+        )
 
         pred_lasso = lasso.predict(X_test)
         pred_lasso_train = lasso.predict(X_train)
@@ -158,27 +202,57 @@ class LinearModel(Module):
         Saver.save_csv(train_results, "lasso_regression_train_results", "modelling")
 
         logger.info("Plotting prediction and results")
-        plt.plot(np.arange(len(pred_lasso)), pred_lasso, label="Prediction")
-        plt.plot(np.arange(len(y_test)), y_test, label="actual")
-        plt.legend()
-        plt.title("Lasso Regression Out-of-Sample Forecast")
-        Saver.save_plots("lasso_regression_prediction_out_of_sample")
-        plt.clf()
-
-        plt.plot(np.arange(len(pred_lasso_train)), pred_lasso_train, label="Prediction")
-        plt.plot(np.arange(len(y_train)), y_train, label="actual")
-        plt.legend()
-        plt.title("Lasso Regression In-Sample Prediction")
-        Saver.save_plots("lasso_regression_prediction_in_sample")
-        plt.clf()
-
-    def _linear_regression(self):
-        logger.info("Get training and testing data")
-        X_train, y_train, X_test, y_test = self._get_data()
+        self.context.plotter.request(
+            render_lines,
+            "lasso_regression_prediction_out_of_sample.png",
+            lines=[
+                (np.arange(len(pred_lasso)), np.asarray(pred_lasso), "Prediction"),
+                (np.arange(len(y_test)), np.asarray(y_test), "actual"),
+            ],
+            title="Lasso Regression Out-of-Sample Forecast",
+            legend=True,
+        )
 
-        logger.info("Fitting the linear regression model")
-        linear = LinearRegression()
-        linear.fit(X_train, y_train)
+        self.context.plotter.request(
+            render_lines,
+            "lasso_regression_prediction_in_sample.png",
+            lines=[
+                (
+                    np.arange(len(pred_lasso_train)),
+                    np.asarray(pred_lasso_train),
+                    "Prediction",
+                ),
+                (np.arange(len(y_train)), np.asarray(y_train), "actual"),
+            ],
+            title="Lasso Regression In-Sample Prediction",
+            legend=True,
+        )
+        return lasso
+
+    def _fit_lasso(self, X_train, y_train):
+        logger.info("Finding the best alpha values via grid search")
+
+        alphas = 10 ** np.linspace(*ALPHA_SEARCH["log10_alphas"])
+        logger.debug(f"Define the range of alpha values to test is {alphas}")
+        logger.info("Running the lasso path on 20 folds from each fold's Gram matrix")
+        best_alpha, _ = lasso_cv_alpha(
+            X_train.to_numpy(),
+            y_train.to_numpy(),
+            alphas,
+            ALPHA_SEARCH["folds"],
+            self.settings["model"]["linear_model"]["n_jobs"],
+        )
+        logger.debug(
+            f"The best alpha values for lasso found via cross validation is: [{best_alpha}]"
+        )
+
+        logger.info("Re-fit the model with the best alpha value")
+        lasso = Lasso(alpha=best_alpha)
+        lasso.fit(X_train, y_train)
+        return lasso
+
+    def _linear_regression(self, X_train, y_train, X_test, y_test):
+        linear = self._registered_fit("linear", self._fit_linear, X_train, y_train, {})
 
         logger.info("Giving predictions from a linear model")
         pred_linear_test = linear.predict(X_test)
@@ -211,30 +285,126 @@ class LinearModel(Module):
         logger.info(f"Out-of-Sample Error: [{linear_test_performance}]")
 
         logger.info("Plotting prediction and results")
-        plt.plot(np.arange(len(pred_linear_test)), pred_linear_test, label="Prediction")
-        plt.plot(np.arange(len(y_test)), y_test, label="actual")
-        plt.legend()
-        plt.title("Linear Regression Out-of-Sample Forecast")
-        Saver.save_plots("linear_regression_prediction_out_of_sample")
-        plt.clf()
-
-        plt.plot(
-            np.arange(len(pred_linear_train)), pred_linear_train, label="Prediction"
-        )
-        plt.plot(np.arange(len(y_train)), y_train, label="actual")
-        plt.legend()
-        plt.title("Linear Regression In-Sample Prediction")
-        Saver.save_plots("linear_regression_prediction_in_sample")
-        plt.clf()
+        self.context.plotter.request(
+            render_lines,
+            "linear_regression_prediction_out_of_sample.png",
+            lines=[
+                (
+                    np.arange(len(pred_linear_test)),
+                    np.asarray(pred_linear_test),
+                    "Prediction",
+                ),
+                (np.arange(len(y_test)), np.asarray(y_test), "actual"),
+            ],
+            title="Linear Regression Out-of-Sample Forecast",
+            legend=True,
+        )
+
+        self.context.plotter.request(
+            render_lines,
+            "linear_regression_prediction_in_sample.png",
+            lines=[
+                (
+                    np.arange(len(pred_linear_train)),
+                    np.asarray(pred_linear_train),
+                    "Prediction",
+                ),
+                (np.arange(len(y_train)), np.asarray(y_train), "actual"),
+            ],
+            title="Linear Regression In-Sample Prediction",
+            legend=True,
+        )
+        return linear
+
+    def _fit_linear(self, X_train, y_train):
+        logger.info("Fitting the linear regression model")
+        linear = LinearRegression()
+        linear.fit(X_train, y_train)
+        return linear
+
+    def _horizon_regression(self, model_name, model, X_train, Y_train, X_test, Y_test):
+        """
+        One multi-output fit of model's estimator, alpha included, on the target
+        of every horizon
+        """
+        horizon_model = self._registered_fit(
+            f"{model_name}_horizons",
+            lambda X, Y: clone(model).fit(X, Y),
+            X_train,
+            Y_train,
+            {"params": model.get_params()},
+        )
+
+        logger.info("Giving predictions for every horizon")
+        pred_horizons_test = horizon_model.predict(X_test)
+        predictions_df = pd.DataFrame(
+            pred_horizons_test,
+            columns=[
+                column.replace(TARGET_PREFIX, "prediction_value")
+                for column in Y_test.columns
+            ],
+            index=X_test.index,
+        ).reset_index()
+        Saver.save_csv(
+            predictions_df, f"{model_name}_regression_horizon_predictions", "modelling"
+        )
+
+        logger.info("Calculating performances metrics of every horizon")
+        test_results = calculate_horizon_metrics(Y_test, pred_horizons_test)
+        Saver.save_csv(
+            test_results, f"{model_name}_regression_horizon_test_results", "modelling"
+        )
+
+        rmse = test_results[test_results["item"] == "RMSE"]
+        self.context.plotter.request(
+            render_lines,
+            f"{model_name}_regression_horizon_rmse.png",
+            lines=[(rmse["horizon"].to_numpy(), rmse["value"].to_numpy(), "RMSE")],
+            title=f"{model_name.capitalize()} Regression Out-of-Sample RMSE By Horizon",
+            legend=True,
+        )
+
+    def _registered_fit(self, architecture, fit, X_train, y_train, config):
+        """
+        The model the registry holds for this training data and config, fitted
+        with fit and registered when there is none
+        """
+        registry_entry = {
+            "family": "linear",
+            "architecture": architecture,
+            "window_end": X_train.index.max(),
+            "features": list(X_train.columns),
+            "config": config,
+            "training_data": (X_train.to_numpy(), y_train.to_numpy()),
+        }
+        registry = (
+            ModelRegistry(self.settings["model"]["registry"]["folder_path"])
+            if self.settings["model"]["registry"]["enabled"]
+            else None
+        )
+        model = None if registry is None else registry.load(**registry_entry)
+        if model is not None:
+            logger.info(f"Reusing the registered [{architecture}] regression model")
+            return model
+
+        model = fit(X_train, y_train)
+        if registry is not None:
+            registry.save(model, **registry_entry)
+        return model
 
     def _get_data(self):
         logger.info("Reading in training datasets from shifted data")
-        training_df_shifted = pd.read_csv("data/modelling/training_shifted.csv")
-        testing_df_shifted = pd.read_csv("data/modelling/testing_shifted.csv")
+        training_df_shifted = self.context.consume("training_shifted", "modelling")
+        testing_df_shifted = self.context.consume("testing_shifted", "modelling")
 
         logger.info("Creating predictors and target variables dataset")
-        X_train = training_df_shifted.drop(["SHIFTED_PRICE"], axis=1).set_index("DATE")
+        targets = target_columns(training_df_shifted)
+        X_train = training_df_shifted.drop(targets, axis=1).set_index("DATE")
         y_train = training_df_shifted["SHIFTED_PRICE"]
-        X_test = testing_df_shifted.drop(["SHIFTED_PRICE"], axis=1).set_index("DATE")
+        X_test = testing_df_shifted.drop(targets, axis=1).set_index("DATE")
         y_test = testing_df_shifted["SHIFTED_PRICE"]
-        return X_train, y_train, X_test, y_test
+
+        horizons = horizon_columns(self.settings["model"]["data"]["horizons"])
+        Y_train = training_df_shifted[horizons]
+        Y_test = testing_df_shifted[horizons]
+        return X_train, y_train, X_test, y_test, Y_train, Y_test
@@ -0,0 +1,172 @@
+import logging
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.modules.base import Module
+from src.modules.data_processing.prepare_training import target_columns
+from src.modules.model.recursive_least_squares import RecursiveLeastSquares
+from src.utils.loader import Loader
+from src.utils.model_measurement import calculate_performance_metrics
+from src.utils.plotter import render_lines
+from src.utils.saver import Saver
+from src.utils.trading_calendar import TradingCalendar
+
+logger = logging.getLogger("al_engine")
+
+
+class LinearWalkForward(Module):
+    """
+    Expanding window backtest of the linear and ridge regressions on the shifted
+    data, with the cut offs of the LSTM walk-forward so the two compare window
+    by window. The regressions are fitted once on the rows before the first cut
+    off and every window's rows are then added by a recursive least squares
+    update rather than a refit
+    """
+
+    def __init__(self) -> None:
+        module_name = os.path.basename(__file__).replace(".py", "")
+        super().__init__(module_name)
+
+        self.input_files = [
+            Loader.artifact_path("scaled_cleaned_data", "processed"),
+            Loader.artifact_path("training_shifted", "modelling"),
+            Loader.artifact_path("testing_shifted", "modelling"),
+        ]
+        self.config_keys = [
+            "model.linear_walk_forward",
+            "model.network_model.start_cut_off_trading_day",
+            "model.network_model.end_cut_off_trading_day",
+            "model.network_model.prediction_num_days",
+            "trading_calendar.holidays",
+        ]
+        self.output_files = [
+            f"data/modelling/{model_name}_regression_walk_forward_{result_name}.csv"
+            for model_name in ["linear", "ridge"]
+            for result_name in ["predictions", "results"]
+        ]
+
+    def run(self):
+        logger.info("Reading in the shifted data and the trading days of the LSTM")
+        clean_scaled_data = self.context.consume("scaled_cleaned_data", "processed")
+        shifted_df = pd.concat(
+            [
+                self.context.consume("training_shifted", "modelling"),
+                self.context.consume("testing_shifted", "modelling"),
+            ],
+            ignore_index=True,
+        )
+        X = shifted_df.drop(["DATE"] + target_columns(shifted_df), axis=1).to_numpy()
+        y = shifted_df["SHIFTED_PRICE"].to_numpy()
+
+        cut_offs = self._get_cut_offs(clean_scaled_data, shifted_df)
+        walk_forward_settings = self.settings["model"]["linear_walk_forward"]
+        for model_name, ridge_alpha in [
+            ("linear", 0.0),
+            ("ridge", walk_forward_settings["ridge_alpha"]),
+        ]:
+            logger.debug(f"Walking forward the [{model_name}] regression...")
+            model = RecursiveLeastSquares(
+                ridge_alpha, walk_forward_settings["forgetting_factor"]
+            )
+            predictions, rows = self._walk_forward(model, X, y, cut_offs)
+            self._save_results(
+                model_name, shifted_df["DATE"].iloc[rows], predictions, y[rows]
+            )
+            logger.debug(
+                f"{model_name.capitalize()} walk-forward finished successfully"
+            )
+
+    def _get_cut_offs(self, clean_scaled_data, shifted_df):
+        """
+        Rows of the shifted data at the LSTM cut offs, which count trading days
+        of the unshifted data
+        """
+        network_settings = self.settings["model"]["network_model"]
+        calendar = TradingCalendar(
+            clean_scaled_data["DATE"], self.settings["trading_calendar"]["holidays"]
+        )
+        cut_off_dates = calendar.date(
+            range(
+                calendar.ordinal_of(network_settings["start_cut_off_trading_day"]),
+                calendar.ordinal_of(network_settings["end_cut_off_trading_day"]),
+                network_settings["prediction_num_days"],
+            )
+        )
+        cut_offs = TradingCalendar(shifted_df["DATE"]).ordinal(cut_off_dates)
+        if cut_offs[0] == 0:
+            raise ValueError(
+                f"No shifted rows to fit on before the first cut off [{cut_off_dates[0]}]"
+            )
+        logger.debug(f"Cut offs run from [{cut_off_dates[0]}] to [{cut_off_dates[-1]}]")
+        return cut_offs
+
+    def _walk_forward(self, model, X, y, cut_offs):
+        """
+        Predict the prediction_num_days rows after every cut off with the model
+        of all rows before it, as a refit on them would, returning the
+        predictions along with the rows they are for
+        """
+        start_time = time.perf_counter()
+        prediction_num_days = self.settings["model"]["network_model"][
+            "prediction_num_days"
+        ]
+        model.fit(X[: cut_offs[0]], y[: cut_offs[0]])
+        predictions = []
+        rows = []
+        for num_interval, cut_off in enumerate(cut_offs):
+            logger.debug(
+                f"For number of interval = [{num_interval}], the cut off row is [{cut_off}]"
+            )
+            if num_interval > 0:
+                # rows between the previous cut off and this one join training
+                model.update(
+                    X[cut_offs[num_interval - 1] : cut_off],
+                    y[cut_offs[num_interval - 1] : cut_off],
+                )
+            window_rows = np.arange(cut_off, min(cut_off + prediction_num_days, len(X)))
+            predictions.append(model.predict(X[window_rows]))
+            rows.append(window_rows)
+        logger.info(
+            f"Walked [{len(cut_offs)}] windows forward in [{time.perf_counter() - start_time:.3f}] seconds"  # noqa
+        )
+        return np.concatenate(predictions), np.concatenate(rows)
+
+    def _save_results(self, model_name, dates, predictions, actual):
+        logger.info("Calculate performance metrics and Putting results into dataframe")
+        performance = calculate_performance_metrics(actual, predictions)
+        results = pd.DataFrame.from_dict(performance, orient="index").reset_index()
+        results.columns = ["item", "value"]
+        logger.info(
+            f"{model_name.capitalize()} Regression walk-forward error: [{performance}]"
+        )
+
+        predictions_df = pd.DataFrame(
+            {
+                "DATE": np.asarray(dates),
+                "prediction_value": predictions,
+                "actual": actual,
+            }
+        )
+        Saver.save_csv(
+            predictions_df,
+            f"{model_name}_regression_walk_forward_predictions",
+            "modelling",
+        )
+        Saver.save_csv(
+            results, f"{model_name}_regression_walk_forward_results", "modelling"
+        )
+
+        logger.info("Plotting prediction and results")
+        self.context.plotter.request(
+            render_lines,
+            f"{model_name}_regression_walk_forward_prediction.png",
+            lines=[
+                (np.arange(len(predictions)), predictions, "Prediction"),
+                (np.arange(len(actual)), actual, "actual"),
+            ],
+            title=f"{model_name.capitalize()} Regression Walk-Forward Forecast",
+            legend=True,
+        )
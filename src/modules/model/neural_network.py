@@ -1,138 +1,547 @@
 import logging
+import multiprocessing
 import os
+import time
+from concurrent.futures import ProcessPoolExecutor
 
-import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
 import tensorflow as tf
-from keras.layers import LSTM, Dense
-from keras.models import Sequential
+from keras.layers import LSTM, Dense, Input
+from keras.models import Model, Sequential
 
 from src.modules.base import Module
-from src.utils.model_measurement import calculate_performance_metrics
+from src.modules.data_processing.scalers import TableScaler
+from src.modules.model.sequence_windows import SequenceWindows
+from src.modules.model.training_policy import TrainingPolicy
+from src.utils.loader import Loader
+from src.utils.model_measurement import (
+    calculate_horizon_metrics,
+    calculate_performance_metrics,
+)
+from src.utils.model_registry import ModelRegistry
+from src.utils.plotter import render_lines
 from src.utils.saver import Saver
+from src.utils.trading_calendar import TradingCalendar
 
 logger = logging.getLogger("al_engine")
 
+# whether each mode's walk-forwards are warm started
+WALK_FORWARD_MODES = {
+    "scratch": [False],
+    "warm_start": [True],
+    "compare": [False, True],
+}
+
 
 class NeuralNetworkModel(Module):
     def __init__(self) -> None:
         module_name = os.path.basename(__file__).replace(".py", "")
         super().__init__(module_name)
 
+        self.input_files = [
+            Loader.artifact_path("scaled_cleaned_data", "processed"),
+            "data/processed/scaler_params.json",
+        ]
+        self.config_keys = [
+            "model.network_model",
+            "model.data.horizons",
+            "trading_calendar.holidays",
+        ]
+        result_names = ["predictions_results", "test_results"]
+        if self.settings["model"]["network_model"]["walk_forward"] == "compare":
+            result_names += [
+                "warm_start_predictions_results",
+                "warm_start_test_results",
+                "walk_forward_comparison",
+            ]
+        self.output_files = [
+            f"data/modelling/lstm_type_{model_type}_{result_name}.csv"
+            for model_type in [1, 2, 3]
+            for result_name in result_names
+        ]
+
     def run(self):
         logger.info("Reading in training datasets from unshifted data")
-        clean_scaled_data = pd.read_csv("data/processed/scaled_cleaned_data.csv")
+        clean_scaled_data = self.context.consume("scaled_cleaned_data", "processed")
+
+        logger.info("Loading the scaler to map predictions back to prices")
+        scaler = TableScaler.load()
+
+        logger.info("Resolving the walk-forward cut offs on the trading calendar")
+        network_settings = self.settings["model"]["network_model"]
+        calendar = TradingCalendar(
+            clean_scaled_data["DATE"], self.settings["trading_calendar"]["holidays"]
+        )
+        cut_off_trading_days = range(
+            calendar.ordinal_of(network_settings["start_cut_off_trading_day"]),
+            calendar.ordinal_of(network_settings["end_cut_off_trading_day"]),
+            network_settings["prediction_num_days"],
+        )
+        logger.debug(
+            f"Cut offs run from [{calendar.date(cut_off_trading_days[0])}] to [{calendar.date(cut_off_trading_days[-1])}]"  # noqa
+        )
+
+        walk_forward = network_settings["walk_forward"]
+        if walk_forward not in WALK_FORWARD_MODES:
+            raise NotImplementedError(
+                f"Walk-forward mode [{walk_forward}] is not supported"
+            )
 
         logger.debug("Running the LSTM model for difference structure")
-        for model_type in [1, 2, 3]:
-            lstm_y_pred_test_list = []
-            y_test_list = []
-            for num_interval, incremental_trading_day in enumerate(
-                np.arange(
-                    0,
-                    631,
-                    self.settings["model"]["network_model"]["prediction_num_days"],
+        batch_architectures = network_settings["batch_architectures"]
+        if batch_architectures and network_settings["training"]["validation_fraction"]:
+            # batched heads share one optimizer and are stopped on their summed
+            # validation loss, so none of them would be trained as it is alone
+            logger.warning(
+                "Architectures are trained apart, batching them needs a training.validation_fraction of 0"  # noqa
+            )
+            batch_architectures = False
+        # batched, the architectures train side by side in one model per job
+        model_type_groups = [(1, 2, 3)] if batch_architectures else [(1,), (2,), (3,)]
+        jobs = []
+        for model_types in model_type_groups:
+            for warm_start in WALK_FORWARD_MODES[walk_forward]:
+                # from scratch windows are independent, warm started ones chain
+                chunks = (
+                    [list(cut_off_trading_days)]
+                    if warm_start
+                    else [[cut_off] for cut_off in cut_off_trading_days]
                 )
-            ):
-                logger.info("Get the cut of trading day")
-                cut_off_trading_day = (
-                    self.settings["model"]["network_model"]["start_cut_off_trading_day"]
-                    + incremental_trading_day
+                jobs += [(model_types, chunk, warm_start) for chunk in chunks]
+        logger.info(
+            f"Building [{network_settings['lookback']}] day look-back sequences once for every window"  # noqa
+        )
+        windows = SequenceWindows(
+            clean_scaled_data,
+            "AL_PRICE",
+            network_settings["lookback"],
+            self.settings["model"]["data"]["horizons"]
+            if network_settings["multi_horizon"]
+            else 0,
+        )
+        job_results = self._run_jobs(jobs, windows)
+
+        for model_type in [1, 2, 3]:
+            results = {}
+            for warm_start in WALK_FORWARD_MODES[walk_forward]:
+                # with the prediction column of the model type in each job
+                parts = [
+                    (job_result, job[0].index(model_type))
+                    for job, job_result in zip(jobs, job_results)
+                    if model_type in job[0] and job[2] == warm_start
+                ]
+                logger.info(
+                    "Concatenate all lists to generate final predicted time series"
                 )
-                logger.debug(
-                    f"For number of interval = [{num_interval}], the trading day cut off is [{cut_off_trading_day}]"
+                results[warm_start] = (
+                    np.concatenate([part[0][:, column] for part, column in parts]),
+                    np.concatenate([part[1] for part, _ in parts]),
+                    sum(part[2] for part, _ in parts),
+                    [window_epochs for part, _ in parts for window_epochs in part[3]],
                 )
+                self._log_epochs(model_type, warm_start, *results[warm_start][2:])
 
-                logger.debug("Getting the training and testing data")
-                X_train, y_train, X_test, y_test = self._get_data(
-                    cut_off_trading_day,
-                    self.settings["model"]["network_model"]["prediction_num_days"],
-                    clean_scaled_data,
+            for warm_start, (lstm_y_pred_test, y_test_all, _, _) in results.items():
+                self._save_results(
+                    model_type,
+                    lstm_y_pred_test,
+                    y_test_all,
+                    scaler,
+                    # in compare mode the from scratch results keep their names
+                    "warm_start_" if walk_forward == "compare" and warm_start else "",
                 )
-                logger.info(f"Use LSTM model type {model_type} for al price prediction")
-                results_in_time_interval, y_test_in_interval = self._run_lstm_model(
-                    model_type, X_train, y_train, X_test, y_test
+
+            if walk_forward == "compare":
+                self._save_comparison(model_type, results)
+
+    def _run_jobs(self, jobs, windows):
+        """
+        Run the (model_types, cut offs, warm_start) walk-forward jobs, in this
+        process when parallel.max_workers is 1 and otherwise over a pool of
+        processes with capped tensorflow threads, returning the results in the
+        order of jobs
+        """
+        network_settings = self.settings["model"]["network_model"]
+        parallel_settings = network_settings["parallel"]
+        registry = (
+            ModelRegistry(self.settings["model"]["registry"]["folder_path"])
+            if self.settings["model"]["registry"]["enabled"]
+            else None
+        )
+        max_workers = min(parallel_settings["max_workers"] or os.cpu_count(), len(jobs))
+        if max_workers == 1:
+            logger.info(f"Running [{len(jobs)}] walk-forward jobs in this process")
+            return [
+                self._walk_forward(*job, windows, network_settings, registry)
+                for job in jobs
+            ]
+
+        logger.info(
+            f"Running [{len(jobs)}] walk-forward jobs over [{max_workers}] processes with [{parallel_settings['intra_op_threads']}] intra-op and [{parallel_settings['inter_op_threads']}] inter-op threads each"  # noqa
+        )
+        with ProcessPoolExecutor(
+            max_workers=max_workers,
+            # spawned workers do not inherit the threads of tensorflow or pandas
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_walk_forward_worker,
+            initargs=(
+                windows,
+                network_settings,
+                registry,
+                parallel_settings["intra_op_threads"],
+                parallel_settings["inter_op_threads"],
+            ),
+        ) as executor:
+            # longest jobs first so a warm started chain does not start last
+            futures = {}
+            for job_index in sorted(
+                range(len(jobs)), key=lambda job_index: -len(jobs[job_index][1])
+            ):
+                futures[job_index] = executor.submit(
+                    _run_walk_forward_job, *jobs[job_index]
                 )
+            return [futures[job_index].result() for job_index in range(len(jobs))]
+
+    @staticmethod
+    def _walk_forward(
+        model_types,
+        cut_off_trading_days,
+        warm_start,
+        windows,
+        network_settings,
+        registry=None,
+    ):
+        """
+        Train and predict every window after its cut off. From scratch, each
+        window trains a new model for the full epoch budget. Warm started, the
+        first window does so and every later one fine-tunes the previous model,
+        weights and optimizer state included, for warm_start_epochs on the
+        expanded training data. A window whose model is in the registry loads it
+        instead of training. Predictions have a column per model type, each
+        with a column per horizon when the windows have horizons
+        """
+        logger.info(
+            f"Walking forward LSTM model types {list(model_types)} {'warm started' if warm_start else 'from scratch'}"  # noqa
+        )
+        start_time = time.perf_counter()
+        training_policy = TrainingPolicy.from_settings(network_settings["training"])
+        lstm_y_pred_test_list = []
+        y_test_list = []
+        epochs_used = []
+        model = None
+        # everything the trained weights depend on besides the data, a warm
+        # started model also depending on where its chain started
+        training_config = {
+            "lookback": windows.lookback,
+            "epoches": network_settings["epoches"],
+            "batch_size": network_settings["batch_size"],
+            "training": network_settings["training"],
+            "warm_start": warm_start,
+        }
+        if windows.horizons:
+            training_config["horizons"] = windows.horizons
+        if warm_start:
+            training_config["warm_start_epochs"] = network_settings["warm_start_epochs"]
+            training_config["chain_start"] = str(
+                windows.dates[cut_off_trading_days[0] - 1]
+            )
+        for num_interval, cut_off_trading_day in enumerate(cut_off_trading_days):
+            logger.debug(
+                f"For number of interval = [{num_interval}], the trading day cut off is [{cut_off_trading_day}]"
+            )
+
+            logger.debug("Getting the training and testing data")
+            X_train, y_train, X_test, y_test = NeuralNetworkModel._get_data(
+                cut_off_trading_day,
+                network_settings["prediction_num_days"],
+                windows,
+            )
+
+            epochs = (
+                network_settings["warm_start_epochs"]
+                if warm_start and model is not None
+                else network_settings["epoches"]
+            )
+            registry_entry = {
+                "family": "lstm",
+                "architecture": "types_" + "_".join(map(str, model_types))
+                if len(model_types) > 1
+                else f"type_{model_types[0]}",
+                "window_end": windows.dates[cut_off_trading_day - 1],
+                "features": windows.columns,
+                "config": training_config,
+                "training_data": (
+                    windows.features[:cut_off_trading_day],
+                    windows.target[:cut_off_trading_day],
+                ),
+            }
+            registered_model = (
+                None if registry is None else registry.load(**registry_entry)
+            )
+
+            if registered_model is not None:
+                logger.info(f"Reusing the registered LSTM model types {model_types}")
+                model = registered_model
+                window_epochs_used = 0
+            else:
+                if model is None or not warm_start:
+                    logger.debug(f"Getting the model architecture parts {model_types}")
+                    model = (
+                        NeuralNetworkModel._get_lstm_model(
+                            model_types[0], max(windows.horizons, 1)
+                        )
+                        if len(model_types) == 1
+                        else NeuralNetworkModel._get_batched_lstm_model(
+                            model_types, X_train.shape[1:], max(windows.horizons, 1)
+                        )
+                    )
+                    # a loss per output, summed, for batched architectures
+                    model.compile(optimizer="adam", loss="mse")
 
                 logger.info(
-                    "Appending model prediction results with in the time interval to prediction results list"
+                    f"Use LSTM model types {model_types} for al price prediction"
                 )
-                lstm_y_pred_test_list.append(results_in_time_interval)
-                y_test_list.append(y_test_in_interval)
-
-            logger.info("Concatenate all lists to generate final predicted time series")
-            lstm_y_pred_test = np.concatenate(lstm_y_pred_test_list)
-            y_test_all = np.concatenate(y_test_list)
-
-            logger.info("Making prediction plots")
-            plt.plot(
-                np.arange(len(lstm_y_pred_test)),
-                lstm_y_pred_test,
-                label=f"model_structure_type_{model_type}",
-            )
-            plt.plot(np.arange(len(y_test_all)), y_test_all, label="actual")
-            plt.legend()
-            plt.title(f"LSTM Out-of-Sample Forecasts For Structure Type {model_type}")
-            Saver.save_plots(f"lstm_type_{model_type}_test_prediction_out_of_sample")
-            plt.clf()
-
-            logger.info("Store the model predictions")
-            lstm_model_results_df = pd.DataFrame({"prediction_value": lstm_y_pred_test})
-            Saver.save_csv(
-                lstm_model_results_df,
-                f"lstm_type_{model_type}_predictions_results",
-                "modelling",
+                window_epochs_used = NeuralNetworkModel._train_lstm_model(
+                    model,
+                    training_policy,
+                    epochs,
+                    network_settings["batch_size"],
+                    X_train,
+                    y_train,
+                    len(model_types),
+                )
+                if registry is not None:
+                    registry.save(
+                        model,
+                        **registry_entry,
+                        metadata={"epochs_used": window_epochs_used},
+                    )
+
+            logger.info("Making predictions using the trained model")
+            results_in_time_interval = NeuralNetworkModel._predict(model, X_test)
+            y_test_in_interval = y_test
+
+            logger.info(
+                "Appending model prediction results with in the time interval to prediction results list"
             )
+            lstm_y_pred_test_list.append(results_in_time_interval)
+            y_test_list.append(y_test_in_interval)
+            epochs_used.append((cut_off_trading_day, window_epochs_used, epochs))
 
-            logger.info("Give model performance metrics")
-            lstm_performance_test = calculate_performance_metrics(
-                y_test_all, lstm_y_pred_test
+        return (
+            np.concatenate(lstm_y_pred_test_list, axis=0),
+            np.concatenate(y_test_list),
+            time.perf_counter() - start_time,
+            epochs_used,
+        )
+
+    def _log_epochs(self, model_type, warm_start, training_seconds, epochs_used):
+        """
+        Log the epochs every window trained for against its budget, workers
+        returning them as their own logs are not collected
+        """
+        for cut_off_trading_day, window_epochs_used, epochs in epochs_used:
+            logger.debug(
+                f"LSTM model type [{model_type}] window at cut off [{cut_off_trading_day}] trained for [{window_epochs_used}] of [{epochs}] epochs"  # noqa
             )
+        total_epochs_used = sum(window[1] for window in epochs_used)
+        total_epochs = sum(window[2] for window in epochs_used)
+        logger.info(
+            f"Walk-forward of LSTM model type [{model_type}] {'warm started' if warm_start else 'from scratch'} took [{training_seconds:.1f}] training seconds and [{total_epochs_used}] of [{total_epochs}] budgeted epochs"  # noqa
+        )
 
-            logger.info("Convert results to dataframe and save it")
-            test_performance_results = pd.DataFrame.from_dict(
-                lstm_performance_test, orient="index"
-            ).reset_index()
-            test_performance_results.columns = ["item", "value"]
-            Saver.save_csv(
-                test_performance_results,
-                f"lstm_type_{model_type}_test_results",
-                "modelling",
+    def _save_results(self, model_type, lstm_y_pred_test, y_test_all, scaler, prefix):
+        if lstm_y_pred_test.ndim == 2:
+            self._save_horizon_results(
+                model_type, lstm_y_pred_test, y_test_all, scaler, prefix
             )
+            return
+
+        logger.info("Making prediction plots")
+        self.context.plotter.request(
+            render_lines,
+            f"lstm_type_{model_type}_{prefix}test_prediction_out_of_sample.png",
+            lines=[
+                (
+                    np.arange(len(lstm_y_pred_test)),
+                    np.asarray(lstm_y_pred_test),
+                    f"model_structure_type_{model_type}",
+                ),
+                (np.arange(len(y_test_all)), np.asarray(y_test_all), "actual"),
+            ],
+            title=f"LSTM Out-of-Sample Forecasts For Structure Type {model_type}",
+            legend=True,
+        )
+
+        logger.info("Store the model predictions")
+        lstm_model_results_df = pd.DataFrame(
+            {
+                "prediction_value": lstm_y_pred_test,
+                "prediction_price": scaler.inverse_transform_column(
+                    "AL_PRICE", lstm_y_pred_test
+                ),
+            }
+        )
+        Saver.save_csv(
+            lstm_model_results_df,
+            f"lstm_type_{model_type}_{prefix}predictions_results",
+            "modelling",
+        )
+
+        logger.info("Give model performance metrics")
+        lstm_performance_test = calculate_performance_metrics(
+            y_test_all, lstm_y_pred_test
+        )
+
+        logger.info("Convert results to dataframe and save it")
+        test_performance_results = pd.DataFrame.from_dict(
+            lstm_performance_test, orient="index"
+        ).reset_index()
+        test_performance_results.columns = ["item", "value"]
+        Saver.save_csv(
+            test_performance_results,
+            f"lstm_type_{model_type}_{prefix}test_results",
+            "modelling",
+        )
 
-    def _run_lstm_model(self, model_type, X_train, y_train, X_test, y_test):
-        logger.debug(f"Getting the model architecture part [{model_type}]")
-        model = self._get_lstm_model(model_type)
+    def _save_horizon_results(
+        self, model_type, lstm_y_pred_test, y_test_all, scaler, prefix
+    ):
+        """
+        The results of a multi-horizon head under the same names, with a value
+        and price column per horizon and the metrics of every horizon
+        """
+        logger.info("Making prediction plots of the longest horizon")
+        self.context.plotter.request(
+            render_lines,
+            f"lstm_type_{model_type}_{prefix}test_prediction_out_of_sample.png",
+            lines=[
+                (
+                    np.arange(len(lstm_y_pred_test)),
+                    lstm_y_pred_test[:, -1],
+                    f"model_structure_type_{model_type}",
+                ),
+                (np.arange(len(y_test_all)), y_test_all[:, -1], "actual"),
+            ],
+            title=f"LSTM Out-of-Sample Forecasts For Structure Type {model_type} At Horizon {lstm_y_pred_test.shape[1]}",  # noqa
+            legend=True,
+        )
 
-        logger.info("Training Model")
-        model.compile(optimizer="adam", loss="mse")
-        model.fit(
-            X_train,
-            y_train,
-            epochs=self.settings["model"]["network_model"]["epoches"],
-            batch_size=self.settings["model"]["network_model"]["batch_size"],
-            verbose=0,
+        logger.info("Store the model predictions of every horizon")
+        lstm_model_results_df = pd.DataFrame(
+            {
+                f"prediction_{column}_{horizon + 1}": values
+                for horizon in range(lstm_y_pred_test.shape[1])
+                for column, values in [
+                    ("value", lstm_y_pred_test[:, horizon]),
+                    (
+                        "price",
+                        scaler.inverse_transform_column(
+                            "AL_PRICE", lstm_y_pred_test[:, horizon]
+                        ),
+                    ),
+                ]
+            }
+        )
+        Saver.save_csv(
+            lstm_model_results_df,
+            f"lstm_type_{model_type}_{prefix}predictions_results",
+            "modelling",
         )
 
-        logger.info("Making predictions using the trained model and output results")
+        logger.info("Give model performance metrics of every horizon")
+        Saver.save_csv(
+            calculate_horizon_metrics(y_test_all, lstm_y_pred_test),
+            f"lstm_type_{model_type}_{prefix}test_results",
+            "modelling",
+        )
+
+    def _save_comparison(self, model_type, results):
+        """
+        Metrics, training time and epochs of the warm started walk-forward next to the
+        from scratch baseline
+        """
+        comparison = {}
+        for warm_start, (
+            lstm_y_pred_test,
+            y_test_all,
+            training_seconds,
+            epochs_used,
+        ) in results.items():
+            metrics = calculate_performance_metrics(y_test_all, lstm_y_pred_test)
+            metrics["TRAINING_SECONDS"] = training_seconds
+            metrics["EPOCHS"] = sum(window[1] for window in epochs_used)
+            comparison["warm_start" if warm_start else "scratch"] = metrics
+        comparison_df = pd.DataFrame(comparison).rename_axis("item").reset_index()
+        comparison_df["difference"] = (
+            comparison_df["warm_start"] - comparison_df["scratch"]
+        )
+        logger.info(
+            f"Warm started against from scratch LSTM model type [{model_type}]: {comparison_df.to_dict('records')}"  # noqa
+        )
+        Saver.save_csv(
+            comparison_df,
+            f"lstm_type_{model_type}_walk_forward_comparison",
+            "modelling",
+        )
+
+    @staticmethod
+    def _train_lstm_model(
+        model, training_policy, epochs, batch_size, X_train, y_train, num_outputs
+    ):
+        logger.info(f"Training Model for at most [{epochs}] epochs")
+        return training_policy.fit(
+            model, X_train, y_train, epochs, batch_size, num_outputs
+        )
+
+    @staticmethod
+    def _predict(model, X_test):
+        """
+        Predictions with a column per output, each with a column per horizon
+        when the outputs have more than one
+        """
         lstm_predictions_test = model.predict(X_test)
-        results_in_time_interval = [i[0] for i in lstm_predictions_test]
+        if not isinstance(lstm_predictions_test, list):
+            lstm_predictions_test = [lstm_predictions_test]
+        predictions = np.stack(
+            [
+                np.asarray(predictions).reshape(len(X_test), -1)
+                for predictions in lstm_predictions_test
+            ],
+            axis=1,
+        )
+        return predictions[:, :, 0] if predictions.shape[2] == 1 else predictions
 
-        return results_in_time_interval, y_test
+    @staticmethod
+    def _get_batched_lstm_model(types, input_shape, num_horizons=1):
+        """
+        The architectures side by side over one input, each in its own branch
+        with its own loss, so one pass over the batches trains every one of
+        them as it would be trained alone for a fixed number of epochs. Early
+        stopping and learning rate cuts would follow the summed loss of every
+        branch, so they are not used with it
+        """
+        inputs = Input(shape=input_shape)
+        outputs = [
+            NeuralNetworkModel._get_lstm_model(type, num_horizons)(inputs)
+            for type in types
+        ]
+        return Model(inputs, outputs)
 
-    def _get_lstm_model(slef, type):
+    @staticmethod
+    def _get_lstm_model(type, num_horizons=1):
         if type == 1:
             model = Sequential()
             model.add(LSTM(64))
             model.add(Dense(4))
-            model.add(Dense(1))
+            model.add(Dense(num_horizons))
         elif type == 2:
             model = Sequential()
             model.add(LSTM(64))
             model.add(Dense(16))
             model.add(Dense(4))
-            model.add(Dense(1))
+            model.add(Dense(num_horizons))
         elif type == 3:
             model = Sequential()
             model.add(LSTM(64))
@@ -140,34 +549,42 @@ class NeuralNetworkModel(Module):
             model.add(Dense(16))
             model.add(Dense(8))
             model.add(Dense(4))
-            model.add(Dense(1))
+            model.add(Dense(num_horizons))
         else:
             raise NotImplementedError
         return model
 
-    def _get_data(self, cut_off_trading_day, prediction_num_days, data):
-        logger.info("Dropping the date columns")
-        data_no_date = data.drop("DATE", axis=1)
+    @staticmethod
+    def _get_data(cut_off_trading_day, prediction_num_days, windows):
+        logger.info("Slicing the training and testing sequences")
+        X_train, y_train = windows.rows(0, cut_off_trading_day)
+        X_test, y_test = windows.rows(
+            cut_off_trading_day, cut_off_trading_day + prediction_num_days
+        )
+        return X_train, y_train, X_test, y_test
+
 
-        logger.info("Obtaining the training dataframe and testing dataframe")
-        training_df = data_no_date.head(cut_off_trading_day)
-        testing_df = data_no_date.iloc[
-            cut_off_trading_day : cut_off_trading_day + prediction_num_days
-        ]
+_worker_state = None
 
-        logger.info("Creating predictors and target variables dataset")
-        X_train = training_df.drop(["AL_PRICE"], axis=1)
-        y_train = training_df["AL_PRICE"]
-        X_test = testing_df.drop(["AL_PRICE"], axis=1)
-        y_test = list(testing_df["AL_PRICE"])
 
-        logger.info("Converting to tensors, except for y_test")
-        X_train = tf.convert_to_tensor(X_train.to_numpy())
-        y_train = tf.convert_to_tensor(y_train.to_numpy())
-        X_test = tf.convert_to_tensor(X_test.to_numpy())
+def _init_walk_forward_worker(
+    windows, network_settings, registry, intra_op_threads, inter_op_threads
+):
+    # capped before tensorflow starts its thread pools, so workers do not
+    # oversubscribe the cores between them
+    tf.config.threading.set_intra_op_parallelism_threads(intra_op_threads)
+    tf.config.threading.set_inter_op_parallelism_threads(inter_op_threads)
+    global _worker_state
+    _worker_state = (windows, network_settings, registry)
 
-        logger.info("Expand dimensions")
-        X_train = tf.expand_dims(X_train, 1)
-        X_test = tf.expand_dims(X_test, 1)
 
-        return X_train, y_train, X_test, y_test
+def _run_walk_forward_job(model_types, cut_off_trading_days, warm_start):
+    windows, network_settings, registry = _worker_state
+    return NeuralNetworkModel._walk_forward(
+        model_types,
+        cut_off_trading_days,
+        warm_start,
+        windows,
+        network_settings,
+        registry,
+    )
@@ -0,0 +1,89 @@
+import logging
+
+import numpy as np
+from scipy import linalg
+
+logger = logging.getLogger("al_engine")
+
+# relative to the mean squared feature value
+JITTER = 1e-10
+
+
+class RecursiveLeastSquares:
+    """
+    Linear regression with an intercept kept up to date as rows arrive, by
+    rank-k Woodbury updates of the inverse of the regularized Gram matrix
+    instead of refits. ridge_alpha penalizes the coefficients but not the
+    intercept, so with a forgetting_factor of 1 the coefficients are those of
+    sklearn's Ridge (LinearRegression for ridge_alpha 0) on every row seen. A
+    forgetting_factor below 1 weighs a row seen n rows ago by its n-th power,
+    the penalty fading along with the rows it was set against
+    """
+
+    def __init__(
+        self, ridge_alpha: float = 0.0, forgetting_factor: float = 1.0
+    ) -> None:
+        if not 0 < forgetting_factor <= 1:
+            raise ValueError(
+                f"Forgetting factor [{forgetting_factor}] is not in (0, 1]"
+            )
+        self.ridge_alpha = ridge_alpha
+        self.forgetting_factor = forgetting_factor
+        self.inverse_gram = None
+        self.weights = None
+
+    def fit(self, X: np.ndarray, y: np.ndarray) -> None:
+        """
+        Solve on the first rows directly, later rows are added with update
+        """
+        X = _with_intercept(X)
+        row_weights = self.forgetting_factor ** np.arange(len(X) - 1, -1, -1)
+        gram = X.T @ (row_weights[:, None] * X)
+        # collinear features leave the Gram matrix singular, a jitter far below
+        # the scale of the features keeps it positive definite so the weights
+        # are those of lstsq's minimum norm solution up to rounding
+        jitter = JITTER * max(np.trace(gram[1:, 1:]) / max(X.shape[1] - 1, 1), 1.0)
+        penalty = np.full(X.shape[1], self.ridge_alpha + jitter)
+        penalty[0] = 0.0
+        # with a forgetting factor the penalty is as old as the first row
+        penalty *= self.forgetting_factor ** len(X)
+        cholesky = linalg.cho_factor(gram + np.diag(penalty))
+        self.inverse_gram = linalg.cho_solve(cholesky, np.eye(X.shape[1]))
+        self.weights = linalg.cho_solve(cholesky, X.T @ (row_weights * y))
+
+    def update(self, X: np.ndarray, y: np.ndarray) -> None:
+        """
+        Add a block of k rows with one k x k solve, Woodbury's identity giving
+        the new inverse Gram matrix from the previous one
+        """
+        if len(X) == 0:
+            return
+        X = _with_intercept(X)
+        num_rows = len(X)
+        inverse_gram = self.inverse_gram / self.forgetting_factor**num_rows
+        row_weights = self.forgetting_factor ** np.arange(num_rows - 1, -1, -1)
+
+        gain = inverse_gram @ X.T
+        innovation = np.diag(1 / row_weights) + X @ gain
+        self.inverse_gram = inverse_gram - gain @ np.linalg.solve(innovation, gain.T)
+        # symmetric by construction, kept so against rounding over many updates
+        self.inverse_gram = (self.inverse_gram + self.inverse_gram.T) / 2
+        self.weights = self.weights + self.inverse_gram @ (
+            X.T @ (row_weights * (y - X @ self.weights))
+        )
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        return _with_intercept(X) @ self.weights
+
+    @property
+    def intercept_(self) -> float:
+        return float(self.weights[0])
+
+    @property
+    def coef_(self) -> np.ndarray:
+        return self.weights[1:]
+
+
+def _with_intercept(X: np.ndarray) -> np.ndarray:
+    X = np.asarray(X, dtype=np.float64)
+    return np.column_stack([np.ones(len(X)), X])
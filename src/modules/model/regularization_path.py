@@ -0,0 +1,86 @@
+import logging
+from typing import List, Optional, Tuple
+
+import numpy as np
+from joblib import Parallel, delayed
+from sklearn.linear_model import lasso_path
+from sklearn.model_selection import KFold
+
+logger = logging.getLogger("al_engine")
+
+
+def ridge_cv_alpha(
+    X: np.ndarray,
+    y: np.ndarray,
+    alphas: np.ndarray,
+    folds: int,
+    n_jobs: Optional[int] = None,
+) -> Tuple[float, np.ndarray]:
+    """
+    Alpha with the best mean validation R2 over KFold folds, as RidgeCV with
+    cv=KFold(folds) picks it, along with the mean R2 of every alpha. Each fold
+    takes one SVD of its centered training rows and solves every alpha from it
+    in closed form
+    """
+    scores = Parallel(n_jobs=n_jobs)(
+        delayed(_ridge_fold_scores)(X, y, train, validation, alphas)
+        for train, validation in _folds(X, folds)
+    )
+    mean_scores = np.mean(scores, axis=0)
+    # the first of tied alphas, in the order given, as a grid search does
+    return float(alphas[np.argmax(mean_scores)]), mean_scores
+
+
+def _ridge_fold_scores(X, y, train, validation, alphas):
+    X_mean = X[train].mean(axis=0)
+    y_mean = y[train].mean()
+    U, s, Vt = np.linalg.svd(X[train] - X_mean, full_matrices=False)
+    Uty = U.T @ (y[train] - y_mean)
+    # coefficients of every alpha at once, one column each
+    coefs = Vt.T @ (s[:, None] * Uty[:, None] / (s[:, None] ** 2 + alphas[None, :]))
+    predictions = (X[validation] - X_mean) @ coefs + y_mean
+    residual_sum = ((y[validation, None] - predictions) ** 2).sum(axis=0)
+    total_sum = ((y[validation] - y[validation].mean()) ** 2).sum()
+    return 1 - residual_sum / total_sum
+
+
+def lasso_cv_alpha(
+    X: np.ndarray,
+    y: np.ndarray,
+    alphas: np.ndarray,
+    folds: int,
+    n_jobs: Optional[int] = None,
+) -> Tuple[float, np.ndarray]:
+    """
+    Alpha with the lowest mean validation MSE over KFold folds, as LassoCV with
+    cv=KFold(folds) picks it, along with the mean MSE of every alpha in
+    decreasing order. Each fold computes its Gram matrix once and runs the whole
+    path with warm starts from the largest alpha down
+    """
+    alphas = np.sort(alphas)[::-1]
+    mse = Parallel(n_jobs=n_jobs)(
+        delayed(_lasso_fold_mse)(X, y, train, validation, alphas)
+        for train, validation in _folds(X, folds)
+    )
+    mean_mse = np.mean(mse, axis=0)
+    return float(alphas[np.argmin(mean_mse)]), mean_mse
+
+
+def _lasso_fold_mse(X, y, train, validation, alphas):
+    X_mean = X[train].mean(axis=0)
+    y_mean = y[train].mean()
+    X_train = np.asfortranarray(X[train] - X_mean)
+    y_train = y[train] - y_mean
+    _, coefs, _ = lasso_path(
+        X_train,
+        y_train,
+        alphas=alphas,
+        precompute=X_train.T @ X_train,
+        Xy=X_train.T @ y_train,
+    )
+    predictions = (X[validation] - X_mean) @ coefs + y_mean
+    return ((y[validation, None] - predictions) ** 2).mean(axis=0)
+
+
+def _folds(X: np.ndarray, folds: int) -> List[Tuple[np.ndarray, np.ndarray]]:
+    return list(KFold(n_splits=folds).split(X))
@@ -0,0 +1,99 @@
+import logging
+from typing import Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import tensorflow as tf
+
+from src.modules.data_processing.prepare_training import horizon_targets
+
+logger = logging.getLogger("al_engine")
+
+
+class SequenceWindows:
+    """
+    Look-back sequences of the scaled feature table for the LSTM. The features
+    are converted to one contiguous float32 array once, and the sequence ending
+    at each row is a strided view into it, so a longer look-back costs no extra
+    memory and cutting a walk-forward window is only slicing. With horizons the
+    target of every row is the price shifted by each horizon from 1 up, as the
+    SHIFTED_PRICE targets are, instead of its own price
+    """
+
+    def __init__(
+        self,
+        data: pd.DataFrame,
+        target: str = "AL_PRICE",
+        lookback: int = 1,
+        horizons: int = 0,
+    ) -> None:
+        if lookback < 1:
+            raise ValueError(f"Look-back of [{lookback}] rows is not supported")
+        logger.debug(f"Converting [{len(data)}] rows to float32 sequences...")
+        feature_df = data.drop(columns=["DATE", target])
+        self.columns = list(feature_df.columns)
+        self.dates = data["DATE"].to_numpy()
+        self.features = np.ascontiguousarray(feature_df.to_numpy(dtype=np.float32))
+        # kept in float64 so test targets and metrics are not rounded
+        self.target = (
+            horizon_targets(data[target], horizons)
+            if horizons
+            else data[target].to_numpy(dtype=np.float64)
+        )
+        self.lookback = lookback
+        self.horizons = horizons
+
+    @property
+    def sequences(self) -> np.ndarray:
+        """
+        Read-only (rows - lookback + 1, lookback, features) view, the sequence at
+        position i ending at row i + lookback - 1
+        """
+        return np.lib.stride_tricks.sliding_window_view(
+            self.features, self.lookback, axis=0
+        ).transpose(0, 2, 1)
+
+    def rows(self, start: int, end: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Sequences and targets of rows [start, end), rows without a full
+        look-back of history or horizons of prices before them being left out
+        """
+        start = max(start, self.lookback - 1, self.horizons)
+        return (
+            self.sequences[start - self.lookback + 1 : end - self.lookback + 1],
+            self.target[start:end],
+        )
+
+    @staticmethod
+    def dataset(
+        X: np.ndarray,
+        y: np.ndarray,
+        batch_size: int,
+        seed: Optional[int] = None,
+        num_outputs: int = 1,
+    ) -> tf.data.Dataset:
+        """
+        Stream shuffled batches of X and y, only copying a batch at a time out of
+        the views, with the next batches prepared while the current one trains.
+        For a model with num_outputs outputs y is the target of every one
+        """
+        rng = np.random.default_rng(seed)
+
+        def batches():
+            # called again on every epoch, reshuffling like keras does for arrays
+            order = rng.permutation(len(X))
+            for batch_start in range(0, len(X), batch_size):
+                indices = order[batch_start : batch_start + batch_size]
+                y_batch = y[indices].astype(np.float32)
+                yield X[indices], (
+                    y_batch if num_outputs == 1 else (y_batch,) * num_outputs
+                )
+
+        y_spec = tf.TensorSpec(shape=(None,) + y.shape[1:], dtype=tf.float32)
+        return tf.data.Dataset.from_generator(
+            batches,
+            output_signature=(
+                tf.TensorSpec(shape=(None,) + X.shape[1:], dtype=tf.float32),
+                y_spec if num_outputs == 1 else (y_spec,) * num_outputs,
+            ),
+        ).prefetch(tf.data.AUTOTUNE)
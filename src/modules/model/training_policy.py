@@ -0,0 +1,97 @@
+import logging
+from typing import Dict
+
+import numpy as np
+from keras.callbacks import EarlyStopping, ReduceLROnPlateau
+
+from src.modules.model.sequence_windows import SequenceWindows
+
+logger = logging.getLogger("al_engine")
+
+
+class TrainingPolicy:
+    """
+    How a model is fitted on a training window: the last validation_fraction
+    of its rows are held out, training stops once the validation loss has not
+    improved for early_stopping_patience epochs and goes back to the best
+    weights, and the learning rate is cut by reduce_lr_factor after
+    reduce_lr_patience epochs without improvement. The epoch budget passed to
+    fit is only a cap. A validation_fraction of 0 trains on every row for the
+    whole budget
+    """
+
+    def __init__(
+        self,
+        validation_fraction: float = 0.1,
+        early_stopping_patience: int = 10,
+        reduce_lr_patience: int = 5,
+        reduce_lr_factor: float = 0.5,
+        min_learning_rate: float = 1e-5,
+    ) -> None:
+        if not 0 <= validation_fraction < 1:
+            raise ValueError(
+                f"Validation fraction [{validation_fraction}] is not in [0, 1)"
+            )
+        self.validation_fraction = validation_fraction
+        self.early_stopping_patience = early_stopping_patience
+        self.reduce_lr_patience = reduce_lr_patience
+        self.reduce_lr_factor = reduce_lr_factor
+        self.min_learning_rate = min_learning_rate
+
+    @staticmethod
+    def from_settings(training_settings: Dict) -> "TrainingPolicy":
+        return TrainingPolicy(**training_settings)
+
+    def fit(
+        self,
+        model,
+        X: np.ndarray,
+        y: np.ndarray,
+        epochs: int,
+        batch_size: int,
+        num_outputs: int = 1,
+    ) -> int:
+        """
+        Fit model on X and y for at most epochs, returning the epochs it ran. A
+        model with num_outputs outputs fits each of them on y, for the whole
+        budget as its outputs can not be stopped one by one
+        """
+        num_validation = int(len(X) * self.validation_fraction)
+        if num_outputs > 1 and num_validation > 0:
+            raise ValueError(
+                f"A model with [{num_outputs}] outputs can not be early stopped on a validation fraction of [{self.validation_fraction}]"  # noqa
+            )
+        if num_validation == 0:
+            model.fit(
+                SequenceWindows.dataset(X, y, batch_size, num_outputs=num_outputs),
+                epochs=epochs,
+                verbose=0,
+            )
+            return epochs
+
+        # the tail is held out, it is the closest to the days being predicted
+        num_train = len(X) - num_validation
+        history = model.fit(
+            SequenceWindows.dataset(
+                X[:num_train], y[:num_train], batch_size, num_outputs=num_outputs
+            ),
+            validation_data=SequenceWindows.dataset(
+                X[num_train:], y[num_train:], batch_size, num_outputs=num_outputs
+            ),
+            epochs=epochs,
+            callbacks=[
+                EarlyStopping(
+                    monitor="val_loss",
+                    patience=self.early_stopping_patience,
+                    restore_best_weights=True,
+                ),
+                ReduceLROnPlateau(
+                    monitor="val_loss",
+                    factor=self.reduce_lr_factor,
+                    patience=self.reduce_lr_patience,
+                    min_lr=self.min_learning_rate,
+                ),
+            ],
+            verbose=0,
+        )
+        return len(history.history["loss"])
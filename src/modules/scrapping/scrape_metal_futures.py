@@ -3,10 +3,13 @@ import os
 from datetime import datetime, timedelta
 
 import pandas as pd
-import requests
 
 from src.modules.base import Module
+from src.modules.data_processing.raw_sources import scraped_futures_file
+from src.modules.scrapping.settlement_cache import SettlementCache
+from src.modules.scrapping.settlement_fetcher import SettlementFetcher
 from src.utils.saver import Saver
+from src.utils.trading_calendar import TradingCalendar
 
 logger = logging.getLogger("al_engine")
 
@@ -28,52 +31,108 @@ class ScrapeMetal(Module):
         }
         logger.debug(f"Setting headers to use, details: [{headers_for_use}]]...")
 
-        logger.info("Starting a requests session")
-        session = requests.Session()
-
         today = datetime.now()
         logger.debug(
             f"Today's date is {today}, Webscrapper will start looking for data from yesterday in a backward fashion"
         )
 
-        daily_data = []
-        back_tracked_days = 0
-        number_of_backtrack_days = self.settings["scrape"]["metal_futures"][
-            "number_of_backtrack_days"
-        ]
+        scrape_settings = self.settings["scrape"]["metal_futures"]
+        number_of_backtrack_days = scrape_settings["number_of_backtrack_days"]
         logger.debug(f"Number of backtracked days is [{number_of_backtrack_days}]")
+        calendar = TradingCalendar([], self.settings["trading_calendar"]["holidays"])
+        trading_dates = calendar.expected_trading_days(
+            today - timedelta(number_of_backtrack_days), today - timedelta(1)
+        )[::-1]
+        logger.debug(
+            f"[{len(trading_dates)}] of the backtracked days are expected to be trading days"  # noqa
+        )
 
-        while back_tracked_days < number_of_backtrack_days:
-            yesterday = today - timedelta(1)
-            date_format_for_api = datetime.strftime(yesterday, "%Y%m%d")
-            date_format_for_df = datetime.strftime(yesterday, "%Y-%m-%d")
-            logger.debug(
-                f"Starting the webscraping process from [{date_format_for_df}]"
-            )
+        cache = SettlementCache(scrape_settings["cache_folder_path"])
+        missing_dates = cache.missing_dates(trading_dates)
+        logger.info(
+            f"[{len(trading_dates) - len(missing_dates)}] of [{len(trading_dates)}] days already cached, fetching the other [{len(missing_dates)}]"  # noqa
+        )
 
-            url = f"https://www.shfe.com.cn/data/instrument/Settlement{date_format_for_api}.dat"
-            logger.debug(f"Trying to access url: [{url}]")
-            response = session.get(url, headers=headers_for_use)
+        fetcher = SettlementFetcher(
+            scrape_settings["base_url"],
+            headers_for_use,
+            max_concurrency=scrape_settings["max_concurrency"],
+            requests_per_second=scrape_settings["requests_per_second"],
+            max_retries=scrape_settings["max_retries"],
+            backoff_seconds=scrape_settings["backoff_seconds"],
+            timeout_seconds=scrape_settings["timeout_seconds"],
+        )
+        responses = fetcher.fetch(missing_dates) if missing_dates else []
+
+        # the exchange may publish recent days late, only older ones are final
+        last_final_date = (
+            today - timedelta(scrape_settings["no_trading_recheck_days"])
+        ).date()
+        for response in responses:
+            cache.store(
+                response, mark_no_trading=response.trading_date <= last_final_date
+            )
 
-            if response.status_code == 200:
-                logger.debug(
-                    f"Successful in obtaining metal future prices for {date_format_for_df}"
-                )
-                df_metal_prices = pd.DataFrame.from_dict(response.json()["Settlement"])
-                df_metal_prices["date"] = date_format_for_df
+        no_trading_dates = [
+            str(response.trading_date)
+            for response in responses
+            if response.status == "no_trading"
+        ]
+        failed_dates = [
+            str(response.trading_date)
+            for response in responses
+            if response.status == "failed"
+        ]
+        logger.info(
+            f"Fetched [{len(responses) - len(no_trading_dates) - len(failed_dates)}] trading days, [{len(no_trading_dates)}] days without trading, [{len(failed_dates)}] failures"  # noqa
+        )
+        logger.debug(f"Days without trading are {no_trading_dates}")
 
-                logger.info(f"Outputting future prices...")
+        daily_data = []
+        for trading_date in trading_dates:
+            if cache.status(trading_date) == "ok":
+                df_metal_prices = pd.DataFrame.from_dict(cache.load(trading_date))
+                df_metal_prices["date"] = trading_date.strftime("%d/%m/%Y")
                 daily_data.append(df_metal_prices)
-            else:
-                logger.debug(
-                    f"There are no futures prices data for {date_format_for_df} or connection was not successful"
-                )
 
-            today = yesterday
-            back_tracked_days += 1
+        if daily_data:
+            self._merge_into_scraped_prices(pd.concat(daily_data))
+        else:
+            logger.warning("No futures prices were fetched, nothing to save")
+
+        if failed_dates:
+            raise RuntimeError(
+                f"Fetching futures prices failed for {failed_dates}, see the log for the errors"  # noqa
+            )
 
-        logger.info(f"Concatenating a the list of daily metal prices dataframe...")
-        metal_futures_prices_all = pd.concat(daily_data)
+    def _merge_into_scraped_prices(self, scraped_prices: pd.DataFrame) -> None:
+        """
+        Replace the scraped days in the scraped futures prices preprocessing lays
+        over the raw futures prices. The raw futures prices themselves are never
+        rewritten, so nothing out of the raw data archive ends up on disk
+        """
+        raw_data_settings = self.settings["preprocess"]["raw_data"]
+        futures_settings = self.settings["preprocess"]["futures"]
+        scraped_file = scraped_futures_file(raw_data_settings, futures_settings)
+
+        if scraped_file is not None:
+            logger.info("Reading in the previously scraped futures prices...")
+            futures_prices = pd.read_csv(scraped_file, dtype=str, keep_default_na=False)
+        else:
+            logger.info("No previously scraped futures prices, starting a new table")
+            futures_prices = pd.DataFrame(columns=["date"])
+
+        scraped_days = scraped_prices["date"].unique()
+        logger.info(
+            f"Merging [{len(scraped_days)}] scraped days into the scraped futures prices..."  # noqa
+        )
+        futures_prices = pd.concat(
+            [
+                futures_prices[~futures_prices["date"].isin(scraped_days)],
+                scraped_prices,
+            ],
+            ignore_index=True,
+        )
 
-        logger.info(f"Saving the final prices dataframe...")
-        Saver.save_csv(metal_futures_prices_all, "futures_prices.csv")
+        logger.info("Saving the scraped prices dataframe...")
+        Saver.save_csv(futures_prices, futures_settings["scraped_file"], "raw")
@@ -0,0 +1,55 @@
+import json
+import logging
+import os
+from datetime import date
+from typing import Dict, List, Optional
+
+from src.modules.scrapping.settlement_fetcher import SettlementResponse
+
+logger = logging.getLogger("al_engine")
+
+
+class SettlementCache:
+    """
+    On-disk cache of raw settlement payloads keyed by trading date, one
+    Settlement{YYYYMMDD}.dat per fetched day and an empty
+    Settlement{YYYYMMDD}.no_trading marker per day known to have no trading
+    """
+
+    def __init__(self, folder_path: str) -> None:
+        self.folder_path = folder_path
+        os.makedirs(folder_path, exist_ok=True)
+
+    def _path(self, trading_date: date, extension: str) -> str:
+        return f'{self.folder_path}/Settlement{trading_date.strftime("%Y%m%d")}.{extension}'  # noqa
+
+    def status(self, trading_date: date) -> Optional[str]:
+        if os.path.exists(self._path(trading_date, "dat")):
+            return "ok"
+        if os.path.exists(self._path(trading_date, "no_trading")):
+            return "no_trading"
+        return None
+
+    def missing_dates(self, trading_dates: List[date]) -> List[date]:
+        return [
+            trading_date
+            for trading_date in trading_dates
+            if self.status(trading_date) is None
+        ]
+
+    def store(self, response: SettlementResponse, mark_no_trading: bool) -> None:
+        """
+        Store a fetched payload, or a no trading marker when mark_no_trading is
+        set; failures are never stored so they are fetched again next time
+        """
+        if response.status == "ok":
+            logger.debug(f"Caching settlement file for [{response.trading_date}]")
+            with open(self._path(response.trading_date, "dat"), "w") as file:
+                json.dump({"Settlement": response.settlement}, file)
+        elif response.status == "no_trading" and mark_no_trading:
+            logger.debug(f"Caching no trading marker for [{response.trading_date}]")
+            open(self._path(response.trading_date, "no_trading"), "w").close()
+
+    def load(self, trading_date: date) -> List[Dict]:
+        with open(self._path(trading_date, "dat"), "r") as file:
+            return json.load(file)["Settlement"]
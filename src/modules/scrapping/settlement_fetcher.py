@@ -0,0 +1,142 @@
+import asyncio
+import logging
+import random
+import time
+from datetime import date
+from typing import Dict, List, NamedTuple, Optional
+from urllib.parse import urlparse
+
+import aiohttp
+
+logger = logging.getLogger("al_engine")
+
+RETRYABLE_STATUSES = [408, 425, 429, 500, 502, 503, 504]
+
+
+class SettlementResponse(NamedTuple):
+    """
+    Outcome of fetching one trading day's settlement file. status is "ok" with
+    the parsed settlement records, "no_trading" when the exchange has no file
+    for the day, or "failed" when it could not be fetched after all retries
+    """
+
+    trading_date: date
+    status: str
+    settlement: Optional[List[Dict]] = None
+    error: Optional[str] = None
+
+
+class HostRateLimiter:
+    """
+    Spaces out requests to the same host so that no more than
+    requests_per_second start in any second, shared by all concurrent fetches
+    """
+
+    def __init__(self, requests_per_second: float) -> None:
+        self.interval = 1 / requests_per_second
+        self._next_start = {}
+        self._locks = {}
+
+    async def wait(self, host: str) -> None:
+        lock = self._locks.setdefault(host, asyncio.Lock())
+        async with lock:
+            now = time.monotonic()
+            start = max(now, self._next_start.get(host, now))
+            self._next_start[host] = start + self.interval
+        await asyncio.sleep(start - now)
+
+
+class SettlementFetcher:
+    """
+    Fetches Settlement{YYYYMMDD}.dat files concurrently from base_url, with at
+    most max_concurrency requests in flight, a per-host rate limit, a timeout per
+    request and retries with jittered exponential backoff on connection errors,
+    timeouts and retryable statuses
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        headers: Dict[str, str],
+        max_concurrency: int = 8,
+        requests_per_second: float = 4,
+        max_retries: int = 3,
+        backoff_seconds: float = 1,
+        timeout_seconds: float = 30,
+    ) -> None:
+        self.base_url = base_url.rstrip("/")
+        self.headers = headers
+        self.max_concurrency = max_concurrency
+        self.rate_limiter = HostRateLimiter(requests_per_second)
+        self.max_retries = max_retries
+        self.backoff_seconds = backoff_seconds
+        self.timeout_seconds = timeout_seconds
+
+    def url(self, trading_date: date) -> str:
+        return f'{self.base_url}/Settlement{trading_date.strftime("%Y%m%d")}.dat'
+
+    def fetch(self, trading_dates: List[date]) -> List[SettlementResponse]:
+        """
+        Fetch every date's settlement file, returning the responses in the order
+        of trading_dates
+        """
+        return asyncio.run(self.fetch_all(trading_dates))
+
+    async def fetch_all(self, trading_dates: List[date]) -> List[SettlementResponse]:
+        logger.info(
+            f"Fetching [{len(trading_dates)}] settlement files with at most [{self.max_concurrency}] concurrent requests..."  # noqa
+        )
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        timeout = aiohttp.ClientTimeout(total=self.timeout_seconds)
+        async with aiohttp.ClientSession(
+            headers=self.headers, timeout=timeout
+        ) as session:
+            return await asyncio.gather(
+                *(
+                    self._fetch(session, semaphore, trading_date)
+                    for trading_date in trading_dates
+                )
+            )
+
+    async def _fetch(
+        self,
+        session: aiohttp.ClientSession,
+        semaphore: asyncio.Semaphore,
+        trading_date: date,
+    ) -> SettlementResponse:
+        url = self.url(trading_date)
+        host = urlparse(url).netloc
+        error = None
+        for attempt in range(self.max_retries + 1):
+            if attempt > 0:
+                backoff = self.backoff_seconds * 2 ** (attempt - 1)
+                await asyncio.sleep(backoff * random.uniform(0.5, 1.5))
+                logger.debug(f"Retrying [{url}], attempt [{attempt + 1}]...")
+
+            async with semaphore:
+                await self.rate_limiter.wait(host)
+                try:
+                    async with session.get(url) as response:
+                        if response.status == 404:
+                            logger.debug(f"No settlement file for [{trading_date}]")
+                            return SettlementResponse(trading_date, "no_trading")
+                        if response.status == 200:
+                            payload = await response.json(content_type=None)
+                            logger.debug(
+                                f"Fetched settlement file for [{trading_date}]"
+                            )
+                            return SettlementResponse(
+                                trading_date, "ok", payload["Settlement"]
+                            )
+                        error = f"HTTP status [{response.status}]"
+                        if response.status not in RETRYABLE_STATUSES:
+                            break
+                except (aiohttp.ClientError, asyncio.TimeoutError) as exception:
+                    error = f"{type(exception).__name__}: {exception}"
+                except (ValueError, KeyError) as exception:
+                    error = f"Malformed settlement file, {type(exception).__name__}: {exception}"  # noqa
+                    break
+            logger.debug(f"Fetching [{url}] failed with {error}")
+
+        logger.warning(f"Giving up on [{url}] after {error}")
+        return SettlementResponse(trading_date, "failed", error=error)
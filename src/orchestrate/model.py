@@ -1,4 +1,5 @@
 from src.modules.model.linear_model import LinearModel
+from src.modules.model.linear_walk_forward import LinearWalkForward
 from src.modules.model.neural_network import NeuralNetworkModel
 
-list_modules = [LinearModel, NeuralNetworkModel]
+list_modules = [LinearModel, LinearWalkForward, NeuralNetworkModel]
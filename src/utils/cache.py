@@ -0,0 +1,191 @@
+import ast
+import hashlib
+import importlib.util
+import inspect
+import json
+import logging
+import os
+from typing import Dict, Iterable, List, Tuple
+
+from src.modules.base import Module
+from src.utils.settings import SETTINGS
+
+logger = logging.getLogger("al_engine")
+
+
+class ExecutionCache:
+    """
+    Decides whether a module can be skipped by comparing a fingerprint of its
+    code, declared input files and declared config keys against the fingerprint
+    recorded the last time the module ran successfully. The code is the source
+    file of the module and of every src module it imports, directly or through
+    other src modules
+    """
+
+    def __init__(self, force: bool = False) -> None:
+        self.force = force
+        self.folder_path = SETTINGS["execution_cache"]["folder_path"]
+        os.makedirs(self.folder_path, exist_ok=True)
+
+    def is_valid(self, module: Module, recomputed_files: Iterable[str]) -> bool:
+        is_hit, reason = self._check(module, set(recomputed_files))
+        if is_hit:
+            logger.info(f"Cache hit for module [{module.module_name}]: {reason}")
+        else:
+            logger.info(f"Cache miss for module [{module.module_name}]: {reason}")
+        return is_hit
+
+    def record(self, module: Module) -> None:
+        if not module.output_files:
+            return
+
+        logger.debug(f"Recording cache manifest for module [{module.module_name}]...")
+        manifest = self._fingerprint(module, self._load_manifest(module))
+        with open(self._manifest_path(module), "w") as file:
+            json.dump(manifest, file, indent=2)
+
+    def _check(self, module: Module, recomputed_files: set) -> Tuple[bool, str]:
+        if self.force:
+            return False, "--force was given"
+        if not module.output_files:
+            return False, "module does not declare any outputs to reuse"
+
+        recomputed_inputs = recomputed_files.intersection(module.input_files)
+        if recomputed_inputs:
+            return (
+                False,
+                f"inputs {sorted(recomputed_inputs)} were recomputed in this run",
+            )
+
+        missing_files = [
+            path
+            for path in module.input_files + module.output_files
+            if not os.path.exists(path)
+        ]
+        if missing_files:
+            return False, f"files {missing_files} do not exist"
+
+        previous_manifest = self._load_manifest(module)
+        if previous_manifest is None:
+            return False, "no previous successful run is recorded"
+
+        manifest = self._fingerprint(module, previous_manifest)
+        if manifest["code"] != previous_manifest["code"]:
+            return (
+                False,
+                "source code of the module or of a src module it imports changed",
+            )
+        if manifest["config"] != previous_manifest["config"]:
+            return False, f"config keys {module.config_keys} changed"
+        changed_inputs = [
+            path
+            for path in module.input_files
+            if manifest["inputs"][path]["sha256"]
+            != previous_manifest["inputs"].get(path, {}).get("sha256")
+        ]
+        if changed_inputs:
+            return False, f"inputs {changed_inputs} changed"
+        if manifest["outputs"] != previous_manifest["outputs"]:
+            return False, "declared outputs changed"
+
+        return (
+            True,
+            f"inputs, config and code of the module and its src imports unchanged, reusing {module.output_files}",  # noqa
+        )
+
+    def _fingerprint(self, module: Module, previous_manifest: Dict = None) -> Dict:
+        previous_inputs = (previous_manifest or {}).get("inputs", {})
+        code_hash = hashlib.sha256()
+        for path in self._code_files(module):
+            with open(path, "rb") as file:
+                code_hash.update(os.path.relpath(path).encode())
+                code_hash.update(hashlib.sha256(file.read()).digest())
+        code_hash = code_hash.hexdigest()
+        config_values = {key: self._get_config(key) for key in module.config_keys}
+        config_hash = hashlib.sha256(
+            json.dumps(config_values, sort_keys=True, default=str).encode()
+        ).hexdigest()
+
+        return {
+            "code": code_hash,
+            "config": config_hash,
+            "inputs": {
+                path: self._file_fingerprint(path, previous_inputs.get(path))
+                for path in module.input_files
+            },
+            "outputs": sorted(module.output_files),
+        }
+
+    @staticmethod
+    def _code_files(module: Module) -> List[str]:
+        """
+        Source files of the module and of the src modules it imports, followed
+        through their own imports, imports inside functions included
+        """
+        code_files = set()
+        pending = [inspect.getsourcefile(type(module))]
+        while pending:
+            path = pending.pop()
+            if path in code_files:
+                continue
+            code_files.add(path)
+            with open(path, "rb") as file:
+                tree = ast.parse(file.read(), filename=path)
+            for node in ast.walk(tree):
+                if isinstance(node, ast.Import):
+                    names = [alias.name for alias in node.names]
+                elif isinstance(node, ast.ImportFrom) and node.level == 0:
+                    # the names imported may be modules of a package themselves
+                    names = [node.module] + [
+                        f"{node.module}.{alias.name}" for alias in node.names
+                    ]
+                else:
+                    continue
+                for name in names:
+                    if name.split(".")[0] != "src":
+                        continue
+                    try:
+                        spec = importlib.util.find_spec(name)
+                    except (ImportError, ValueError):
+                        # an attribute of a module rather than a module
+                        continue
+                    if spec is not None and spec.origin and spec.origin.endswith(".py"):
+                        pending.append(spec.origin)
+        return sorted(code_files)
+
+    @staticmethod
+    def _file_fingerprint(path: str, previous: Dict = None) -> Dict:
+        file_stat = os.stat(path)
+        fingerprint = {"size": file_stat.st_size, "mtime_ns": file_stat.st_mtime_ns}
+        if previous is not None and all(
+            previous.get(key) == value for key, value in fingerprint.items()
+        ):
+            logger.debug(f"File [{path}] untouched since last run, reusing its hash")
+            fingerprint["sha256"] = previous["sha256"]
+            return fingerprint
+
+        logger.debug(f"Hashing file [{path}]...")
+        file_hash = hashlib.sha256()
+        with open(path, "rb") as file:
+            for chunk in iter(lambda: file.read(1 << 20), b""):
+                file_hash.update(chunk)
+        fingerprint["sha256"] = file_hash.hexdigest()
+        return fingerprint
+
+    @staticmethod
+    def _get_config(key: str):
+        value = SETTINGS
+        for part in key.split("."):
+            if not isinstance(value, dict) or part not in value:
+                return None
+            value = value[part]
+        return value
+
+    def _manifest_path(self, module: Module) -> str:
+        return f"{self.folder_path}/{module.module_name}.json"
+
+    def _load_manifest(self, module: Module) -> Dict:
+        if not os.path.exists(self._manifest_path(module)):
+            return None
+        with open(self._manifest_path(module), "r") as file:
+            return json.load(file)
@@ -7,6 +7,9 @@ from datetime import datetime
 import click
 import yaml
 
+from src.utils.cache import ExecutionCache
+from src.utils.context import PipelineContext
+from src.utils.plotter import PLOT_MODES
 from src.utils.settings import SETTINGS
 
 logger = logging.getLogger("al_engine")
@@ -15,7 +18,16 @@ logger = logging.getLogger("al_engine")
 class Orchestrator:
     @click.command()
     @click.argument("orc", type=str)
-    def run_orchestartion(orc):
+    @click.option(
+        "--force", is_flag=True, help="Re-run all modules ignoring cached outputs"
+    )
+    @click.option(
+        "--plots",
+        type=click.Choice(PLOT_MODES),
+        default=None,
+        help="Render plots in the background (deferred), inline (sync) or not at all (none), defaults to plots.mode in src/config.yaml",  # noqa
+    )
+    def run_orchestartion(orc, force, plots):
         logger.info("Loading in config files from src/config.yaml...")
         with open("src/config.yaml", "r") as file:
             settings = yaml.safe_load(file)
@@ -38,9 +50,27 @@ class Orchestrator:
         )
 
         logger.info("Starting all modules execution...")
-        for module in orchestrator_file.list_modules:
-            logger.info(f"Queueing modules execution for module [{module}]...")
-            module()._run()
+        cache = ExecutionCache(force=force)
+        context = PipelineContext(plot_mode=plots)
+        executed_modules = []
+        recomputed_files = set()
+        try:
+            for module in orchestrator_file.list_modules:
+                module_instance = module()
+                if cache.is_valid(module_instance, recomputed_files):
+                    logger.info(f"Skipping modules execution for module [{module}]")
+                    continue
+
+                logger.info(f"Queueing modules execution for module [{module}]...")
+                module_instance._run(context)
+                executed_modules.append(module_instance)
+                recomputed_files.update(module_instance.output_files)
+        finally:
+            context.close()
+
+        logger.info("Recording cache manifests for executed modules...")
+        for module_instance in executed_modules:
+            cache.record(module_instance)
 
         time_now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         logger_message = f"""
@@ -0,0 +1,80 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
+
+import pandas as pd
+
+from src.utils.loader import Loader
+from src.utils.plotter import Plotter
+from src.utils.saver import Saver
+from src.utils.settings import SETTINGS
+
+logger = logging.getLogger("al_engine")
+
+
+class PipelineContext:
+    """
+    Run-scoped store of named artifacts shared between the modules of one
+    orchestration. Published dataframes are handed over in memory and persisted
+    in the background, so published dataframes must be treated as read-only.
+    Plots are requested through its plotter, in the mode given or set in
+    config.yaml.
+    """
+
+    def __init__(self, plot_mode: Optional[str] = None) -> None:
+        self._artifacts = {}
+        self._pending_saves = []
+        self._executor = None
+        self.plotter = Plotter(
+            plot_mode or SETTINGS["plots"]["mode"],
+            f'{SETTINGS["run_meta_data"]["run_folder_path"]}/plots',
+            SETTINGS["plots"]["max_workers"],
+        )
+
+    def publish(self, name: str, df: pd.DataFrame, type: str = "processed") -> None:
+        logger.debug(f"Publishing artifact [{name}] to the pipeline context...")
+        # artifacts are saved without their index, so the one handed over in
+        # memory gets the same 0-based index a read from disk would have
+        if not df.index.equals(pd.RangeIndex(len(df))):
+            df = df.reset_index(drop=True)
+        self._artifacts[name] = df
+
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=SETTINGS["pipeline_context"]["persist_workers"],
+                thread_name_prefix="artifact_saver",
+            )
+        logger.debug(f"Queueing artifact [{name}] to be saved under [data/{type}]...")
+        self._pending_saves.append(
+            (name, self._executor.submit(Saver.save_artifact, df, name, type))
+        )
+
+    def consume(
+        self, name: str, type: str = "processed", columns: Optional[List[str]] = None
+    ) -> pd.DataFrame:
+        if name in self._artifacts:
+            logger.debug(f"Artifact [{name}] found in the pipeline context")
+            df = self._artifacts[name]
+            return df if columns is None else df[columns]
+
+        logger.debug(f"Artifact [{name}] not published in this run, reading from disk")
+        return Loader.load_artifact(name, type, columns=columns)
+
+    def flush(self) -> None:
+        logger.info("Waiting for queued artifacts to finish saving...")
+        pending_saves, self._pending_saves = self._pending_saves, []
+        for name, pending_save in pending_saves:
+            try:
+                pending_save.result()
+            except Exception:
+                logger.error(f"Saving artifact [{name}] failed")
+                raise
+
+    def close(self) -> None:
+        try:
+            self.flush()
+        finally:
+            if self._executor is not None:
+                self._executor.shutdown()
+                self._executor = None
+            self.plotter.close()
@@ -0,0 +1,60 @@
+import json
+import logging
+from typing import List, Optional
+
+import pandas as pd
+
+from src.utils.settings import SETTINGS
+
+logger = logging.getLogger("al_engine")
+
+ARTIFACT_READERS = {
+    "parquet": lambda path, columns: pd.read_parquet(
+        path, columns=columns, memory_map=True
+    ),
+    "feather": lambda path, columns: pd.read_feather(path, columns=columns),
+}
+
+
+class Loader:
+    def __init__(self) -> None:
+        pass
+
+    @staticmethod
+    def artifact_path(filename: str, type: str = "processed") -> str:
+        artifact_format = SETTINGS["artifacts"]["format"]
+        if artifact_format not in ARTIFACT_READERS:
+            raise NotImplementedError(
+                f"Artifact format [{artifact_format}] is not supported"
+            )
+        extension = f".{artifact_format}"
+        if filename[-len(extension) :] != extension:
+            filename = filename + extension
+        return f"data/{type}/{filename}"
+
+    @staticmethod
+    def load_artifact(
+        filename: str, type: str = "processed", columns: Optional[List[str]] = None
+    ) -> pd.DataFrame:
+        """
+        Load a pipeline artifact written by Saver.save_artifact, only reading the
+        requested columns, from a memory-mapped file for parquet
+        """
+        path = Loader.artifact_path(filename, type)
+        logger.debug(f"Loading artifact from location [{path}], columns [{columns}]...")
+        df = ARTIFACT_READERS[SETTINGS["artifacts"]["format"]](path, columns)
+        logger.info("Load successful!")
+
+        return df
+
+    @staticmethod
+    def load_json(filename: str, type: str = "processed") -> dict:
+        if filename[-5:] != ".json":
+            filename = filename + ".json"
+
+        logger.debug(f"Loading file from location [data/{type}/{filename}]...")
+        with open(f"data/{type}/{filename}", "r") as file:
+            obj = json.load(file)
+        logger.info("Load successful!")
+
+        return obj
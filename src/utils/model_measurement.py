@@ -1,6 +1,7 @@
 import logging
 
 import numpy as np
+import pandas as pd
 from sklearn.metrics import r2_score
 
 logger = logging.getLogger("al_engine")
@@ -17,3 +18,21 @@ def calculate_performance_metrics(actual, predicted):
     logger.info(f"Calcualted Metrics are: [{metrics}]")
 
     return metrics
+
+
+def calculate_horizon_metrics(actual, predicted):
+    """
+    Metrics of every horizon, the columns of actual and predicted being the
+    horizons from 1 up
+    """
+    actual = np.asarray(actual)
+    predicted = np.asarray(predicted)
+    return pd.DataFrame(
+        [
+            {"horizon": horizon + 1, "item": item, "value": value}
+            for horizon in range(actual.shape[1])
+            for item, value in calculate_performance_metrics(
+                actual[:, horizon], predicted[:, horizon]
+            ).items()
+        ]
+    )
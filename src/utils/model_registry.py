@@ -0,0 +1,140 @@
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence
+
+import joblib
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger("al_engine")
+
+
+class ModelRegistry:
+    """
+    Local store of trained models at {folder_path}/{family}/{architecture}/{key},
+    the key hashing the end of the training window, the feature set, the config
+    the model was trained with and, when given, the training data itself, so a
+    model is only reused for exactly the training it would be redone with. Keras
+    models are kept whole, optimizer state included, other models are pickled
+    with joblib, and a metadata.json describes every entry
+    """
+
+    def __init__(self, folder_path: str) -> None:
+        self.folder_path = folder_path
+
+    @staticmethod
+    def key(
+        window_end: Any,
+        features: List[str],
+        config: Dict,
+        training_data: Sequence[np.ndarray] = (),
+    ) -> str:
+        key_hash = hashlib.sha256(
+            json.dumps(
+                {
+                    "window_end": _to_date(window_end),
+                    "features": list(features),
+                    "config": config,
+                },
+                sort_keys=True,
+                default=str,
+            ).encode()
+        )
+        for array in training_data:
+            key_hash.update(np.ascontiguousarray(array).tobytes())
+        return key_hash.hexdigest()[:16]
+
+    def _path(self, family: str, architecture: str, key: str) -> str:
+        return f"{self.folder_path}/{family}/{architecture}/{key}"
+
+    def load(
+        self,
+        family: str,
+        architecture: str,
+        window_end: Any,
+        features: List[str],
+        config: Dict,
+        training_data: Sequence[np.ndarray] = (),
+    ) -> Optional[Any]:
+        """
+        The model registered for this training, or None when there is none
+        """
+        path = self._path(
+            family,
+            architecture,
+            self.key(window_end, features, config, training_data),
+        )
+        if not os.path.exists(f"{path}/metadata.json"):
+            logger.debug(f"No registered [{family}/{architecture}] model at [{path}]")
+            return None
+
+        with open(f"{path}/metadata.json", "r") as file:
+            metadata = json.load(file)
+        logger.debug(f"Loading registered [{family}/{architecture}] model at [{path}]")
+        if metadata["format"] == "keras":
+            from keras.models import load_model
+
+            return load_model(f"{path}/model.keras")
+        return joblib.load(f"{path}/model.joblib")
+
+    def save(
+        self,
+        model: Any,
+        family: str,
+        architecture: str,
+        window_end: Any,
+        features: List[str],
+        config: Dict,
+        training_data: Sequence[np.ndarray] = (),
+        metadata: Optional[Dict] = None,
+    ) -> str:
+        """
+        Register a trained model with optional extra metadata, returning its path
+        """
+        key = self.key(window_end, features, config, training_data)
+        path = self._path(family, architecture, key)
+        model_format = "keras" if "keras" in type(model).__module__ else "joblib"
+
+        # written next to its final place and moved in at once, so concurrent
+        # workers and interrupted runs never leave a half written entry behind
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        staging_path = tempfile.mkdtemp(dir=os.path.dirname(path))
+        try:
+            if model_format == "keras":
+                model.save(f"{staging_path}/model.keras")
+            else:
+                joblib.dump(model, f"{staging_path}/model.joblib")
+            with open(f"{staging_path}/metadata.json", "w") as file:
+                json.dump(
+                    {
+                        "family": family,
+                        "architecture": architecture,
+                        "key": key,
+                        "window_end": _to_date(window_end),
+                        "features": list(features),
+                        "config": config,
+                        "format": model_format,
+                        "created": datetime.now().isoformat(),
+                        **(metadata or {}),
+                    },
+                    file,
+                    indent=2,
+                    default=str,
+                )
+        except BaseException:
+            shutil.rmtree(staging_path, ignore_errors=True)
+            raise
+
+        shutil.rmtree(path, ignore_errors=True)
+        os.replace(staging_path, path)
+        logger.debug(f"Registered [{family}/{architecture}] model at [{path}]")
+        return path
+
+
+def _to_date(window_end: Any) -> str:
+    return pd.Timestamp(window_end).date().isoformat()
@@ -0,0 +1,151 @@
+import logging
+import multiprocessing
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, List, Optional, Tuple
+
+import matplotlib.pyplot as plt
+import missingno as msno
+import numpy as np
+import pandas as pd
+import plotly
+import plotly.express as px
+import seaborn as sns
+from matplotlib.figure import Figure
+
+logger = logging.getLogger("al_engine")
+
+PLOT_MODES = ["none", "deferred", "sync"]
+DPI = 300
+
+
+class Plotter:
+    """
+    Run-scoped queue of plot requests. A request is a render function and the
+    data it needs, captured when the request is made; deferred requests are
+    rendered by a background process pool so modules never wait on rasterizing,
+    sync requests are rendered straight away and none skips plotting entirely
+    """
+
+    def __init__(self, mode: str, folder_path: str, max_workers: int = 2) -> None:
+        if mode not in PLOT_MODES:
+            raise NotImplementedError(f"Plot mode [{mode}] is not supported")
+        self.mode = mode
+        self.folder_path = folder_path
+        self.max_workers = max_workers
+        self._pending_plots = []
+        self._executor = None
+
+    def request(self, render: Callable, filename: str, **data) -> None:
+        if self.mode == "none":
+            logger.debug(f"Plotting is switched off, skipping plot [{filename}]")
+            return
+
+        path = f"{self.folder_path}/{filename}"
+        if self.mode == "sync":
+            logger.debug(f"Rendering plot [{filename}] at location [{path}]...")
+            render(path, **data)
+            return
+
+        if self._executor is None:
+            # spawned workers do not inherit the threads of tensorflow or pandas
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        logger.debug(f"Queueing plot [{filename}] to be rendered at [{path}]...")
+        # pickled now, later in place changes to the data do not reach the plot
+        snapshot = pickle.dumps((render, data))
+        self._pending_plots.append(
+            (filename, self._executor.submit(_render_snapshot, path, snapshot))
+        )
+
+    def close(self) -> None:
+        if self._pending_plots:
+            logger.info(f"Waiting for [{len(self._pending_plots)}] queued plots...")
+        pending_plots, self._pending_plots = self._pending_plots, []
+        try:
+            for filename, pending_plot in pending_plots:
+                try:
+                    pending_plot.result()
+                except Exception:
+                    logger.error(f"Rendering plot [{filename}] failed")
+                    raise
+        finally:
+            if self._executor is not None:
+                self._executor.shutdown()
+                self._executor = None
+
+
+def _render_snapshot(path: str, snapshot: bytes) -> None:
+    render, data = pickle.loads(snapshot)
+    render(path, **data)
+
+
+def render_lines(
+    path: str,
+    lines: List[Tuple[np.ndarray, np.ndarray, Optional[str]]],
+    title: Optional[str] = None,
+    xlabel: Optional[str] = None,
+    ylabel: Optional[str] = None,
+    legend: bool = False,
+    figsize: Tuple[float, float] = (6.4, 4.8),
+) -> None:
+    """
+    Line chart of (x, y, label) lines
+    """
+    figure = Figure(figsize=figsize)
+    ax = figure.add_subplot()
+    for x, y, label in lines:
+        ax.plot(x, y, label=label)
+    if legend:
+        ax.legend()
+    if title is not None:
+        ax.set_title(title)
+    if xlabel is not None:
+        ax.set_xlabel(xlabel, fontsize=14)
+    if ylabel is not None:
+        ax.set_ylabel(ylabel, fontsize=14)
+    figure.savefig(path, dpi=DPI)
+
+
+def render_missing_values(path: str, df: pd.DataFrame) -> None:
+    """
+    Nullity matrix of a dataframe
+    """
+    figure = msno.matrix(df).get_figure()
+    figure.savefig(path, dpi=DPI)
+    plt.close(figure)
+
+
+def render_correlation_heatmap(path: str, corr_matrix: pd.DataFrame) -> None:
+    figure = Figure(figsize=(8, 8))
+    ax = figure.add_subplot()
+    ax_heatmap = sns.heatmap(
+        corr_matrix,
+        vmin=-1,
+        vmax=1,
+        center=0,
+        cmap=sns.diverging_palette(20, 170, n=200),
+        square=True,
+        ax=ax,
+    )
+    ax_heatmap.set_xticklabels(
+        ax_heatmap.get_xticklabels(), rotation=90, horizontalalignment="right"
+    )
+    figure.savefig(path, dpi=DPI)
+
+
+def render_facet_lines(path: str, df: pd.DataFrame) -> None:
+    """
+    Interactive html line plot with one facet per column
+    """
+    fig = px.line(
+        df,
+        facet_col="variable",
+        facet_col_wrap=3,
+        width=1000,
+        height=1200,
+        facet_row_spacing=0.02,
+    )
+    plotly.offline.plot(fig, filename=path, auto_open=False)
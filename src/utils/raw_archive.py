@@ -0,0 +1,74 @@
+import getpass
+import io
+import logging
+import os
+import sys
+import threading
+import zipfile
+from typing import Dict
+
+logger = logging.getLogger("al_engine")
+
+
+class RawArchive:
+    """
+    Streams members out of the password protected raw data zip without writing
+    them to disk. Inflated members are kept in memory for the rest of the process
+    keyed by their crc and size, so each member is only decrypted and inflated
+    once per process. Nothing is persisted, so every new run inflates the members
+    it reads again
+    """
+
+    _inflated_members = {}
+    _passwords = {}
+    _lock = threading.Lock()
+
+    def __init__(self, archive_path: str, password_env_var: str) -> None:
+        self.archive_path = archive_path
+        self.password_env_var = password_env_var
+        self._index = None
+
+    def index(self) -> Dict[str, zipfile.ZipInfo]:
+        if self._index is None:
+            logger.debug(f"Reading member index of archive [{self.archive_path}]...")
+            with zipfile.ZipFile(self.archive_path) as archive:
+                self._index = {info.filename: info for info in archive.infolist()}
+        return self._index
+
+    def open(self, member: str) -> io.BytesIO:
+        info = self.index()[member]
+        cache_key = (
+            os.path.abspath(self.archive_path),
+            member,
+            info.CRC,
+            info.file_size,
+        )
+
+        with RawArchive._lock:
+            if cache_key in RawArchive._inflated_members:
+                logger.debug(f"Member [{member}] already inflated in this process")
+                return io.BytesIO(RawArchive._inflated_members[cache_key])
+            password = self._password() if info.flag_bits & 0x1 else None
+
+        logger.debug(f"Inflating member [{member}] from [{self.archive_path}]...")
+        with zipfile.ZipFile(self.archive_path) as archive:
+            content = archive.read(member, pwd=password)
+
+        with RawArchive._lock:
+            RawArchive._inflated_members[cache_key] = content
+        return io.BytesIO(content)
+
+    def _password(self) -> bytes:
+        if self.archive_path in RawArchive._passwords:
+            return RawArchive._passwords[self.archive_path]
+
+        password = os.environ.get(self.password_env_var)
+        if password is None:
+            if not sys.stdin.isatty():
+                raise RuntimeError(
+                    f"Archive [{self.archive_path}] is password protected, set the [{self.password_env_var}] environment variable"  # noqa
+                )
+            password = getpass.getpass(f"Password for [{self.archive_path}]: ")
+
+        RawArchive._passwords[self.archive_path] = password.encode()
+        return RawArchive._passwords[self.archive_path]
@@ -1,12 +1,20 @@
+import json
 import logging
+import os
 
-import matplotlib.pyplot as plt
 import pandas as pd
 
+from src.utils.loader import Loader
 from src.utils.settings import SETTINGS
 
 logger = logging.getLogger("al_engine")
 
+ARTIFACT_WRITERS = {
+    "parquet": lambda df, path: df.to_parquet(path, index=False),
+    # feather only stores a default index, which it does not write either
+    "feather": lambda df, path: df.reset_index(drop=True).to_feather(path),
+}
+
 
 class Saver:
     def __init__(self) -> None:
@@ -27,17 +35,30 @@ class Saver:
         logger.info("Save successful!")
 
     @staticmethod
-    def save_plots(filename: str, extension: str = ".png"):
-        if filename[-4:] != extension:
-            logger.debug(
-                f"The filename does not contain specified extension, adding {extension}..."
+    def save_artifact(df_to_save: pd.DataFrame, filename: str, type: str = "processed"):
+        """
+        Save a pipeline artifact in the typed columnar format set in config.yaml,
+        with an optional csv export next to it
+        """
+        path = Loader.artifact_path(filename, type)
+        logger.debug(f"Saving artifact at location [{path}]...")
+        ARTIFACT_WRITERS[SETTINGS["artifacts"]["format"]](df_to_save, path)
+        logger.info("Save successful!")
+
+        if SETTINGS["artifacts"]["csv_export"]:
+            logger.debug("CSV export is switched on, exporting artifact as csv...")
+            Saver.save_csv(
+                df_to_save, os.path.splitext(os.path.basename(path))[0], type
             )
-            filename = filename + extension
+
+    @staticmethod
+    def save_json(obj: dict, filename: str, type: str = "processed"):
+        if filename[-5:] != ".json":
+            filename = filename + ".json"
 
         logger.debug(
-            f'Saving file with file name [{filename}] at location [{SETTINGS["run_meta_data"]["run_folder_path"]}/plots]...'
-        )
-        plt.savefig(
-            f'{SETTINGS["run_meta_data"]["run_folder_path"]}/plots/{filename}', dpi=300
+            f"Saving file with file name [{filename}] at location [data/{type}/{filename}]..."
         )
+        with open(f"data/{type}/{filename}", "w") as file:
+            json.dump(obj, file, indent=2)
         logger.info("Save successful!")
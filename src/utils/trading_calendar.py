@@ -0,0 +1,124 @@
+import logging
+from datetime import date
+from typing import Iterable, List, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger("al_engine")
+
+DateLike = Union[str, date, pd.Timestamp, np.datetime64]
+
+
+class TradingCalendar:
+    """
+    Trading days of the exchange, made of the observed settlement dates and
+    projected past the last of them as weekdays outside the holiday list.
+    Trading days are addressed by ordinal, their position among the observed
+    dates, and all lookups are binary searches over the sorted dates
+    """
+
+    def __init__(
+        self, trading_dates: Iterable[DateLike], holidays: Iterable[DateLike] = ()
+    ) -> None:
+        self.dates = np.unique(
+            pd.to_datetime(pd.Series(list(trading_dates), dtype=object))
+            .to_numpy()
+            .astype("datetime64[D]")
+        )
+        self.holidays = np.unique(
+            pd.to_datetime(pd.Series(list(holidays), dtype=object))
+            .to_numpy()
+            .astype("datetime64[D]")
+        )
+
+    def __len__(self) -> int:
+        return len(self.dates)
+
+    def ordinal(self, dates: DateLike) -> Union[int, np.ndarray]:
+        """
+        Ordinal of the first trading day on or after each date
+        """
+        return np.searchsorted(self.dates, _to_days(dates), side="left")
+
+    def ordinal_of(self, value: Union[int, DateLike]) -> int:
+        """
+        Take an ordinal as it is and a date as the ordinal of the first trading
+        day on or after it, so settings can give either
+        """
+        if isinstance(value, (int, np.integer)):
+            return int(value)
+        return int(self.ordinal(value))
+
+    def date(self, ordinals: Union[int, np.ndarray]) -> Union[pd.Timestamp, np.ndarray]:
+        dates = self.dates[ordinals].astype("datetime64[ns]")
+        return pd.Timestamp(dates) if np.ndim(dates) == 0 else dates
+
+    def is_trading_day(self, dates: DateLike) -> Union[bool, np.ndarray]:
+        days = _to_days(dates)
+        ordinals = np.minimum(
+            np.searchsorted(self.dates, days), max(len(self.dates) - 1, 0)
+        )
+        return (len(self.dates) > 0) & (self.dates[ordinals] == days)
+
+    def period_range(self, start: DateLike, end: DateLike) -> Tuple[int, int]:
+        """
+        Ordinals [first, last + 1) of the trading days between start and end
+        inclusive, to slice rows aligned on the calendar with
+        """
+        return (
+            int(np.searchsorted(self.dates, _to_days(start), side="left")),
+            int(np.searchsorted(self.dates, _to_days(end), side="right")),
+        )
+
+    def month_ranges(self) -> pd.DataFrame:
+        """
+        MONTH, START and END ordinals of every calendar month with trading days
+        """
+        months = self.dates.astype("datetime64[M]")
+        month_starts = np.flatnonzero(np.append(True, months[1:] != months[:-1]))
+        return pd.DataFrame(
+            {
+                "MONTH": pd.PeriodIndex(
+                    months[month_starts].astype("datetime64[ns]"), freq="M"
+                ),
+                "START": month_starts,
+                "END": np.append(month_starts[1:], len(self.dates)),
+            }
+        )
+
+    def next_trading_days(self, after: DateLike, n: int) -> List[pd.Timestamp]:
+        """
+        The n trading days after a date, observed ones first and projected ones
+        past the last observed date
+        """
+        first = np.searchsorted(self.dates, _to_days(after), side="right")
+        observed = list(self.dates[first : first + n])
+        if len(observed) < n:
+            start = self.dates[-1] if len(self.dates) else _to_days(after)
+            start = max(start, _to_days(after))
+            # a start on a weekend or holiday counts from the trading day before
+            # it, rolling it forward would skip the first trading day after it
+            projected = np.busday_offset(
+                start,
+                np.arange(1, n - len(observed) + 1),
+                roll="backward",
+                holidays=self.holidays,
+            )
+            observed.extend(projected)
+        return [pd.Timestamp(day) for day in observed]
+
+    def expected_trading_days(self, start: DateLike, end: DateLike) -> List[date]:
+        """
+        Weekdays outside the holiday list between start and end inclusive, the
+        days the exchange is expected to publish settlement prices for
+        """
+        days = np.arange(_to_days(start), _to_days(end) + 1)
+        days = days[np.is_busday(days, holidays=self.holidays)]
+        return [day.astype(object) for day in days]
+
+
+def _to_days(dates: DateLike) -> Union[np.datetime64, np.ndarray]:
+    if np.ndim(dates) == 0:
+        return np.datetime64(pd.Timestamp(dates).date(), "D")
+    return pd.to_datetime(np.asarray(dates)).to_numpy().astype("datetime64[D]")
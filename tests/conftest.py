@@ -0,0 +1,21 @@
+import pytest
+
+from src.utils.settings import SETTINGS
+
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    """
+    An empty data folder to run modules in, with the run metadata the pipeline
+    context expects and plots turned off
+    """
+    for folder in ["raw", "processed", "modelling"]:
+        (tmp_path / "data" / folder).mkdir(parents=True)
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setitem(
+        SETTINGS,
+        "run_meta_data",
+        {"run_id": "test", "start_time": "test", "run_folder_path": str(tmp_path)},
+    )
+    monkeypatch.setitem(SETTINGS["plots"], "mode", "none")
+    return tmp_path
@@ -0,0 +1,47 @@
+import numpy as np
+import pandas as pd
+import pandas.testing as pdt
+import pyarrow.parquet as pq
+import pytest
+from pyarrow import feather
+
+from src.utils.loader import Loader
+from src.utils.saver import Saver
+from src.utils.settings import SETTINGS
+
+
+def _artifact():
+    return pd.DataFrame(
+        {
+            "DATE": pd.bdate_range("2020-01-01", periods=5),
+            "AL_PRICE": np.linspace(15000.0, 15400.0, 5),
+        }
+    )
+
+
+@pytest.mark.parametrize(
+    "artifact_format, read_file",
+    [("parquet", pq.read_table), ("feather", feather.read_table)],
+)
+def test_artifacts_are_written_in_the_configured_format(
+    workdir, monkeypatch, artifact_format, read_file
+):
+    monkeypatch.setitem(SETTINGS["artifacts"], "format", artifact_format)
+    Saver.save_artifact(_artifact(), "cleaned_data")
+
+    path = f"data/processed/cleaned_data.{artifact_format}"
+    assert Loader.artifact_path("cleaned_data") == path
+    pdt.assert_frame_equal(read_file(path).to_pandas(), _artifact())
+    pdt.assert_frame_equal(
+        Loader.load_artifact("cleaned_data", columns=["AL_PRICE"]),
+        _artifact()[["AL_PRICE"]],
+    )
+
+
+def test_unknown_artifact_format_is_rejected(workdir, monkeypatch):
+    monkeypatch.setitem(SETTINGS["artifacts"], "format", "hdf")
+
+    with pytest.raises(NotImplementedError, match="hdf"):
+        Saver.save_artifact(_artifact(), "cleaned_data")
+    with pytest.raises(NotImplementedError, match="hdf"):
+        Loader.load_artifact("cleaned_data")
@@ -0,0 +1,63 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.modules.data_processing.as_of_join import AsOfJoiner
+
+
+def _days(dates):
+    return pd.to_datetime(pd.Series(dates)).to_numpy().astype("datetime64[D]")
+
+
+@pytest.mark.parametrize("tolerance_days", [None, 3])
+def test_backward_match_never_takes_a_later_row(tolerance_days):
+    rng = np.random.default_rng(0)
+    base_dates = pd.bdate_range("2022-01-03", periods=300)
+    source_dates = pd.DatetimeIndex(
+        rng.choice(pd.date_range("2021-12-01", "2023-03-31"), 150, replace=False)
+    )
+    # shuffled, with each value being the day number of its own date
+    source = pd.DataFrame(
+        {"DATE": source_dates, "VALUE": _days(source_dates).astype(np.int64)}
+    )
+
+    joiner = AsOfJoiner(pd.DataFrame({"DATE": base_dates}))
+    joiner.add_source(source, match="backward", tolerance_days=tolerance_days)
+    aligned = joiner.align()
+
+    base_days = _days(base_dates).astype(np.int64)
+    sorted_source_days = np.sort(source["VALUE"].to_numpy())
+    latest = sorted_source_days[
+        np.searchsorted(sorted_source_days, base_days, side="right") - 1
+    ]
+    is_expected = latest >= sorted_source_days[0]
+    if tolerance_days is not None:
+        is_expected &= base_days - latest <= tolerance_days
+    matched = aligned["VALUE"].notnull().to_numpy()
+
+    assert (aligned["VALUE"][matched] <= base_days[matched]).all()
+    np.testing.assert_array_equal(matched, is_expected)
+    np.testing.assert_array_equal(aligned["VALUE"][matched], latest[matched])
+
+
+def test_exact_match_and_duplicated_dates():
+    base = pd.DataFrame(
+        {"DATE": pd.to_datetime(["2023-01-03", "2023-01-04", "2023-01-05"])},
+        index=[13, 14, 15],
+    )
+    source = pd.DataFrame(
+        {
+            "DATE": pd.to_datetime(
+                ["2023-01-05", "2023-01-03", "2023-01-03", "2023-01-06"]
+            ),
+            "VALUE": [3.0, 1.0, 2.0, 4.0],
+        }
+    )
+
+    joiner = AsOfJoiner(base)
+    joiner.add_source(source, match="exact")
+    aligned = joiner.align()
+
+    # the last of duplicated dates wins, a later date is never taken
+    assert aligned.index.tolist() == [13, 14, 15]
+    np.testing.assert_array_equal(aligned["VALUE"], [2.0, np.nan, 3.0])
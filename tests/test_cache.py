@@ -0,0 +1,113 @@
+import os
+
+import pytest
+
+from src.modules.data_processing.cleaning_engineering import CleanEngineer
+from src.modules.model.linear_walk_forward import LinearWalkForward
+from src.utils.cache import ExecutionCache
+from src.utils.settings import SETTINGS
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _relative_code_files(module):
+    return [
+        os.path.relpath(path, REPO_ROOT) for path in ExecutionCache._code_files(module)
+    ]
+
+
+@pytest.mark.parametrize(
+    "module, helpers",
+    [
+        (
+            CleanEngineer,
+            [
+                "src/modules/data_processing/indicators.py",
+                "src/modules/data_processing/as_of_join.py",
+                "src/modules/data_processing/continuous_contract.py",
+                "src/utils/raw_archive.py",
+            ],
+        ),
+        (
+            LinearWalkForward,
+            [
+                "src/modules/model/recursive_least_squares.py",
+                "src/modules/data_processing/prepare_training.py",
+                "src/utils/trading_calendar.py",
+            ],
+        ),
+    ],
+)
+def test_code_files_follow_src_imports(module, helpers):
+    code_files = _relative_code_files(module())
+
+    assert set(helpers) <= set(code_files)
+    assert all(path.startswith("src/") for path in code_files)
+
+
+def test_changed_helper_module_is_a_cache_miss(workdir, monkeypatch):
+    monkeypatch.setitem(
+        SETTINGS["execution_cache"], "folder_path", str(workdir / "cache")
+    )
+    helper = workdir / "helper.py"
+    helper.write_text("SCALE = 1\n")
+    module = LinearWalkForward()
+    module.input_files = []
+    module.output_files = [str(workdir / "output.csv")]
+    (workdir / "output.csv").write_text("")
+    code_files = ExecutionCache._code_files(module) + [str(helper)]
+    monkeypatch.setattr(
+        ExecutionCache, "_code_files", staticmethod(lambda module: code_files)
+    )
+
+    cache = ExecutionCache()
+    cache.record(module)
+    assert cache.is_valid(module, [])
+
+    helper.write_text("SCALE = 2\n")
+    is_hit, reason = cache._check(module, set())
+    assert not is_hit
+    assert "src module it imports changed" in reason
+
+
+def test_changed_nested_config_key_is_a_cache_miss(workdir, monkeypatch):
+    monkeypatch.setitem(
+        SETTINGS["execution_cache"], "folder_path", str(workdir / "cache")
+    )
+    monkeypatch.setitem(
+        SETTINGS["trading_calendar"],
+        "holidays",
+        list(SETTINGS["trading_calendar"]["holidays"]),
+    )
+    monkeypatch.setitem(
+        SETTINGS["model"], "network_model", dict(SETTINGS["model"]["network_model"])
+    )
+    module = LinearWalkForward()
+    module.input_files = []
+    module.output_files = [str(workdir / "output.csv")]
+    (workdir / "output.csv").write_text("")
+
+    cache = ExecutionCache()
+    cache.record(module)
+
+    # a key next to the declared model.network_model ones is not part of the fingerprint
+    SETTINGS["model"]["network_model"]["lookback"] += 1
+    assert cache._check(module, set())[0]
+
+    SETTINGS["model"]["network_model"]["start_cut_off_trading_day"] += 1
+    is_hit, reason = cache._check(module, set())
+    assert not is_hit
+    assert "config keys" in reason
+
+    SETTINGS["model"]["network_model"]["start_cut_off_trading_day"] -= 1
+    SETTINGS["trading_calendar"]["holidays"].append("2023-12-29")
+    is_hit, reason = cache._check(module, set())
+    assert not is_hit
+    assert "config keys" in reason
+
+
+def test_neural_network_declares_the_trading_calendar():
+    pytest.importorskip("tensorflow")
+    from src.modules.model.neural_network import NeuralNetworkModel
+
+    assert "trading_calendar.holidays" in NeuralNetworkModel().config_keys
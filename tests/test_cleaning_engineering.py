@@ -0,0 +1,158 @@
+import numpy as np
+import pandas as pd
+import pandas.testing as pdt
+import pytest
+
+from src.modules.data_processing.cleaning_engineering import CleanEngineer
+from src.utils.context import PipelineContext
+from src.utils.settings import SETTINGS
+
+INDICATORS = [
+    {"name": "rsi", "column": "AL_PRICE", "output": "RSI", "period": 14},
+    {"name": "bollinger", "column": "AL_PRICE", "output": "AL_BOLLINGER"},
+    {"name": "volatility", "column": "AL_PRICE", "output": "AL_ROLLING_VOL"},
+]
+
+
+def _raw_tables():
+    """
+    Synthetic raw files of every registered source, keyed by file name, with
+    their DATE column still to be written in each file's own format
+    """
+    rng = np.random.default_rng(0)
+    calendar = pd.date_range("2021-05-01", "2023-05-31")
+    weekdays = calendar[calendar.dayofweek < 5]
+    fridays = calendar[calendar.dayofweek == 4]
+    oil_days = calendar[rng.random(len(calendar)) > 0.3]
+    acc_days = weekdays[rng.random(len(weekdays)) > 0.1]
+    months = pd.date_range("2021-05-01", "2023-01-01", freq="MS")
+
+    def series(dates, scale=1.0):
+        return np.round(100 + np.cumsum(rng.normal(size=len(dates))) * scale, 4)
+
+    futures = []
+    trading_days = pd.bdate_range("2021-06-01", "2023-04-28")
+    for metal in ["al", "cu"]:
+        for delivery in pd.date_range("2021-07-15", "2023-06-15", freq="MS"):
+            quoted_days = trading_days[
+                (trading_days > delivery - pd.DateOffset(months=2))
+                & (trading_days <= delivery + pd.Timedelta(days=14))
+            ]
+            futures.append(
+                pd.DataFrame(
+                    {
+                        "DATE": quoted_days,
+                        "INSTRUMENTID": f"{metal}{delivery:%y%m}",
+                        "SETTLEMENTPRICE": np.round(
+                            15000 + rng.normal(size=len(quoted_days)) * 100
+                        ),
+                        "VOLUME": 1,
+                        "OPENINTEREST": 1,
+                    }
+                )
+            )
+    london_prices = series(weekdays, 5) + 2000
+
+    return {
+        "futures prices.csv": pd.concat(futures, ignore_index=True),
+        "crude oil price.csv": pd.DataFrame(
+            {"DATE": oil_days, " value": series(oil_days)}
+        ),
+        "Coal_05_19_23-04_02_13.csv": pd.DataFrame(
+            {"DATE": weekdays, "Close": series(weekdays)}
+        ),
+        "ccfi.csv": pd.DataFrame({"DATE": fridays, "ccfi_index": series(fridays)}),
+        "scfi.csv": pd.DataFrame({"DATE": fridays, "scfi_index": series(fridays)}),
+        "us-dollar-yuan-exchange-rate-historical-chart.csv": pd.DataFrame(
+            {"DATE": weekdays, " value": series(weekdays, 0.01)}
+        ),
+        "australian-us-dollar-exchange-rate-historical-chart.csv": pd.DataFrame(
+            {"DATE": weekdays, " value": series(weekdays, 0.01)}
+        ),
+        "London Aluminium Historical Data.csv": pd.DataFrame(
+            {
+                "DATE": weekdays,
+                "Price": [f"{price:,.2f}" for price in london_prices],
+                "Vol.": [f"{volume:.2f}K" for volume in rng.random(len(weekdays))],
+            }
+        ),
+        "industrial-production-historical-chart.csv": pd.DataFrame(
+            {"DATE": months, " value": series(months)}
+        ),
+        "AL_corporation_of_china.csv": pd.DataFrame(
+            {
+                "DATE": acc_days,
+                "    Open": series(acc_days, 0.1) + 5,
+                "    Close": series(acc_days, 0.1) + 5,
+                "    Volume": rng.integers(1000, 9000, len(acc_days)).astype(float),
+            }
+        ),
+    }
+
+
+def _write_raw_data(end_date):
+    """
+    Write the synthetic raw files up to end_date in the format their registry
+    entries read
+    """
+    raw_data_settings = SETTINGS["preprocess"]["raw_data"]
+    date_formats = {
+        source["file"]: (source["date_column"], source["date_format"])
+        for source in raw_data_settings["sources"].values()
+        if "file" in source
+    }
+    date_formats[SETTINGS["preprocess"]["futures"]["file"]] = ("date", "%d/%m/%Y")
+
+    for file_name, raw_table in _raw_tables().items():
+        date_column, date_format = date_formats[file_name]
+        raw_table = raw_table[raw_table["DATE"] <= end_date]
+        raw_table.insert(0, date_column, raw_table.pop("DATE").dt.strftime(date_format))
+        with open(f"{raw_data_settings['folder_path']}/{file_name}", "w") as file:
+            if file_name == "AL_corporation_of_china.csv":
+                file.write("exported prices\n")
+            raw_table.to_csv(file, index=False)
+
+
+def _run_cleaning():
+    context = PipelineContext()
+    CleanEngineer()._run(context)
+    artifacts = {
+        name: context.consume(name, "processed")
+        for name in ["aligned_raw_data", "cleaned_data"]
+    }
+    context.close()
+    return artifacts
+
+
+@pytest.fixture
+def cleaning_settings(workdir, monkeypatch):
+    monkeypatch.setitem(SETTINGS["preprocess"]["raw_data"], "archive", None)
+    monkeypatch.setitem(SETTINGS["preprocess"]["cleaning"], "indicators", INDICATORS)
+    monkeypatch.setitem(SETTINGS["preprocess"]["cleaning"], "mode", "full")
+    return SETTINGS["preprocess"]["cleaning"]
+
+
+def test_append_matches_full_rebuild(cleaning_settings, monkeypatch):
+    _write_raw_data("2023-03-15")
+    previous = _run_cleaning()
+
+    _write_raw_data("2023-04-28")
+    monkeypatch.setitem(cleaning_settings, "mode", "append")
+    appended = _run_cleaning()
+    monkeypatch.setitem(cleaning_settings, "mode", "full")
+    rebuilt = _run_cleaning()
+
+    assert len(appended["cleaned_data"]) > len(previous["cleaned_data"])
+    for name, artifact in rebuilt.items():
+        pdt.assert_frame_equal(appended[name], artifact, check_exact=True)
+
+
+def test_append_without_previous_data_rebuilds(cleaning_settings, monkeypatch):
+    _write_raw_data("2023-04-28")
+    monkeypatch.setitem(cleaning_settings, "mode", "append")
+    appended = _run_cleaning()
+    monkeypatch.setitem(cleaning_settings, "mode", "full")
+    rebuilt = _run_cleaning()
+
+    for name, artifact in rebuilt.items():
+        pdt.assert_frame_equal(appended[name], artifact, check_exact=True)
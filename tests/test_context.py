@@ -0,0 +1,51 @@
+import numpy as np
+import pandas as pd
+import pandas.testing as pdt
+
+from src.modules.data_processing.scaling import Scaling
+from src.utils.context import PipelineContext
+from src.utils.loader import Loader
+
+
+def _cleaned_data():
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame(
+        {
+            "DATE": pd.bdate_range("2020-01-01", periods=40),
+            "AL_PRICE": rng.normal(15000, 300, 40),
+            "AL_VOLATILITY": rng.normal(0, 1, 40),
+        }
+    )
+    # as left by dropping the indicator warm-up rows, without a 0-based index
+    return df.iloc[13:]
+
+
+def test_published_artifact_matches_disk_round_trip(workdir):
+    context = PipelineContext()
+    context.publish("cleaned_data", _cleaned_data())
+    in_memory = context.consume("cleaned_data")
+    context.close()
+
+    pdt.assert_frame_equal(in_memory, Loader.load_artifact("cleaned_data"))
+
+
+def test_scaling_from_memory_and_from_disk_are_identical(workdir):
+    cleaned_data = _cleaned_data()
+
+    context = PipelineContext()
+    context.publish("cleaned_data", cleaned_data)
+    Scaling()._run(context)
+    from_memory = context.consume("scaled_cleaned_data")
+    context.close()
+
+    # a new run reads cleaned_data back from disk
+    context = PipelineContext()
+    Scaling()._run(context)
+    from_disk = context.consume("scaled_cleaned_data")
+    context.close()
+
+    pdt.assert_frame_equal(from_memory, from_disk)
+    pdt.assert_frame_equal(from_memory, Loader.load_artifact("scaled_cleaned_data"))
+    np.testing.assert_array_equal(
+        from_memory["DATE"].to_numpy(), cleaned_data["DATE"].to_numpy()
+    )
@@ -0,0 +1,128 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.modules.data_processing.continuous_contract import build_continuous_series
+
+DAYS = pd.bdate_range("2023-01-02", "2023-03-31")
+DELIVERY_MONTHS = ["2023-02", "2023-03", "2023-04"]
+
+
+def _contract_month(month):
+    period = pd.Period(month, "M")
+    return (period.year - 1970) * 12 + period.month - 1
+
+
+def _base_price():
+    return 18000 + 50 * np.sin(np.arange(len(DAYS)) / 5)
+
+
+def _futures(price_of_contract, volume_of_contract=None):
+    """
+    Quotes of the al contracts for every day up to the end of their delivery
+    month, priced from the base price by the index of the contract
+    """
+    quotes = []
+    base_price = _base_price()
+    for index, month in enumerate(DELIVERY_MONTHS):
+        quoted = DAYS <= pd.Period(month, "M").end_time
+        quotes.append(
+            pd.DataFrame(
+                {
+                    "PRODUCT": "al",
+                    "DATE": DAYS[quoted],
+                    "CONTRACT_MONTH": float(_contract_month(month)),
+                    "SETTLEMENTPRICE": price_of_contract(base_price[quoted], index),
+                    "VOLUME": (
+                        volume_of_contract(DAYS[quoted], index)
+                        if volume_of_contract
+                        else 1.0
+                    ),
+                }
+            )
+        )
+    return pd.concat(quotes, ignore_index=True)
+
+
+def _contract_by_day(series):
+    months = {_contract_month(month): month for month in DELIVERY_MONTHS}
+    return pd.Series(
+        [months[contract] for contract in series["CONTRACT_MONTH"]],
+        index=series["DATE"],
+    )
+
+
+def _spread(base_price, index):
+    return base_price + 100 * index
+
+
+def test_fixed_day_holds_a_contract_until_the_roll_day():
+    series = build_continuous_series(_futures(_spread), "fixed_day", roll_day=15)
+
+    assert series["DATE"].tolist() == DAYS.tolist()
+    contract_by_day = _contract_by_day(series)
+    assert contract_by_day["2023-02-15"] == "2023-02"
+    assert contract_by_day["2023-02-16"] == "2023-03"
+    assert contract_by_day["2023-03-15"] == "2023-03"
+    assert contract_by_day["2023-03-16"] == "2023-04"
+    # held contracts only ever move forward
+    assert (np.diff(series["CONTRACT_MONTH"]) >= 0).all()
+
+
+def test_most_active_contract_never_rolls_back():
+    def volume(days, index):
+        # February is the busiest before 2023-02-06 and March after, April only
+        # on 2023-03-01
+        volume = np.where(
+            days < pd.Timestamp("2023-02-06"),
+            [3.0, 0.0, 0.0][index],
+            [4.0, 10.0, 5.0][index],
+        )
+        if index == 2:
+            volume[days == pd.Timestamp("2023-03-01")] = 100.0
+        return volume
+
+    series = build_continuous_series(_futures(_spread, volume), "volume")
+
+    contract_by_day = _contract_by_day(series)
+    assert contract_by_day["2023-02-03"] == "2023-02"
+    assert contract_by_day["2023-02-06"] == "2023-03"
+    assert contract_by_day["2023-02-28"] == "2023-03"
+    # the March contract is busier again afterwards, but the series stays on April
+    assert (contract_by_day["2023-03-01":] == "2023-04").all()
+
+
+@pytest.mark.parametrize(
+    "back_adjustment, price_of_contract, change",
+    [
+        ("difference", _spread, np.diff),
+        (
+            "ratio",
+            lambda base_price, index: base_price * (1 + 0.01 * index),
+            lambda prices: prices[1:] / prices[:-1],
+        ),
+    ],
+)
+def test_back_adjusted_series_has_no_gap_at_the_rolls(
+    back_adjustment, price_of_contract, change
+):
+    futures = _futures(price_of_contract)
+    unadjusted = build_continuous_series(futures, "fixed_day", roll_day=15)
+    adjusted = build_continuous_series(
+        futures, "fixed_day", roll_day=15, back_adjustment=back_adjustment
+    )
+
+    # every contract moves with the base price, as the adjusted series does
+    # on roll days as well
+    assert (np.diff(unadjusted["CONTRACT_MONTH"]) > 0).sum() == 2
+    np.testing.assert_allclose(
+        change(adjusted["SETTLEMENTPRICE"].to_numpy()),
+        change(_base_price()),
+        rtol=1e-12,
+    )
+    # the latest contract's prices are left as they are
+    is_latest = adjusted["DATE"] >= pd.Timestamp("2023-03-16")
+    np.testing.assert_array_equal(
+        adjusted["SETTLEMENTPRICE"][is_latest],
+        unadjusted["SETTLEMENTPRICE"][is_latest],
+    )
@@ -0,0 +1,122 @@
+import numpy as np
+import pandas as pd
+import pandas.testing as pdt
+import pytest
+
+from src.modules.data_processing.differencing import Differencing
+from src.modules.data_processing.differencing_engine import (
+    difference,
+    fractional_difference,
+    fractional_integrate,
+    integrate,
+)
+from src.utils.context import PipelineContext
+from src.utils.settings import SETTINGS
+
+
+def _random_walk(num_rows=200, num_columns=3):
+    rng = np.random.default_rng(0)
+    return 15000 + np.cumsum(rng.normal(size=(num_rows, num_columns)), axis=0)
+
+
+@pytest.mark.parametrize("order, lag", [(1, 1), (2, 1), (3, 1), (1, 5), (2, 5)])
+def test_integrate_inverts_difference(order, lag):
+    values = _random_walk()
+    differences = difference(values, order, lag)
+
+    assert np.isnan(differences[: order * lag]).all()
+    assert not np.isnan(differences[order * lag :]).any()
+    for history_rows in [order * lag, 50]:
+        np.testing.assert_allclose(
+            integrate(differences[history_rows:], values[:history_rows], order, lag),
+            values[history_rows:],
+            rtol=1e-12,
+        )
+
+
+def test_integrate_inverts_difference_after_a_nan_prefix():
+    values = _random_walk()
+    values[:7, 1] = np.nan
+    order, lag = 2, 1
+    differences = difference(values, order, lag)
+
+    np.testing.assert_array_equal(
+        np.flatnonzero(np.isnan(differences[:, 1])), np.arange(7 + order * lag)
+    )
+    np.testing.assert_allclose(
+        integrate(differences[9:], values[:9], order, lag), values[9:], rtol=1e-12
+    )
+
+
+def test_integrate_needs_enough_history():
+    with pytest.raises(ValueError):
+        integrate(np.zeros(3), np.zeros(3), order=2, lag=2)
+
+
+@pytest.mark.parametrize("d", [0.2, 0.4, 1.0])
+def test_fractional_integrate_inverts_fractional_difference(d):
+    values = _random_walk()
+    window = 20
+    differences = fractional_difference(values, d, window)
+
+    assert np.isnan(differences[: window - 1]).all()
+    np.testing.assert_allclose(
+        fractional_integrate(differences[window:], values[:window], d, window),
+        values[window:],
+        rtol=1e-12,
+    )
+
+
+def test_fractional_difference_sweeps_every_d_at_once():
+    values = _random_walk()
+    swept = fractional_difference(values, [0.2, 0.4], 20)
+
+    for index, d in enumerate([0.2, 0.4]):
+        np.testing.assert_allclose(
+            swept[..., index], fractional_difference(values, d, 20), rtol=1e-12
+        )
+
+
+def test_differencing_appends_other_columns_by_position(workdir, monkeypatch):
+    rng = np.random.default_rng(0)
+    cleaned_data = pd.DataFrame(
+        {
+            "DATE": pd.bdate_range("2020-01-01", periods=30),
+            "AL_PRICE": 15000 + np.cumsum(rng.normal(size=30)),
+            "OIL_PRICE": 80 + np.cumsum(rng.normal(size=30)),
+            "AL_VOLATILITY": rng.normal(size=30),
+        },
+        # as left by dropping the indicator warm-up rows
+        index=np.arange(13, 43),
+    )
+    cleaned_data.loc[13:15, "OIL_PRICE"] = np.nan
+    monkeypatch.setitem(
+        SETTINGS["preprocess"],
+        "differencing",
+        dict(
+            SETTINGS["preprocess"]["differencing"],
+            method="integer",
+            order=1,
+            lag=1,
+            columns=["AL_PRICE", "OIL_PRICE"],
+            append_columns=["AL_VOLATILITY", "DATE"],
+        ),
+    )
+
+    context = PipelineContext()
+    context.publish("cleaned_data", cleaned_data)
+    Differencing()._run(context)
+    differenced = context.consume("differenced_scaled_cleaned_data")
+    context.close()
+
+    # the first row has no difference, OIL_PRICE none before its fourth
+    expected_rows = cleaned_data.iloc[4:].reset_index(drop=True)
+    pdt.assert_series_equal(differenced["DATE"], expected_rows["DATE"])
+    pdt.assert_series_equal(
+        differenced["AL_VOLATILITY"], expected_rows["AL_VOLATILITY"]
+    )
+    np.testing.assert_allclose(
+        differenced["AL_PRICE"],
+        np.diff(cleaned_data["AL_PRICE"].to_numpy())[3:],
+        rtol=1e-12,
+    )
@@ -0,0 +1,34 @@
+import pandas as pd
+
+from src.modules.data_processing.futures_prices import read_futures_prices
+
+
+def _write_futures(path, days, settlement_price):
+    pd.DataFrame(
+        {
+            "date": [day for day in days for _ in range(2)],
+            "INSTRUMENTID": ["al2301", "cu2301"] * len(days),
+            "SETTLEMENTPRICE": settlement_price,
+        }
+    ).to_csv(path, index=False)
+
+
+def test_scraped_days_replace_the_same_days(tmp_path):
+    _write_futures(tmp_path / "futures.csv", ["02/01/2023", "03/01/2023"], 1.0)
+    _write_futures(tmp_path / "scraped.csv", ["03/01/2023", "04/01/2023"], 2.0)
+
+    futures = read_futures_prices(
+        str(tmp_path / "futures.csv"), scraped_file_path=str(tmp_path / "scraped.csv")
+    )
+
+    prices = futures.groupby("DATE")["SETTLEMENTPRICE"].agg(["min", "max", "size"])
+    assert prices.index.strftime("%Y-%m-%d").tolist() == [
+        "2023-01-02",
+        "2023-01-03",
+        "2023-01-04",
+    ]
+    assert prices["size"].tolist() == [2, 2, 2]
+    assert prices["min"].tolist() == [1.0, 2.0, 2.0]
+    assert prices["max"].tolist() == [1.0, 2.0, 2.0]
+    assert futures["INSTRUMENTID"].dtype == "category"
+    assert futures["PRODUCT"].astype(str).value_counts().to_dict() == {"al": 3, "cu": 3}
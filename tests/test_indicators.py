@@ -0,0 +1,137 @@
+import numpy as np
+import pandas as pd
+import pandas.testing as pdt
+import pytest
+
+from src.modules.data_processing.indicators import (
+    AverageTrueRange,
+    BollingerBands,
+    ExponentialMovingAverage,
+    MovingAverageConvergenceDivergence,
+    RelativeStrengthIndex,
+    RollingVolatility,
+)
+
+INDICATORS = {
+    "rsi_sma": lambda: RelativeStrengthIndex(14, "sma"),
+    "rsi_wilder": lambda: RelativeStrengthIndex(14, "wilder"),
+    "ema": lambda: ExponentialMovingAverage(20),
+    "macd": lambda: MovingAverageConvergenceDivergence(12, 26, 9),
+    "bollinger": lambda: BollingerBands(20, 2),
+    "volatility": lambda: RollingVolatility(22),
+    "atr": lambda: AverageTrueRange(14),
+}
+
+
+def _prices(num_rows=300, seed=0):
+    rng = np.random.default_rng(seed)
+    close = pd.Series(15000 + np.cumsum(rng.normal(0, 100, num_rows)))
+    # flat days, where gains and losses are both 0
+    close.iloc[5:10] = close.iloc[5]
+    high = close + rng.uniform(0, 80, num_rows)
+    low = close - rng.uniform(0, 80, num_rows)
+    return close, high, low
+
+
+def _streamed(indicator, close, high=None, low=None):
+    rows = [
+        indicator.update(
+            close.iloc[row],
+            None if high is None else high.iloc[row],
+            None if low is None else low.iloc[row],
+        )
+        for row in range(len(close))
+    ]
+    return pd.DataFrame(rows, index=close.index, columns=indicator.outputs)
+
+
+def _calculate_rsi(prices, period=14):
+    # the RSI of the cleaned table before the indicator library
+    delta = prices.diff()
+    gains = delta.where(delta > 0, 0)
+    losses = -delta.where(delta < 0, 0)
+    avg_gain = gains.rolling(window=period).mean()
+    avg_loss = losses.rolling(window=period).mean()
+    rs = avg_gain / avg_loss
+    return 100 - (100 / (1 + rs))
+
+
+@pytest.mark.parametrize("name", INDICATORS)
+@pytest.mark.parametrize("num_rows", [300, 10])
+def test_update_matches_batch(name, num_rows):
+    close, _, _ = _prices(num_rows)
+    batch = INDICATORS[name]().batch(close)
+    streamed = _streamed(INDICATORS[name](), close)
+
+    # the same warm-up rows are NaN on both paths
+    pdt.assert_frame_equal(streamed.isna(), batch.isna())
+    np.testing.assert_allclose(streamed, batch, rtol=1e-9, atol=1e-9)
+
+
+def test_atr_with_high_and_low_update_matches_batch():
+    close, high, low = _prices()
+    batch = AverageTrueRange(14).batch(close, high, low)
+    streamed = _streamed(AverageTrueRange(14), close, high, low)
+
+    pdt.assert_frame_equal(streamed.isna(), batch.isna())
+    np.testing.assert_allclose(streamed, batch, rtol=1e-9, atol=1e-9)
+    assert not np.allclose(batch[""][15:], AverageTrueRange(14).batch(close)[""][15:])
+
+
+@pytest.mark.parametrize(
+    "name, first_value_row",
+    [
+        ("rsi_sma", 13),
+        ("rsi_wilder", 14),
+        ("ema", 0),
+        ("macd", 0),
+        ("bollinger", 19),
+        ("volatility", 22),
+        ("atr", 14),
+    ],
+)
+def test_warmup_rows_are_nan(name, first_value_row):
+    close, _, _ = _prices()
+    batch = INDICATORS[name]().batch(close)
+
+    assert batch.iloc[:first_value_row].isna().all().all()
+    assert batch.iloc[first_value_row:].notna().all().all()
+
+
+@pytest.mark.parametrize("name", ["rsi_sma", "bollinger", "volatility"])
+def test_warmup_rows_reproduce_a_value_from_scratch(name):
+    close, _, _ = _prices()
+    batch = INDICATORS[name]().batch(close)
+    warmup_rows = INDICATORS[name]().warmup_rows
+
+    for row in [warmup_rows, 100, len(close) - 1]:
+        from_scratch = INDICATORS[name]().batch(close.iloc[row - warmup_rows : row + 1])
+        np.testing.assert_allclose(
+            from_scratch.iloc[-1], batch.iloc[row], rtol=1e-9, atol=1e-9
+        )
+
+
+def test_rsi_matches_the_previous_cleaned_table_rsi():
+    close, _, _ = _prices()
+    expected = _calculate_rsi(close, 14)
+
+    pdt.assert_series_equal(
+        RelativeStrengthIndex(14, "sma").batch(close)[""], expected, check_names=False
+    )
+    np.testing.assert_allclose(
+        _streamed(RelativeStrengthIndex(14, "sma"), close)[""],
+        expected,
+        rtol=1e-9,
+        atol=1e-9,
+    )
+
+
+@pytest.mark.parametrize("name", INDICATORS)
+def test_update_matches_batch_on_constant_prices(name):
+    # no gains nor losses, RSI being 0 / 0 on both paths
+    close = pd.Series(np.full(60, 15000.0))
+    batch = INDICATORS[name]().batch(close)
+    streamed = _streamed(INDICATORS[name](), close)
+
+    pdt.assert_frame_equal(streamed.isna(), batch.isna())
+    np.testing.assert_allclose(streamed, batch, rtol=1e-9, atol=1e-9)
@@ -0,0 +1,84 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.linear_model import LinearRegression
+
+from src.utils.model_registry import ModelRegistry
+
+FEATURES = ["AL_PRICE", "OIL_PRICE"]
+CONFIG = {"alpha": 1.0, "trading_calendar": {"holidays": ["2023-01-02"]}}
+
+
+def _training_data():
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(50, 2))
+    return X, X @ np.array([1.0, -2.0])
+
+
+def test_key_follows_the_training_data_and_features(tmp_path):
+    registry = ModelRegistry(str(tmp_path))
+    X, y = _training_data()
+    key = registry.key("2023-01-31", FEATURES, CONFIG, (X, y))
+
+    changed_X = X.copy()
+    changed_X[-1, 0] += 1e-9
+    assert registry.key("2023-01-31", FEATURES, CONFIG, (changed_X, y)) != key
+    assert registry.key("2023-01-31", FEATURES, CONFIG, (X[:-1], y[:-1])) != key
+    assert registry.key("2023-01-31", FEATURES[::-1], CONFIG, (X, y)) != key
+    assert registry.key("2023-01-31", FEATURES[:1], CONFIG, (X, y)) != key
+    assert registry.key("2023-02-01", FEATURES, CONFIG, (X, y)) != key
+    changed_config = {"alpha": 1.0, "trading_calendar": {"holidays": []}}
+    assert registry.key("2023-01-31", FEATURES, changed_config, (X, y)) != key
+
+    # equal inputs, however the window end and config are written, share a key
+    same_config = {"trading_calendar": {"holidays": ["2023-01-02"]}, "alpha": 1.0}
+    assert (
+        registry.key(pd.Timestamp("2023-01-31 17:00"), FEATURES, same_config, (X, y))
+        == key
+    )
+    assert registry.key("2023-01-31", FEATURES, CONFIG, (X.copy(), y.copy())) == key
+
+
+def test_save_and_load_round_trip(tmp_path):
+    registry = ModelRegistry(str(tmp_path))
+    X, y = _training_data()
+    args = ("linear", "ols", "2023-01-31", FEATURES, CONFIG, (X, y))
+
+    assert registry.load(*args) is None
+    path = registry.save(LinearRegression().fit(X, y), *args)
+
+    assert path == (
+        f"{tmp_path}/linear/ols/"
+        f"{registry.key('2023-01-31', FEATURES, CONFIG, (X, y))}"
+    )
+    with open(f"{path}/metadata.json") as file:
+        metadata = json.load(file)
+    assert metadata["features"] == FEATURES
+    assert metadata["window_end"] == "2023-01-31"
+    np.testing.assert_allclose(registry.load(*args).coef_, [1.0, -2.0])
+    # a model trained on other data is not found
+    assert registry.load(*args[:-1], (X[:-1], y[:-1])) is None
+
+
+def test_save_replaces_an_entry_atomically(tmp_path):
+    registry = ModelRegistry(str(tmp_path))
+    X, y = _training_data()
+    args = ("linear", "ols", "2023-01-31", FEATURES, CONFIG, (X, y))
+    architecture_path = f"{tmp_path}/linear/ols"
+
+    path = registry.save(LinearRegression().fit(X, y), *args)
+    registry.save(LinearRegression().fit(X, 2 * y), *args)
+
+    # the staging folder was moved in place of the old entry
+    assert os.listdir(architecture_path) == [os.path.basename(path)]
+    np.testing.assert_allclose(registry.load(*args).coef_, [2.0, -4.0])
+
+    # a model that cannot be written leaves the existing entry and no staging
+    # folder behind
+    with pytest.raises(Exception):
+        registry.save(lambda features: features, *args)
+    assert os.listdir(architecture_path) == [os.path.basename(path)]
+    np.testing.assert_allclose(registry.load(*args).coef_, [2.0, -4.0])
@@ -0,0 +1,58 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.linear_model import LinearRegression, Ridge
+
+from src.modules.model.recursive_least_squares import RecursiveLeastSquares
+
+
+def _collinear_window(num_rows=120):
+    """
+    Features like the engineered ones: a price, an exact multiple of it, an
+    EMA of it that is nearly collinear with it and an unrelated column
+    """
+    rng = np.random.default_rng(0)
+    price = np.cumsum(rng.normal(size=num_rows)) / 10 + 0.5
+    X = np.column_stack(
+        [
+            price,
+            2 * price,
+            pd.Series(price).ewm(span=3, adjust=False).mean().to_numpy(),
+            rng.uniform(size=num_rows),
+        ]
+    )
+    y = 3 * price + X[:, 3] + rng.normal(scale=0.1, size=num_rows)
+    return X, y
+
+
+@pytest.mark.parametrize(
+    "ridge_alpha, reference",
+    [(0.0, LinearRegression()), (1.0, Ridge(alpha=1.0))],
+)
+def test_fit_and_updates_match_sklearn_on_collinear_features(ridge_alpha, reference):
+    X, y = _collinear_window()
+    model = RecursiveLeastSquares(ridge_alpha)
+
+    model.fit(X[:60], y[:60])
+    reference.fit(X[:60], y[:60])
+    np.testing.assert_allclose(
+        model.predict(X[60:]), reference.predict(X[60:]), atol=1e-6
+    )
+
+    for start in range(60, len(X), 20):
+        model.update(X[start : start + 20], y[start : start + 20])
+    reference.fit(X, y)
+    np.testing.assert_allclose(model.predict(X), reference.predict(X), atol=1e-6)
+    assert np.all(np.isfinite(model.coef_))
+
+
+def test_forgetting_factor_matches_weighted_ridge():
+    X, y = _collinear_window()
+    model = RecursiveLeastSquares(1.0, forgetting_factor=0.99)
+    model.fit(X[:60], y[:60])
+    model.update(X[60:], y[60:])
+
+    # the penalty fades along with the first row it was set against
+    reference = Ridge(alpha=0.99 ** len(X))
+    reference.fit(X, y, sample_weight=0.99 ** np.arange(len(X) - 1, -1, -1))
+    np.testing.assert_allclose(model.predict(X), reference.predict(X), atol=1e-6)
@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+from sklearn.linear_model import LassoCV, RidgeCV
+from sklearn.model_selection import KFold
+
+from src.modules.model.linear_model import ALPHA_SEARCH
+from src.modules.model.regularization_path import lasso_cv_alpha, ridge_cv_alpha
+
+ALPHAS = 10 ** np.linspace(*ALPHA_SEARCH["log10_alphas"])
+
+
+def _regression(seed):
+    """
+    A few informative features among noisy and nearly collinear ones, so the
+    best alpha lies inside the searched range
+    """
+    rng = np.random.default_rng(seed)
+    X = rng.normal(size=(300, 12))
+    X[:, 6] = X[:, 0] + rng.normal(scale=0.05, size=300)
+    y = X[:, :3] @ np.array([1.0, -0.5, 0.25]) + rng.normal(scale=1.0, size=300)
+    return X, y
+
+
+@pytest.mark.parametrize("seed", [0, 1])
+def test_ridge_cv_alpha_matches_ridge_cv(seed):
+    X, y = _regression(seed)
+    folds = ALPHA_SEARCH["folds"]
+    ridge_cv = RidgeCV(alphas=ALPHAS, cv=KFold(folds)).fit(X, y)
+
+    alpha, mean_scores = ridge_cv_alpha(X, y, ALPHAS, folds)
+
+    assert alpha == ridge_cv.alpha_
+    assert ALPHAS[0] < alpha < ALPHAS[-1]
+    assert len(mean_scores) == len(ALPHAS)
+
+
+# both stop coordinate descent at max_iter on the smallest alphas
+@pytest.mark.filterwarnings("ignore::sklearn.exceptions.ConvergenceWarning")
+@pytest.mark.parametrize("seed", [0, 1])
+def test_lasso_cv_alpha_matches_lasso_cv(seed):
+    X, y = _regression(seed)
+    folds = ALPHA_SEARCH["folds"]
+    lasso_cv = LassoCV(alphas=ALPHAS, cv=KFold(folds)).fit(X, y)
+
+    alpha, mean_mse = lasso_cv_alpha(X, y, ALPHAS, folds)
+
+    assert alpha == lasso_cv.alpha_
+    assert ALPHAS[0] < alpha < ALPHAS[-1]
+    np.testing.assert_allclose(mean_mse, lasso_cv.mse_path_.mean(axis=1), rtol=1e-6)
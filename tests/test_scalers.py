@@ -0,0 +1,48 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.modules.data_processing.scalers import TableScaler
+from src.utils.loader import Loader
+
+
+def _fitted_scaler(num_rows, version=0):
+    df = pd.DataFrame(
+        {
+            "DATE": pd.bdate_range("2020-01-01", periods=num_rows),
+            "AL_PRICE": np.arange(num_rows, dtype=np.float64),
+        }
+    )
+    scaler = TableScaler({"AL_PRICE": "minmax"}, version=version)
+    scaler.fit(df)
+    return scaler
+
+
+@pytest.mark.usefixtures("workdir")
+def test_unchanged_parameters_keep_their_version():
+    _fitted_scaler(10).save(keep_versions=5)
+    scaler = _fitted_scaler(10, version=1)
+    scaler.save(keep_versions=5)
+
+    assert scaler.version == 1
+    assert Loader.load_json("scaler_params")["version"] == 1
+    assert sorted(os.listdir("data/processed")) == [
+        "scaler_params.json",
+        "scaler_params_v1.json",
+    ]
+
+
+@pytest.mark.usefixtures("workdir")
+def test_only_the_latest_versions_are_kept():
+    for version, num_rows in enumerate(range(10, 15)):
+        _fitted_scaler(num_rows, version=version).save(keep_versions=2)
+
+    assert sorted(os.listdir("data/processed")) == [
+        "scaler_params.json",
+        "scaler_params_v4.json",
+        "scaler_params_v5.json",
+    ]
+    assert TableScaler.load().version == 5
+    assert TableScaler.load(4).last_date == pd.Timestamp("2020-01-17")
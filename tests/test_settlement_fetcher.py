@@ -0,0 +1,186 @@
+import asyncio
+import os
+import threading
+from collections import Counter
+from datetime import date, datetime
+
+import pandas as pd
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from src.modules.scrapping import scrape_metal_futures
+from src.modules.scrapping.scrape_metal_futures import ScrapeMetal
+from src.modules.scrapping.settlement_cache import SettlementCache
+from src.modules.scrapping.settlement_fetcher import SettlementFetcher
+from src.utils.settings import SETTINGS
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures", "settlements")
+
+OK_DATE = date(2023, 1, 3)
+NO_TRADING_DATE = date(2023, 1, 4)
+RECOVERING_DATE = date(2023, 1, 5)
+FAILING_DATE = date(2023, 1, 6)
+TIMEOUT_DATE = date(2023, 1, 9)
+
+
+class SettlementServer:
+    """
+    Stand-in for the exchange on a local port, serving the fixture .dat files
+    and answering every other day as the exchange would misbehave on it
+    """
+
+    def __init__(self) -> None:
+        self.requests = Counter()
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, daemon=True)
+        app = web.Application()
+        app.router.add_get("/Settlement{day}.dat", self._settlement)
+        self._server = TestServer(app, loop=self._loop)
+
+    def __enter__(self) -> "SettlementServer":
+        self._thread.start()
+        asyncio.run_coroutine_threadsafe(
+            self._server.start_server(loop=self._loop), self._loop
+        ).result()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        asyncio.run_coroutine_threadsafe(self._close(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+
+    async def _close(self) -> None:
+        # handlers of timed out requests are still sleeping
+        handlers = [
+            task for task in asyncio.all_tasks() if task is not asyncio.current_task()
+        ]
+        for handler in handlers:
+            handler.cancel()
+        await asyncio.gather(*handlers, return_exceptions=True)
+        await self._server.close()
+
+    @property
+    def base_url(self) -> str:
+        return str(self._server.make_url(""))
+
+    async def _settlement(self, request):
+        day = request.match_info["day"]
+        self.requests[day] += 1
+        if day == f"{RECOVERING_DATE:%Y%m%d}" and self.requests[day] == 1:
+            return web.Response(status=503)
+        if day == f"{FAILING_DATE:%Y%m%d}":
+            return web.Response(status=500)
+        if day == f"{TIMEOUT_DATE:%Y%m%d}":
+            await asyncio.sleep(5)
+        fixture = os.path.join(FIXTURES, f"Settlement{day}.dat")
+        if not os.path.exists(fixture):
+            return web.Response(status=404)
+        return web.FileResponse(fixture)
+
+
+@pytest.fixture
+def settlement_server():
+    with SettlementServer() as server:
+        yield server
+
+
+def _fetcher(base_url):
+    return SettlementFetcher(
+        base_url,
+        {},
+        requests_per_second=1000,
+        max_retries=2,
+        backoff_seconds=0.01,
+        timeout_seconds=0.2,
+    )
+
+
+def test_fetch_splits_days_into_ok_no_trading_and_failed(settlement_server):
+    trading_dates = [
+        OK_DATE,
+        NO_TRADING_DATE,
+        RECOVERING_DATE,
+        FAILING_DATE,
+        TIMEOUT_DATE,
+    ]
+    responses = _fetcher(settlement_server.base_url).fetch(trading_dates)
+
+    assert [response.trading_date for response in responses] == trading_dates
+    assert [response.status for response in responses] == [
+        "ok",
+        "no_trading",
+        "ok",
+        "failed",
+        "failed",
+    ]
+    assert responses[0].settlement[0] == {
+        "INSTRUMENTID": "al2302",
+        "SETTLEMENTPRICE": 18530,
+        "VOLUME": 81234,
+        "OPENINTEREST": 152011,
+    }
+    assert responses[3].error == "HTTP status [500]"
+    assert responses[4].error.startswith(("TimeoutError", "ServerTimeoutError"))
+    # the first attempt and max_retries retries, 404s are not retried
+    assert settlement_server.requests == {
+        "20230103": 1,
+        "20230104": 1,
+        "20230105": 2,
+        "20230106": 3,
+        "20230109": 3,
+    }
+
+
+def test_cache_skips_fetched_days(tmp_path, settlement_server):
+    cache = SettlementCache(str(tmp_path / "cache"))
+    responses = _fetcher(settlement_server.base_url).fetch(
+        [OK_DATE, NO_TRADING_DATE, FAILING_DATE]
+    )
+    for response in responses:
+        cache.store(response, mark_no_trading=True)
+
+    assert cache.load(OK_DATE) == responses[0].settlement
+    assert cache.status(NO_TRADING_DATE) == "no_trading"
+    assert cache.missing_dates([OK_DATE, NO_TRADING_DATE, FAILING_DATE]) == [
+        FAILING_DATE
+    ]
+
+
+class _Today(datetime):
+    @classmethod
+    def now(cls, tz=None):
+        return cls(2023, 1, 10, 9)
+
+
+def test_scrape_saves_fetched_days_and_raises_on_failures(
+    workdir, settlement_server, monkeypatch
+):
+    scrape_settings = dict(
+        SETTINGS["scrape"]["metal_futures"],
+        base_url=settlement_server.base_url,
+        number_of_backtrack_days=7,
+        requests_per_second=1000,
+        max_retries=2,
+        backoff_seconds=0.01,
+        timeout_seconds=0.2,
+        cache_folder_path="data/raw/settlement_cache",
+        no_trading_recheck_days=3,
+    )
+    monkeypatch.setitem(SETTINGS["scrape"], "metal_futures", scrape_settings)
+    monkeypatch.setattr(scrape_metal_futures, "datetime", _Today)
+
+    with pytest.raises(RuntimeError, match=r"\['2023-01-09', '2023-01-06'\]"):
+        ScrapeMetal().run()
+    scraped_file = f'data/raw/{SETTINGS["preprocess"]["futures"]["scraped_file"]}'
+    scraped_prices = pd.read_csv(scraped_file)
+    assert scraped_prices["date"].unique().tolist() == ["05/01/2023", "03/01/2023"]
+
+    # only the failed days are fetched again
+    requests_before = settlement_server.requests.copy()
+    with pytest.raises(RuntimeError):
+        ScrapeMetal().run()
+    assert settlement_server.requests - requests_before == {
+        "20230106": 3,
+        "20230109": 3,
+    }
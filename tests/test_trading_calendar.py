@@ -0,0 +1,86 @@
+from datetime import date
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.utils.trading_calendar import TradingCalendar
+
+HOLIDAYS = ["2023-01-02", "2023-01-23", "2023-01-24", "2023-01-25", "2023-01-26"]
+HOLIDAYS += ["2023-01-27", "2023-04-05"]
+
+
+@pytest.fixture
+def calendar():
+    """
+    Settlement dates from 2023-01-03 to 2023-02-10, the weekdays outside the
+    Spring Festival closure
+    """
+    weekdays = pd.bdate_range("2023-01-03", "2023-02-10")
+    return TradingCalendar(weekdays[~weekdays.isin(HOLIDAYS)], HOLIDAYS)
+
+
+def test_dates_and_ordinals_map_onto_each_other(calendar):
+    assert len(calendar) == 24
+    assert calendar.ordinal_of("2023-01-03") == 0
+    assert calendar.ordinal_of("2023-01-20") == 13
+    # days that are not trading days map to the first trading day after them
+    assert calendar.ordinal_of("2023-01-21") == 14
+    assert calendar.ordinal_of("2023-01-23") == 14
+    assert calendar.date(14) == pd.Timestamp("2023-01-30")
+    # ordinals are taken as they are
+    assert calendar.ordinal_of(14) == 14
+    assert calendar.ordinal_of(np.int64(14)) == 14
+    np.testing.assert_array_equal(
+        calendar.ordinal(["2023-01-03", "2023-02-10", "2023-02-11"]), [0, 23, 24]
+    )
+
+
+def test_holidays_and_weekends_are_not_trading_days(calendar):
+    np.testing.assert_array_equal(
+        calendar.is_trading_day(["2023-01-20", "2023-01-21", "2023-01-23"]),
+        [True, False, False],
+    )
+    assert calendar.period_range("2023-01-21", "2023-01-29") == (14, 14)
+    assert calendar.period_range("2023-01-20", "2023-01-30") == (13, 15)
+
+
+def test_month_ranges_split_at_the_month_boundary(calendar):
+    month_ranges = calendar.month_ranges()
+
+    assert month_ranges["MONTH"].astype(str).tolist() == ["2023-01", "2023-02"]
+    assert month_ranges["START"].tolist() == [0, 16]
+    assert month_ranges["END"].tolist() == [16, 24]
+    assert calendar.date(15) == pd.Timestamp("2023-01-31")
+    assert calendar.date(16) == pd.Timestamp("2023-02-01")
+    assert calendar.period_range("2023-01-01", "2023-01-31") == (0, 16)
+
+
+@pytest.mark.parametrize(
+    "after, expected",
+    [
+        # observed days, across the holidays
+        ("2023-01-19", ["2023-01-20", "2023-01-30", "2023-01-31"]),
+        ("2023-01-21", ["2023-01-30", "2023-01-31", "2023-02-01"]),
+        # observed days followed by projected ones
+        ("2023-02-09", ["2023-02-10", "2023-02-13", "2023-02-14"]),
+        # projected from a weekend past the last observed day
+        ("2023-02-11", ["2023-02-13", "2023-02-14", "2023-02-15"]),
+        # projected across a holiday, from it and from the day before it
+        ("2023-04-04", ["2023-04-06", "2023-04-07", "2023-04-10"]),
+        ("2023-04-05", ["2023-04-06", "2023-04-07", "2023-04-10"]),
+    ],
+)
+def test_next_trading_days(calendar, after, expected):
+    assert calendar.next_trading_days(after, 3) == [
+        pd.Timestamp(day) for day in expected
+    ]
+
+
+def test_expected_trading_days_skip_weekends_and_holidays(calendar):
+    assert calendar.expected_trading_days("2023-01-20", "2023-01-31") == [
+        date(2023, 1, 20),
+        date(2023, 1, 30),
+        date(2023, 1, 31),
+    ]
+    assert calendar.expected_trading_days("2023-04-05", "2023-04-05") == []